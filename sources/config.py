@@ -41,6 +41,16 @@ class Config(BaseSettings):
     rsshub_url: str = 'https://rsshub.app'
     telegram_relay_poll_interval_minutes: int = 5
     youtube_relay_poll_interval_minutes: int = 5
+    youtube_relay_poll_concurrency: int = 8
+    youtube_relay_poll_jitter_seconds: float = 2.0
+    youtube_relay_connections_per_host: int = 8
+    stats_import_concurrency: int = 4
+    db_slow_query_ms: int = 200
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
     twitch_client_id: str = ''
     twitch_client_secret: str = ''
     sync_db_url: str = (
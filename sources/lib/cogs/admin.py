@@ -9,6 +9,9 @@ from prometheus_client import REGISTRY
 
 from sources.lib.utils.logger import Logger
 
+# Number of DB operations listed in /bot-stats.
+_DB_OPERATIONS_SHOWN = 5
+
 
 def _collect_samples() -> dict[str, list]:
     """Return all non-_created Prometheus samples keyed by sample name."""
@@ -74,6 +77,26 @@ def _fmt_ms(seconds: float | None) -> str:
     return f'{seconds * 1000:.0f}ms' if seconds is not None else 'n/a'
 
 
+def _slowest_operations(samples: dict, limit: int = _DB_OPERATIONS_SHOWN) -> str:
+    """Format the DB operations with the highest mean latency, slowest first."""
+    averages = []
+    for s in samples.get('db_operation_latency_seconds_count', []):
+        operation = s.labels.get('operation', '?')
+        avg = _histogram_avg(
+            samples, 'db_operation_latency_seconds', operation=operation
+        )
+        if avg is not None:
+            averages.append((avg, operation, int(s.value)))
+    averages.sort(reverse=True)
+    return (
+        '\n'.join(
+            f'`{operation}` **{_fmt_ms(avg)}** × {calls}'
+            for avg, operation, calls in averages[:limit]
+        )
+        or 'none'
+    )
+
+
 class AdminCog(commands.Cog):
     """Admin commands cog."""
 
@@ -162,6 +185,12 @@ class AdminCog(commands.Cog):
             inline=False,
         )
 
+        embed.add_field(
+            name='Slowest DB operations, avg (since restart)',
+            value=_slowest_operations(samples),
+            inline=False,
+        )
+
         sched_fail_samples = [
             s for s in samples.get('scheduler_job_failures_total', []) if s.value > 0
         ]
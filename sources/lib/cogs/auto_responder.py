@@ -2,27 +2,35 @@
 
 from __future__ import annotations
 
+import heapq
+from collections.abc import Iterable
 from datetime import UTC, datetime
+from typing import NamedTuple
 
 import discord
 import pytz
 from discord import app_commands
 from discord.ext import commands, tasks
 
+from sources.lib.db.models import AutoResponder
 from sources.lib.db.operations.auto_responder import (
     delete_auto_responder,
     delete_expired_auto_responders,
-    get_auto_responder,
+    list_all_auto_responders,
     list_auto_responders,
     upsert_auto_responder,
 )
 from sources.lib.db.operations.birthdays import get_guild_settings
 from sources.lib.db.operations.guilds import upsert_guild
 from sources.lib.db.operations.users import get_user
+from sources.lib.utils.cooldowns import CooldownStore
 from sources.lib.utils.logger import Logger
+from sources.lib.utils.metrics import auto_responder_cooldowns
+from sources.lib.utils.user_names import user_names
 from sources.lib.views.reminders import parse_when
 
 _COOLDOWN_SECONDS = 300
+_MAX_COOLDOWNS = 10_000
 _MAX_RESPONSE_LEN = 500
 _DATE_ONLY_HOUR = 9
 
@@ -48,6 +56,124 @@ def normalize_expiry(expires_at: datetime, timezone_str: str | None) -> datetime
     return expires_at
 
 
+class IndexedResponder(NamedTuple):
+    """An active auto-responder held in memory.
+
+    Attributes:
+        response_text: Message the bot sends when the user is mentioned.
+        expires_at: When the responder expires, or None if it never does.
+    """
+
+    response_text: str
+    expires_at: datetime | None
+
+
+class AutoResponderIndex:
+    """In-memory index of active auto-responders, grouped by guild.
+
+    Answers mention lookups without database I/O. Expiry times are kept in a
+    min-heap, so expired responders are dropped by popping the heap instead
+    of scanning every entry. Heap items left behind by updates or removals
+    are recognised as stale and skipped.
+    """
+
+    def __init__(self) -> None:
+        """Initialise an empty index."""
+        self._guilds: dict[int, dict[int, IndexedResponder]] = {}
+        self._expiry_heap: list[tuple[datetime, int, int]] = []
+
+    def load(self, responders: Iterable[AutoResponder]) -> None:
+        """Replace the index contents with the given responders.
+
+        Args:
+            responders: Active responders loaded from the database.
+        """
+        self._guilds = {}
+        self._expiry_heap = []
+        for r in responders:
+            self.set(r.guild_id, r.user_id, r.response_text, r.expires_at)
+
+    def set(
+        self,
+        guild_id: int,
+        user_id: int,
+        response_text: str,
+        expires_at: datetime | None,
+    ) -> None:
+        """Add or replace the responder for a user in a guild.
+
+        Args:
+            guild_id: Discord guild ID.
+            user_id: Discord user ID.
+            response_text: Message the bot sends when the user is mentioned.
+            expires_at: When the responder expires, or None to never expire.
+        """
+        self._guilds.setdefault(guild_id, {})[user_id] = IndexedResponder(
+            response_text, expires_at
+        )
+        if expires_at is not None:
+            heapq.heappush(self._expiry_heap, (expires_at, guild_id, user_id))
+
+    def remove(self, guild_id: int, user_id: int) -> None:
+        """Remove the responder for a user in a guild, if any.
+
+        Args:
+            guild_id: Discord guild ID.
+            user_id: Discord user ID.
+        """
+        users = self._guilds.get(guild_id)
+        if users is None:
+            return
+        users.pop(user_id, None)
+        if not users:
+            del self._guilds[guild_id]
+
+    def remove_guild(self, guild_id: int) -> None:
+        """Remove every responder in a guild.
+
+        Args:
+            guild_id: Discord guild ID.
+        """
+        self._guilds.pop(guild_id, None)
+
+    def expire(self, now: datetime) -> None:
+        """Drop every responder whose expiry time is at or before now.
+
+        Args:
+            now: The current time.
+        """
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, guild_id, user_id = heapq.heappop(heap)
+            entry = self._guilds.get(guild_id, {}).get(user_id)
+            # Skip heap items superseded by a later set() or remove().
+            if entry is not None and entry.expires_at == expires_at:
+                self.remove(guild_id, user_id)
+
+    def has_guild(self, guild_id: int) -> bool:
+        """Return True if the guild has at least one indexed responder.
+
+        Args:
+            guild_id: Discord guild ID.
+        """
+        return guild_id in self._guilds
+
+    def get(self, guild_id: int, user_id: int, now: datetime) -> str | None:
+        """Return the active response text for a user, or None.
+
+        Args:
+            guild_id: Discord guild ID.
+            user_id: Discord user ID of the mentioned user.
+            now: The current time, used to expire stale responders first.
+
+        Returns:
+            The response text, or None if the user has no active responder.
+        """
+        self.expire(now)
+        entry = self._guilds.get(guild_id, {}).get(user_id)
+        return entry.response_text if entry is not None else None
+
+
 class AutoResponderCog(commands.Cog):
     """Commands and listener for per-user auto-responses on mentions."""
 
@@ -64,11 +190,17 @@ class AutoResponderCog(commands.Cog):
         """
         self.bot = bot
         self.logger = Logger()
-        # (guild_id, user_id) -> last fire time; reset on restart (acceptable for 5-min cooldown)
-        self._cooldowns: dict[tuple[int, int], datetime] = {}
+        # Keyed by (guild_id, user_id); reset on restart (acceptable for 5-min cooldown)
+        self._cooldowns = CooldownStore(
+            ttl=_COOLDOWN_SECONDS,
+            max_entries=_MAX_COOLDOWNS,
+            size_gauge=auto_responder_cooldowns,
+        )
+        self._index = AutoResponderIndex()
 
     async def cog_load(self) -> None:
-        """Start the expired-responder cleanup loop."""
+        """Load active responders into memory and start the cleanup loop."""
+        self._index.load(await list_all_auto_responders())
         self._cleanup_expired.start()
 
     def cog_unload(self) -> None:
@@ -77,10 +209,14 @@ class AutoResponderCog(commands.Cog):
 
     @tasks.loop(hours=1)
     async def _cleanup_expired(self) -> None:
-        """Delete auto-responders whose expiry time has passed."""
+        """Delete expired auto-responders and drop them from the in-memory index."""
         count = await delete_expired_auto_responders()
         if count:
             self.logger.info('Removed %d expired auto-responders', count)
+        # No full reload: it could overwrite a /set or /remove that ran while the
+        # query was in flight. The index is kept current by those commands, the
+        # expiry heap and on_guild_remove.
+        self._index.expire(datetime.now(UTC))
 
     @_cleanup_expired.before_loop
     async def _before_cleanup(self) -> None:
@@ -146,6 +282,7 @@ class AutoResponderCog(commands.Cog):
             response_text=response,
             expires_at=expires_at,
         )
+        self._index.set(interaction.guild_id, interaction.user.id, response, expires_at)
         self.logger.info(
             'Auto-responder set for user %d in guild %d',
             interaction.user.id,
@@ -179,7 +316,8 @@ class AutoResponderCog(commands.Cog):
             )
             return
 
-        self._cooldowns.pop((interaction.guild_id, interaction.user.id), None)
+        self._index.remove(interaction.guild_id, interaction.user.id)
+        self._cooldowns.discard((interaction.guild_id, interaction.user.id))
         self.logger.info(
             'Auto-responder removed for user %d in guild %d',
             interaction.user.id,
@@ -211,6 +349,9 @@ class AutoResponderCog(commands.Cog):
             title='Active auto-responders',
             colour=discord.Colour.blurple(),
         )
+        names = await user_names.resolve(
+            self.bot, interaction.guild, (r.user_id for r in responders)
+        )
         for r in responders:
             expiry = (
                 discord.utils.format_dt(r.expires_at, style='f')
@@ -221,13 +362,22 @@ class AutoResponderCog(commands.Cog):
                 '...' if len(r.response_text) > 100 else ''
             )
             embed.add_field(
-                name=f'<@{r.user_id}>',
+                name=names[r.user_id],
                 value=f'{snippet}\nExpires: {expiry}',
                 inline=False,
             )
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        """Forget the guild's responders; its rows are removed by the guild cascade.
+
+        Args:
+            guild: The guild the bot left.
+        """
+        self._index.remove_guild(guild.id)
+
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
         """Send an auto-response when a configured user is mentioned.
@@ -239,26 +389,19 @@ class AutoResponderCog(commands.Cog):
             message.guild is None
             or message.author == self.bot.user
             or not message.mentions
+            or not self._index.has_guild(message.guild.id)
         ):
             return
 
         now = datetime.now(tz=UTC)
         for mentioned_user in message.mentions:
-            cooldown_key = (message.guild.id, mentioned_user.id)
-            last_fired = self._cooldowns.get(cooldown_key)
-            if last_fired and (now - last_fired).total_seconds() < _COOLDOWN_SECONDS:
+            response_text = self._index.get(message.guild.id, mentioned_user.id, now)
+            if response_text is None:
                 continue
-
-            responder = await get_auto_responder(
-                guild_id=message.guild.id, user_id=mentioned_user.id
-            )
-            if responder is None:
+            if not self._cooldowns.try_acquire((message.guild.id, mentioned_user.id)):
                 continue
 
-            self._cooldowns[cooldown_key] = now
-            await message.reply(
-                f'**{mentioned_user.display_name}**: {responder.response_text}'
-            )
+            await message.reply(f'**{mentioned_user.display_name}**: {response_text}')
             self.logger.info(
                 'Auto-responder fired for user %d in guild %d',
                 mentioned_user.id,
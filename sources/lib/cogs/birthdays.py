@@ -28,6 +28,7 @@ from sources.lib.db.operations.birthdays import (
 )
 from sources.lib.db.operations.users import get_user
 from sources.lib.utils.logger import Logger
+from sources.lib.utils.user_names import user_names
 
 _ANNOUNCEMENT_HOUR = 9
 _MAX_IMAGE_SIZE = 2 * 1024 * 1024  # 2 MB
@@ -515,10 +516,12 @@ class BirthdaysCog(commands.Cog):
         title = f'Birthdays in {month.name}' if month else 'Birthdays on this server'
         embed = discord.Embed(title=title, colour=discord.Colour.blurple())
 
+        names = await user_names.resolve(
+            self.bot, interaction.guild, (bday.user_id for bday in birthdays)
+        )
         lines: list[str] = []
         for bday in birthdays:
-            member = interaction.guild.get_member(bday.user_id)
-            name = member.display_name if member else f'Unknown user ({bday.user_id})'
+            name = names[bday.user_id]
             month_name = calendar.month_abbr[bday.birthday_month]
             date_str = f'{bday.birthday_day} {month_name}'
             if bday.birth_year:
@@ -1,9 +1,10 @@
 """Domain fixer management cog"""
 
+from urllib.parse import urlparse
+
 import discord
 from discord import app_commands
 from discord.ext import commands
-from tldextract import extract as tldextract_extract
 
 from sources.lib.db.operations.domain_fixers import (
     DEFAULT_DOMAIN_FIXERS,
@@ -13,14 +14,16 @@ from sources.lib.db.operations.domain_fixers import (
     upsert_domain_fixer,
 )
 from sources.lib.db.operations.guilds import upsert_guild
+from sources.lib.utils.domains_fixer import invalidate_guild_rules
 from sources.lib.utils.logger import Logger
+from sources.lib.utils.public_suffix import public_suffixes
 
 
 def _normalize_source_domain(raw: str) -> str:
     """Return the registrable domain (e.g. 'reddit.com') from user input.
 
     Strips any scheme/path the user may have accidentally included.
-    Falls back to the stripped input when tldextract cannot identify a suffix.
+    Falls back to the stripped input when no public suffix can be identified.
 
     Args:
         raw: Raw string entered by the user, e.g. 'reddit.com' or 'www.reddit.com'.
@@ -34,7 +37,11 @@ def _normalize_source_domain(raw: str) -> str:
         if stripped.startswith(prefix):
             stripped = stripped[len(prefix) :]
             break
-    normalized = tldextract_extract(stripped).top_domain_under_public_suffix
+    try:
+        host = urlparse(f'//{stripped}').hostname or stripped
+    except ValueError:
+        host = stripped
+    normalized = public_suffixes.split(host).top_domain_under_public_suffix
     return normalized or stripped
 
 
@@ -67,6 +74,7 @@ class DomainFixerCog(commands.Cog):
             guild_id=interaction.guild_id, guild_name=interaction.guild.name
         )
         await seed_default_domain_fixers(guild_id=interaction.guild_id)
+        invalidate_guild_rules(interaction.guild_id)
         self.logger.info(
             'Default domain fixers seeded for guild %s', interaction.guild_id
         )
@@ -136,6 +144,7 @@ class DomainFixerCog(commands.Cog):
             replacement_domain=replacement,
             override_subdomain=subdomain or None,
         )
+        invalidate_guild_rules(interaction.guild_id)
         self.logger.info(
             'Domain fixer upserted: %s -> %s (guild %s)',
             normalized_source,
@@ -189,6 +198,7 @@ class DomainFixerCog(commands.Cog):
             source: Source domain to remove.
         """
         await delete_domain_fixer(guild_id=interaction.guild_id, source_domain=source)
+        invalidate_guild_rules(interaction.guild_id)
         self.logger.info(
             'Domain fixer removed: %s (guild %s)', source, interaction.guild_id
         )
@@ -5,12 +5,21 @@ import pytz
 from discord import Color, app_commands
 from discord.ext import commands
 
+from sources.lib.cogs.music_links import invalidate_allowed_channels
+from sources.lib.cogs.voice import voice_channel_names
 from sources.lib.db.operations.birthdays import (
     get_guild_settings,
     upsert_guild_settings,
 )
-from sources.lib.db.operations.guilds import delete_guild, upsert_guild
+from sources.lib.db.operations.guilds import (
+    delete_guild,
+    reconcile_guilds,
+    upsert_guild,
+)
+from sources.lib.leaderboard import leaderboards
+from sources.lib.utils.domains_fixer import invalidate_guild_rules
 from sources.lib.utils.get_timestamp import autocomplete_timezone, role_autocomplete
+from sources.lib.utils.logger import Logger
 
 
 class GuildCog(commands.Cog):
@@ -23,6 +32,7 @@ class GuildCog(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.logger = Logger()
 
     @server.command(name='settings', description='View current server configuration')
     @app_commands.default_permissions(manage_guild=True)
@@ -154,9 +164,23 @@ class GuildCog(commands.Cog):
 
     @commands.Cog.listener('on_ready')
     async def on_ready(self) -> None:
-        """Sync all current guilds to DB on bot startup."""
-        for guild in self.bot.guilds:
-            await upsert_guild(guild_id=guild.id, guild_name=guild.name)
+        """Reconcile guilds and voice channels in DB with Discord on startup.
+
+        Guilds the bot left while offline are deleted together with their data.
+        """
+        available = [guild for guild in self.bot.guilds if not guild.unavailable]
+        voice_channels = {
+            channel_id: (guild.id, name)
+            for guild in available
+            for channel_id, name in voice_channel_names(guild).items()
+        }
+        deleted = await reconcile_guilds(
+            {guild.id: guild.name for guild in available},
+            voice_channels,
+            [guild.id for guild in self.bot.guilds if guild.unavailable],
+        )
+        for guild_id in deleted:
+            self.logger.info('Removed data for guild %d left while offline', guild_id)
 
     @commands.Cog.listener('on_guild_join')
     async def on_guild_join(self, guild: discord.Guild) -> None:
@@ -174,3 +198,6 @@ class GuildCog(commands.Cog):
     async def on_guild_remove(self, guild: discord.Guild) -> None:
         """Remove a guild from DB when the bot is kicked or leaves."""
         await delete_guild(guild_id=guild.id)
+        invalidate_guild_rules(guild.id)
+        invalidate_allowed_channels(guild.id)
+        leaderboards.invalidate(guild.id)
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import re
+from collections.abc import Awaitable, Callable
 
 import aiohttp
 import discord
@@ -16,17 +16,56 @@ from sources.lib.db.operations.music_links import (
     remove_allowed_channel,
 )
 from sources.lib.spotify import SpotifyClient, clean_yt_title
+from sources.lib.track_cache import TrackResolutionCache
 from sources.lib.utils.logger import Logger
+from sources.lib.utils.message_analysis import analyze_message
 from sources.lib.utils.metrics import api_call_latency
+from sources.lib.utils.single_flight import SingleFlight
 
-_YT_PATTERN = re.compile(
-    r'https?://(?:www\.)?(?:youtube\.com/watch\?(?:[^&\s]*&)*v=|youtu\.be/)'
-    r'([a-zA-Z0-9_-]{11})'
-)
-_YT_MUSIC_PATTERN = re.compile(
-    r'https?://music\.youtube\.com/watch\?(?:[^&\s]*&)*v=([a-zA-Z0-9_-]{11})'
-)
-_SPOTIFY_PATTERN = re.compile(r'https?://open\.spotify\.com/track/([a-zA-Z0-9]+)')
+_YOUTUBE = 'youtube'
+_SPOTIFY = 'spotify'
+_SPOTIFY_TRACK_URL = 'https://open.spotify.com/track/'
+_YOUTUBE_MUSIC_URL = 'https://music.youtube.com/watch?v='
+
+# guild_id -> allowed channel IDs, loaded on first music link in the guild.
+_allowlist_cache: dict[int, frozenset[int]] = {}
+# guild_id -> invalidation counter, so a load racing an invalidation is discarded.
+_allowlist_generation: dict[int, int] = {}
+
+
+class _LookupFailed(Exception):
+    """An API request failed, so whether a track has a match is unknown."""
+
+
+async def get_allowed_channel_set(guild_id: int) -> frozenset[int]:
+    """Return the music links allowlist for a guild, loading it on first use.
+
+    Args:
+        guild_id: Discord guild ID.
+
+    Returns:
+        Allowed channel IDs; empty if conversion is inactive in the guild.
+    """
+    allowed = _allowlist_cache.get(guild_id)
+    if allowed is not None:
+        return allowed
+    generation = _allowlist_generation.get(guild_id, 0)
+    allowed = frozenset(await get_allowed_channels(guild_id))
+    if _allowlist_generation.get(guild_id, 0) == generation:
+        _allowlist_cache[guild_id] = allowed
+    return allowed
+
+
+def invalidate_allowed_channels(guild_id: int) -> None:
+    """Drop the cached allowlist for a guild so the next music link reloads it.
+
+    Must be called after any change to the guild's allowlist.
+
+    Args:
+        guild_id: Discord guild ID.
+    """
+    _allowlist_cache.pop(guild_id, None)
+    _allowlist_generation[guild_id] = _allowlist_generation.get(guild_id, 0) + 1
 
 
 class MusicLinksCog(commands.Cog):
@@ -50,6 +89,9 @@ class MusicLinksCog(commands.Cog):
         self._logger = Logger()
         self._session: aiohttp.ClientSession | None = None
         self._spotify: SpotifyClient | None = None
+        self._tracks = TrackResolutionCache()
+        # Same link posted in several channels at once resolves only once.
+        self._track_flight = SingleFlight('track_resolution')
 
     async def cog_load(self) -> None:
         """Open the shared HTTP session and warn if credentials are missing."""
@@ -74,6 +116,33 @@ class MusicLinksCog(commands.Cog):
     # Conversion logic
     # ------------------------------------------------------------------
 
+    async def _resolve(
+        self,
+        platform: str,
+        source_id: str,
+        find: Callable[[str], Awaitable[str | None]],
+    ) -> str | None:
+        """Resolve a track on the other platform, consulting the cache first.
+
+        Args:
+            platform: Platform of the source track: 'youtube' or 'spotify'.
+            source_id: Track or video ID on the source platform.
+            find: API lookup used on a cache miss.
+
+        Returns:
+            Matching ID on the other platform, or None if there is no match
+            or the lookup failed.
+        """
+        cached = await self._tracks.get(platform, source_id)
+        if cached is not None:
+            return cached.target_id
+        try:
+            target_id = await find(source_id)
+        except _LookupFailed:
+            return None
+        await self._tracks.put(platform, source_id, target_id)
+        return target_id
+
     async def _youtube_to_spotify(self, video_id: str) -> str | None:
         """Convert a YouTube video ID to a Spotify track URL.
 
@@ -83,6 +152,24 @@ class MusicLinksCog(commands.Cog):
         Returns:
             Spotify track URL, or None if no match was found.
         """
+        track_id = await self._track_flight.do(
+            (_YOUTUBE, video_id),
+            lambda: self._resolve(_YOUTUBE, video_id, self._find_spotify_track),
+        )
+        return f'{_SPOTIFY_TRACK_URL}{track_id}' if track_id else None
+
+    async def _find_spotify_track(self, video_id: str) -> str | None:
+        """Search Spotify for the track played in a YouTube video.
+
+        Args:
+            video_id: YouTube video ID (11-character string).
+
+        Returns:
+            Spotify track ID, or None if the video has no Spotify match.
+
+        Raises:
+            _LookupFailed: If an API request failed, so the result is unknown.
+        """
         try:
             with api_call_latency.labels(service='youtube').time():
                 async with self._session.get(
@@ -97,11 +184,11 @@ class MusicLinksCog(commands.Cog):
                         self._logger.warning(
                             'YouTube videos API returned %d', resp.status
                         )
-                        return None
+                        raise _LookupFailed
                     data = await resp.json()
         except aiohttp.ClientError as exc:
             self._logger.warning('YouTube API request error: %s', exc)
-            return None
+            raise _LookupFailed from exc
 
         items = data.get('items', [])
         if not items:
@@ -122,7 +209,7 @@ class MusicLinksCog(commands.Cog):
 
         token = await self._spotify.get_token()
         if not token:
-            return None
+            raise _LookupFailed
 
         try:
             with api_call_latency.labels(service='spotify').time():
@@ -133,17 +220,17 @@ class MusicLinksCog(commands.Cog):
                 ) as resp:
                     if resp.status != 200:
                         self._logger.warning('Spotify search returned %d', resp.status)
-                        return None
+                        raise _LookupFailed
                     data = await resp.json()
         except aiohttp.ClientError as exc:
             self._logger.warning('Spotify search request error: %s', exc)
-            return None
+            raise _LookupFailed from exc
 
         tracks = data.get('tracks', {}).get('items', [])
         if not tracks:
             return None
 
-        return tracks[0]['external_urls']['spotify']
+        return tracks[0]['id']
 
     async def _spotify_to_youtube(self, track_id: str) -> str | None:
         """Convert a Spotify track ID to a YouTube Music URL.
@@ -154,9 +241,27 @@ class MusicLinksCog(commands.Cog):
         Returns:
             YouTube Music URL, or None if no match was found.
         """
+        video_id = await self._track_flight.do(
+            (_SPOTIFY, track_id),
+            lambda: self._resolve(_SPOTIFY, track_id, self._find_youtube_video),
+        )
+        return f'{_YOUTUBE_MUSIC_URL}{video_id}' if video_id else None
+
+    async def _find_youtube_video(self, track_id: str) -> str | None:
+        """Search YouTube for a video of a Spotify track.
+
+        Args:
+            track_id: Spotify track ID.
+
+        Returns:
+            YouTube video ID, or None if the track has no YouTube match.
+
+        Raises:
+            _LookupFailed: If an API request failed, so the result is unknown.
+        """
         token = await self._spotify.get_token()
         if not token:
-            return None
+            raise _LookupFailed
 
         try:
             with api_call_latency.labels(service='spotify').time():
@@ -168,11 +273,11 @@ class MusicLinksCog(commands.Cog):
                         self._logger.warning(
                             'Spotify tracks API returned %d', resp.status
                         )
-                        return None
+                        raise _LookupFailed
                     data = await resp.json()
         except aiohttp.ClientError as exc:
             self._logger.warning('Spotify tracks request error: %s', exc)
-            return None
+            raise _LookupFailed from exc
 
         artist = data['artists'][0]['name']
         name = data['name']
@@ -195,18 +300,17 @@ class MusicLinksCog(commands.Cog):
                         self._logger.warning(
                             'YouTube search API returned %d', resp.status
                         )
-                        return None
+                        raise _LookupFailed
                     data = await resp.json()
         except aiohttp.ClientError as exc:
             self._logger.warning('YouTube search request error: %s', exc)
-            return None
+            raise _LookupFailed from exc
 
         items = data.get('items', [])
         if not items:
             return None
 
-        video_id = items[0]['id']['videoId']
-        return f'https://music.youtube.com/watch?v={video_id}'
+        return items[0]['id']['videoId']
 
     # ------------------------------------------------------------------
     # Listener
@@ -225,26 +329,18 @@ class MusicLinksCog(commands.Cog):
         if not config.youtube_api_key or not config.spotify_api_client_id:
             return
 
-        allowed = await get_allowed_channels(message.guild.id)
-        if not allowed or message.channel.id not in allowed:
+        analysis = analyze_message(message)
+        if not analysis.has_music_links:
             return
 
-        content = message.content
-
-        # YouTube Music takes priority — check before generic YouTube.
-        yt_music_match = _YT_MUSIC_PATTERN.search(content)
-        if yt_music_match:
-            result = await self._youtube_to_spotify(yt_music_match.group(1))
-            if result:
-                await message.reply(
-                    f'This track is also available on Spotify:\n{result}',
-                    mention_author=False,
-                )
+        allowed = await get_allowed_channel_set(message.guild.id)
+        if message.channel.id not in allowed:
             return
 
-        yt_match = _YT_PATTERN.search(content)
-        if yt_match:
-            result = await self._youtube_to_spotify(yt_match.group(1))
+        # YouTube Music takes priority — check before generic YouTube.
+        if analysis.youtube_music_ids or analysis.youtube_ids:
+            video_id = (analysis.youtube_music_ids or analysis.youtube_ids)[0]
+            result = await self._youtube_to_spotify(video_id)
             if result:
                 await message.reply(
                     f'This track is also available on Spotify:\n{result}',
@@ -252,14 +348,12 @@ class MusicLinksCog(commands.Cog):
                 )
             return
 
-        spotify_match = _SPOTIFY_PATTERN.search(content)
-        if spotify_match:
-            result = await self._spotify_to_youtube(spotify_match.group(1))
-            if result:
-                await message.reply(
-                    f'This track is also available on YouTube Music:\n{result}',
-                    mention_author=False,
-                )
+        result = await self._spotify_to_youtube(analysis.spotify_track_ids[0])
+        if result:
+            await message.reply(
+                f'This track is also available on YouTube Music:\n{result}',
+                mention_author=False,
+            )
 
     # ------------------------------------------------------------------
     # Admin commands
@@ -282,6 +376,7 @@ class MusicLinksCog(commands.Cog):
             channel: The text channel to add.
         """
         added = await add_allowed_channel(interaction.guild_id, channel.id)
+        invalidate_allowed_channels(interaction.guild_id)
         if not added:
             await interaction.response.send_message(
                 f'{channel.mention} is already in the allowlist.',
@@ -311,6 +406,7 @@ class MusicLinksCog(commands.Cog):
             channel: The text channel to remove.
         """
         removed = await remove_allowed_channel(interaction.guild_id, channel.id)
+        invalidate_allowed_channels(interaction.guild_id)
         if not removed:
             await interaction.response.send_message(
                 f'{channel.mention} is not in the allowlist.',
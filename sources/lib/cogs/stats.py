@@ -1,23 +1,39 @@
 """Stats cog — per-guild message count statistics and leaderboard."""
 
 import asyncio
-from datetime import UTC, datetime
+import time
+from datetime import UTC, date, datetime, timedelta
 
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
+from sources.config import config
 from sources.lib.db.operations.stats import (
     get_all_channel_progress,
     get_channel_progress,
     get_guilds_with_incomplete_import,
-    get_leaderboard,
-    increment_message_counts,
+    get_windowed_leaderboard,
+    roll_up_daily_buckets,
     save_channel_progress,
+    save_import_checkpoint,
 )
+from sources.lib.import_progress import ImportProgress
+from sources.lib.leaderboard import LEADERBOARD_SIZE, leaderboards
+from sources.lib.message_counter import MessageCounter
 from sources.lib.utils.logger import Logger
+from sources.lib.utils.user_names import user_names
 
-_CHECKPOINT_EVERY = 500
+_CHECKPOINT_SECONDS = 15
+_CHECKPOINT_MAX_MESSAGES = 10_000
+_FLUSH_INTERVAL_SECONDS = 10
+# Channels listed individually in /stats import-status.
+_STATUS_MAX_CHANNELS = 5
+# Daily buckets older than this are rolled up into monthly ones; must cover
+# the longest leaderboard window.
+_DAILY_BUCKET_DAYS = 62
+# Leaderboard window -> number of UTC days it spans, including today.
+_WINDOW_DAYS = {'day': 1, 'week': 7, 'month': 30}
 
 
 class StatsCog(commands.Cog):
@@ -36,9 +52,13 @@ class StatsCog(commands.Cog):
         self.bot = bot
         self.logger = Logger()
         self._import_tasks: dict[int, asyncio.Task] = {}
+        self._import_progress: dict[int, ImportProgress] = {}
+        self._counter = MessageCounter()
 
     async def cog_load(self) -> None:
-        """Resume any imports that were in progress when the bot last stopped."""
+        """Start the background loops and resume interrupted imports."""
+        self._flush_counts.start()
+        self._roll_up_buckets.start()
         guild_ids = await get_guilds_with_incomplete_import()
         for guild_id in guild_ids:
             guild = self.bot.get_guild(guild_id)
@@ -49,48 +69,92 @@ class StatsCog(commands.Cog):
                 self._run_import(guild, since_dt=None)
             )
 
+    async def cog_unload(self) -> None:
+        """Stop the background loops and write any buffered counts so none are lost."""
+        self._flush_counts.cancel()
+        self._roll_up_buckets.cancel()
+        await self._counter.flush()
+
+    @tasks.loop(seconds=_FLUSH_INTERVAL_SECONDS)
+    async def _flush_counts(self) -> None:
+        """Periodically write buffered live message counts to the database."""
+        # Shielded so cancelling the loop on unload never abandons a batch mid-write.
+        await asyncio.shield(self._counter.flush())
+
+    @tasks.loop(hours=24)
+    async def _roll_up_buckets(self) -> None:
+        """Merge daily buckets past _DAILY_BUCKET_DAYS into monthly buckets."""
+        cutoff = datetime.now(tz=UTC).date() - timedelta(days=_DAILY_BUCKET_DAYS)
+        count = await roll_up_daily_buckets(cutoff)
+        if count:
+            self.logger.info('Rolled up %d daily message stat buckets', count)
+
     @commands.Cog.listener('on_message')
     async def on_message(self, message: discord.Message) -> None:
-        """Increment the sender's message count for every non-bot guild message.
+        """Buffer a message count increment for every non-bot guild message.
+
+        Counts are written to the database in batches by _flush_counts.
 
         Args:
             message: The incoming Discord message.
         """
         if message.author.bot or message.guild is None:
             return
-        await increment_message_counts(message.guild.id, {message.author.id: 1})
+        self._counter.add(
+            message.guild.id, message.author.id, message.created_at.date()
+        )
 
     @stats.command(
         name='leaderboard', description='Show top message senders in this server'
     )
-    async def leaderboard(self, interaction: discord.Interaction) -> None:
+    @app_commands.describe(window='Time window to rank by; defaults to all time')
+    @app_commands.choices(
+        window=[
+            app_commands.Choice(name='Today', value='day'),
+            app_commands.Choice(name='Last 7 days', value='week'),
+            app_commands.Choice(name='Last 30 days', value='month'),
+            app_commands.Choice(name='All time', value='all'),
+        ]
+    )
+    async def leaderboard(
+        self,
+        interaction: discord.Interaction,
+        window: app_commands.Choice[str] | None = None,
+    ) -> None:
         """Display the message count leaderboard for this guild.
 
         Args:
             interaction: The Discord interaction.
+            window: Optional time window; all-time totals when omitted.
         """
-        rows = await get_leaderboard(interaction.guild_id, limit=10)
+        days = _WINDOW_DAYS.get(window.value) if window else None
+        if days is None:
+            rows = await leaderboards.top(interaction.guild_id)
+        else:
+            since = datetime.now(tz=UTC).date() - timedelta(days=days - 1)
+            rows = await get_windowed_leaderboard(
+                interaction.guild_id, since, limit=LEADERBOARD_SIZE
+            )
         if not rows:
             await interaction.response.send_message(
-                'No statistics yet. An admin can run `/stats import` to load message history.',
+                'No statistics yet. An admin can run `/stats import` to load message history.'
+                if days is None
+                else f'No messages counted for {window.name.lower()} yet.',
                 ephemeral=True,
             )
             return
 
-        embed = discord.Embed(title='Message Leaderboard', colour=discord.Colour.gold())
-        lines = []
-        for i, row in enumerate(rows, start=1):
-            member = interaction.guild.get_member(row.user_id)
-            if member:
-                name = member.display_name
-            else:
-                try:
-                    user = await self.bot.fetch_user(row.user_id)
-                    name = user.display_name
-                except discord.NotFound:
-                    name = f'Unknown ({row.user_id})'
-            lines.append(f'{i}. **{name}** — {row.message_count:,}')
-        embed.description = '\n'.join(lines)
+        title = 'Message Leaderboard'
+        if days is not None:
+            title = f'{title} — {window.name}'
+        embed = discord.Embed(title=title, colour=discord.Colour.gold())
+        names = await user_names.resolve(
+            self.bot, interaction.guild, (row.user_id for row in rows)
+        )
+        embed.description = '\n'.join(
+            f'{i}. **{names[row.user_id]}** — {row.message_count:,}'
+            for i, row in enumerate(rows, start=1)
+        )
         await interaction.response.send_message(embed=embed)
 
     @stats.command(
@@ -173,15 +237,56 @@ class StatsCog(commands.Cog):
             embed.add_field(
                 name='In progress', value=f'{in_progress} channel(s)', inline=True
             )
+        progress = self._import_progress.get(guild_id) if running else None
+        if progress is not None:
+            self._add_throughput_fields(embed, progress)
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    @staticmethod
+    def _add_throughput_fields(embed: discord.Embed, progress: ImportProgress) -> None:
+        """Add live throughput, ETA and per-channel fields to the status embed.
+
+        Args:
+            embed: The status embed to extend.
+            progress: Telemetry for the running import.
+        """
+        embed.add_field(name='Messages', value=f'{progress.messages:,}', inline=True)
+        embed.add_field(name='Rate', value=f'{progress.rate:,.1f} msg/s', inline=True)
+        embed.add_field(
+            name='Waiting on Discord',
+            value=f'{progress.api_wait:,.0f}s',
+            inline=True,
+        )
+        eta = progress.eta
+        embed.add_field(
+            name='ETA',
+            value=discord.utils.format_dt(
+                datetime.now(tz=UTC) + timedelta(seconds=eta), style='R'
+            )
+            if eta is not None
+            else 'Estimating…',
+            inline=True,
+        )
+        if progress.active:
+            lines = [
+                f'<#{channel_id}> — {channel.messages:,} msgs, {channel.fraction:.0%}'
+                for channel_id, channel in list(progress.active.items())[
+                    :_STATUS_MAX_CHANNELS
+                ]
+            ]
+            embed.add_field(
+                name='Current channels', value='\n'.join(lines), inline=False
+            )
+
     async def _run_import(
         self, guild: discord.Guild, since_dt: datetime | None
     ) -> None:
         """Scan all readable text channels and accumulate per-user message counts.
 
-        Saves a checkpoint to the database every _CHECKPOINT_EVERY messages so the
-        import can resume from where it left off if the bot restarts.
+        Up to config.stats_import_concurrency channels are paged at once.
+        Message history requests are rate limited per channel by Discord, so
+        parallel channels draw on separate buckets; discord.py's HTTP client
+        still waits out any 429 and the global limit on our behalf.
 
         Args:
             guild: The Discord guild to import.
@@ -198,57 +303,141 @@ class StatsCog(commands.Cog):
             len(text_channels),
         )
 
-        for channel in text_channels:
-            progress = await get_channel_progress(guild.id, channel.id)
-            if progress and progress.is_completed:
-                continue
+        progress = ImportProgress(guild.id, len(text_channels))
+        self._import_progress[guild.id] = progress
+        limit = asyncio.Semaphore(max(1, config.stats_import_concurrency))
+        try:
+            async with asyncio.TaskGroup() as group:
+                for channel in text_channels:
+                    group.create_task(
+                        self._import_channel_limited(
+                            limit, guild, channel, since_dt, progress
+                        )
+                    )
+        finally:
+            progress.close()
+            self._import_progress.pop(guild.id, None)
+
+        self.logger.info(
+            'Stats import complete for guild %s: %d messages in %.0fs',
+            guild.name,
+            progress.messages,
+            progress.elapsed,
+        )
+        self._import_tasks.pop(guild.id, None)
 
-            after: discord.Object | datetime | None
-            if progress and progress.last_message_id:
-                after = discord.Object(id=progress.last_message_id)
-            else:
-                after = since_dt
+    async def _import_channel_limited(
+        self,
+        limit: asyncio.Semaphore,
+        guild: discord.Guild,
+        channel: discord.TextChannel,
+        since_dt: datetime | None,
+        progress: ImportProgress,
+    ) -> None:
+        """Import one channel once a concurrency slot is free.
 
-            counts: dict[int, int] = {}
-            processed = 0
-            last_id: int | None = progress.last_message_id if progress else None
+        Args:
+            limit: Semaphore bounding how many channels are paged at once.
+            guild: The guild the channel belongs to.
+            channel: The text channel to import.
+            since_dt: Lower bound for messages when the channel has no progress.
+            progress: Telemetry for the running import.
+        """
+        async with limit:
+            await self._import_channel(guild, channel, since_dt, progress)
 
-            try:
-                async for message in channel.history(
-                    limit=None, oldest_first=True, after=after
-                ):
-                    if not message.author.bot:
-                        counts[message.author.id] = counts.get(message.author.id, 0) + 1
-                    last_id = message.id
-                    processed += 1
-
-                    if processed % _CHECKPOINT_EVERY == 0:
-                        if counts:
-                            await increment_message_counts(guild.id, counts)
-                            counts = {}
-                        await save_channel_progress(
-                            guild.id, channel.id, last_id, False
-                        )
-                        self.logger.info(
-                            'Stats import: %s — checkpoint at %d messages',
-                            channel.name,
-                            processed,
-                        )
+    async def _import_channel(
+        self,
+        guild: discord.Guild,
+        channel: discord.TextChannel,
+        since_dt: datetime | None,
+        progress: ImportProgress,
+    ) -> None:
+        """Import one channel's history, resuming from its saved checkpoint.
 
-                if counts:
-                    await increment_message_counts(guild.id, counts)
-                await save_channel_progress(guild.id, channel.id, last_id, True)
-                self.logger.info(
-                    'Stats import: channel %s done (%d messages)',
-                    channel.name,
-                    processed,
-                )
+        Counts and progress are committed together every _CHECKPOINT_SECONDS or
+        _CHECKPOINT_MAX_MESSAGES messages, whichever comes first, so the import
+        can resume from where it left off if the bot restarts.
+
+        Args:
+            guild: The guild the channel belongs to.
+            channel: The text channel to import.
+            since_dt: Lower bound for messages when the channel has no progress.
+            progress: Telemetry for the running import.
+        """
+        saved = await get_channel_progress(guild.id, channel.id)
+        if saved and saved.is_completed:
+            progress.channel_finished(channel.id, skipped=True)
+            return
+
+        after: discord.Object | datetime | None
+        if saved and saved.last_message_id:
+            after = discord.Object(id=saved.last_message_id)
+            start_id = saved.last_message_id
+        else:
+            after = since_dt
+            # A channel's own ID is older than any message in it.
+            start_id = (
+                discord.utils.time_snowflake(since_dt)
+                if isinstance(since_dt, datetime)
+                else channel.id
+            )
 
-            except discord.Forbidden:
-                self.logger.warning(
-                    'Stats import: no permission for #%s, skipping', channel.name
+        counts: dict[tuple[int, date], int] = {}
+        processed = 0
+        last_id: int | None = saved.last_message_id if saved else None
+        since_checkpoint = 0
+        checkpoint_at = time.monotonic()
+
+        try:
+            async for message in progress.track(
+                channel,
+                start_id,
+                channel.history(limit=None, oldest_first=True, after=after),
+            ):
+                if not message.author.bot:
+                    key = (message.author.id, message.created_at.date())
+                    counts[key] = counts.get(key, 0) + 1
+                last_id = message.id
+                processed += 1
+                since_checkpoint += 1
+
+                # Checkpoint on whichever comes first: elapsed time bounds the
+                # work lost on a restart, message count bounds memory.
+                if (
+                    since_checkpoint >= _CHECKPOINT_MAX_MESSAGES
+                    or time.monotonic() - checkpoint_at >= _CHECKPOINT_SECONDS
+                ):
+                    leaderboards.apply(
+                        await save_import_checkpoint(
+                            guild.id, channel.id, counts, last_id, False
+                        )
+                    )
+                    counts = {}
+                    since_checkpoint = 0
+                    checkpoint_at = time.monotonic()
+                    progress.publish()
+                    self.logger.info(
+                        'Stats import: %s — checkpoint at %d messages',
+                        channel.name,
+                        processed,
+                    )
+
+            leaderboards.apply(
+                await save_import_checkpoint(
+                    guild.id, channel.id, counts, last_id, True
                 )
-                await save_channel_progress(guild.id, channel.id, last_id, True)
+            )
+            self.logger.info(
+                'Stats import: channel %s done (%d messages)',
+                channel.name,
+                processed,
+            )
 
-        self.logger.info('Stats import complete for guild %s', guild.name)
-        self._import_tasks.pop(guild.id, None)
+        except discord.Forbidden:
+            self.logger.warning(
+                'Stats import: no permission for #%s, skipping', channel.name
+            )
+            await save_channel_progress(guild.id, channel.id, last_id, True)
+        finally:
+            progress.channel_finished(channel.id)
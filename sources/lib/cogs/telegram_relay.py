@@ -24,6 +24,7 @@ from sources.lib.db.operations.telegram_relay import (
     update_last_entry_id,
     update_relay_channel,
 )
+from sources.lib.utils.feed_fetcher import FeedFetcher
 from sources.lib.utils.logger import Logger
 from sources.lib.utils.metrics import (
     relay_fetch_errors,
@@ -111,6 +112,7 @@ class TelegramRelayCog(commands.Cog):
         self.logger = Logger()
         self._scheduler = AsyncIOScheduler()
         self._session: aiohttp.ClientSession | None = None
+        self._feeds = FeedFetcher('telegram')
 
     async def cog_load(self) -> None:
         """Open the HTTP session and start the polling scheduler."""
@@ -369,8 +371,7 @@ class TelegramRelayCog(commands.Cog):
         """
         url = f'{config.rsshub_url}/telegram/channel/{relay.tg_username}'
         try:
-            async with self._session.get(url, timeout=_REQUEST_TIMEOUT) as resp:
-                content = await resp.text()
+            feed = await self._feeds.fetch(self._session, url, _REQUEST_TIMEOUT)
         except Exception as exc:
             self.logger.warning(
                 'Failed to fetch RSS for @%s: %s', relay.tg_username, exc
@@ -379,7 +380,6 @@ class TelegramRelayCog(commands.Cog):
             return
 
         relay_last_poll.labels(service='telegram').set(time.time())
-        feed = feedparser.parse(content)
         self.logger.info(
             'Polling @%s: %d entries in feed, last_entry_id=%r',
             relay.tg_username,
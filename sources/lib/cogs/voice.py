@@ -16,6 +16,19 @@ from sources.lib.db.operations.voice_channels import (
 _AUTO_PREFIX = '[auto]'
 
 
+def voice_channel_names(guild: discord.Guild) -> dict[int, str]:
+    """Return the ID and name of every voice and stage channel in a guild.
+
+    Args:
+        guild: The Discord guild.
+    """
+    return {
+        ch.id: ch.name
+        for ch in guild.channels
+        if isinstance(ch, (discord.VoiceChannel, discord.StageChannel))
+    }
+
+
 class VoiceCog(commands.Cog):
     """Voice channel status cog."""
 
@@ -64,17 +77,6 @@ class VoiceCog(commands.Cog):
             except discord.errors.Forbidden:
                 pass
 
-    @commands.Cog.listener()
-    async def on_ready(self) -> None:
-        """Sync voice channels for all guilds on startup."""
-        for guild in self.bot.guilds:
-            channel_map = {
-                ch.id: ch.name
-                for ch in guild.channels
-                if isinstance(ch, (discord.VoiceChannel, discord.StageChannel))
-            }
-            await sync_guild_voice_channels(guild.id, channel_map)
-
     @commands.Cog.listener()
     async def on_socket_raw_receive(self, msg: str) -> None:
         """Track voice channel status changes from the Gateway."""
@@ -116,12 +118,7 @@ class VoiceCog(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild) -> None:
         """Sync voice channels when the bot joins a new guild."""
-        channel_map = {
-            ch.id: ch.name
-            for ch in guild.channels
-            if isinstance(ch, (discord.VoiceChannel, discord.StageChannel))
-        }
-        await sync_guild_voice_channels(guild.id, channel_map)
+        await sync_guild_voice_channels(guild.id, voice_channel_names(guild))
 
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel: discord.abc.GuildChannel) -> None:
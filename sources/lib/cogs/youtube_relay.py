@@ -1,6 +1,7 @@
 """YouTube relay cog — forward YouTube channel uploads to Discord via RSS."""
 
 import asyncio
+import random
 import time
 import urllib.parse
 
@@ -18,6 +19,7 @@ from sources.lib.cogs.relay_utils import (
     parse_relay_id,
     resolve_channel,
 )
+from sources.lib.db import unit_of_work
 from sources.lib.db.models import YouTubeRelay
 from sources.lib.db.operations.youtube_live_session import (
     add_live_session,
@@ -35,6 +37,8 @@ from sources.lib.db.operations.youtube_relay import (
     update_last_video_id,
     update_relay_content_flags,
 )
+from sources.lib.db.unit_of_work import UnitOfWork
+from sources.lib.utils.feed_fetcher import FeedFetcher
 from sources.lib.utils.logger import Logger
 from sources.lib.utils.metrics import (
     api_call_latency,
@@ -468,10 +472,15 @@ class YouTubeRelayCog(commands.Cog):
         self.logger = Logger()
         self._scheduler = AsyncIOScheduler()
         self._session: aiohttp.ClientSession | None = None
+        self._feeds = FeedFetcher('youtube')
 
     async def cog_load(self) -> None:
         """Open the HTTP session and start the polling scheduler."""
-        self._session = aiohttp.ClientSession()
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit_per_host=config.youtube_relay_connections_per_host
+            )
+        )
         interval = config.youtube_relay_poll_interval_minutes
         self._scheduler.add_job(
             self._poll_all,
@@ -1139,8 +1148,12 @@ class YouTubeRelayCog(commands.Cog):
         """Poll every configured relay and forward new videos to Discord.
 
         Relays are grouped by YouTube channel so the RSS feed is fetched once
-        per channel even when multiple Discord targets are configured.
+        per channel even when multiple Discord targets are configured. Up to
+        config.youtube_relay_poll_concurrency channels are polled at once. Each
+        channel is handled by a single task, so a relay still posts its new
+        videos in feed order.
         """
+        started = time.monotonic()
         relays = await get_all_relays()
 
         # Build a per-relay set of already-tracked live video IDs so resumed streams
@@ -1154,15 +1167,19 @@ class YouTubeRelayCog(commands.Cog):
         for r in relays:
             grouped.setdefault(r.yt_channel_id, []).append(r)
 
-        for yt_channel_id, channel_relays in grouped.items():
-            try:
-                await self._poll_youtube_channel(
-                    yt_channel_id, channel_relays, active_live_ids
-                )
-            except Exception:
-                self.logger.exception(
-                    'Unexpected error polling YouTube channel %s', yt_channel_id
+        limit = asyncio.Semaphore(max(1, config.youtube_relay_poll_concurrency))
+        async with asyncio.TaskGroup() as group:
+            for yt_channel_id, channel_relays in grouped.items():
+                group.create_task(
+                    self._poll_youtube_channel_limited(
+                        limit, yt_channel_id, channel_relays, active_live_ids
+                    )
                 )
+        self.logger.info(
+            'Polled %d YouTube channels in %.1fs',
+            len(grouped),
+            time.monotonic() - started,
+        )
 
         try:
             await self._check_live_sessions()
@@ -1256,6 +1273,34 @@ class YouTubeRelayCog(commands.Cog):
                 'Live session removed for video %s (status: %s)', s.video_id, vid_status
             )
 
+    async def _poll_youtube_channel_limited(
+        self,
+        limit: asyncio.Semaphore,
+        yt_channel_id: str,
+        relays: list[YouTubeRelay],
+        active_live_ids: dict[int, set[str]],
+    ) -> None:
+        """Poll one YouTube channel once a concurrency slot is free.
+
+        Waits a random jitter first so feed requests do not all start at once.
+        Errors are logged rather than raised so one channel cannot cancel the
+        rest of the cycle.
+
+        Args:
+            limit: Semaphore bounding how many channels are polled at once.
+            yt_channel_id: YouTube channel ID to poll.
+            relays: All relay rows for this YouTube channel.
+            active_live_ids: Per-relay set of live video IDs already being tracked.
+        """
+        await asyncio.sleep(random.uniform(0, config.youtube_relay_poll_jitter_seconds))
+        async with limit:
+            try:
+                await self._poll_youtube_channel(yt_channel_id, relays, active_live_ids)
+            except Exception:
+                self.logger.exception(
+                    'Unexpected error polling YouTube channel %s', yt_channel_id
+                )
+
     async def _poll_youtube_channel(
         self,
         yt_channel_id: str,
@@ -1271,15 +1316,13 @@ class YouTubeRelayCog(commands.Cog):
         """
         url = f'{_YT_RSS_BASE}?channel_id={yt_channel_id}'
         try:
-            async with self._session.get(url, timeout=_REQUEST_TIMEOUT) as resp:
-                content = await resp.text()
+            feed = await self._feeds.fetch(self._session, url, _REQUEST_TIMEOUT)
         except Exception as exc:
             self.logger.warning('Failed to fetch RSS for %s: %s', yt_channel_id, exc)
             relay_fetch_errors.labels(service='youtube').inc()
             return
 
         relay_last_poll.labels(service='youtube').set(time.time())
-        feed = feedparser.parse(content)
         self.logger.info('Polling %s: %d entries', yt_channel_id, len(feed.entries))
         if not feed.entries:
             return
@@ -1287,9 +1330,12 @@ class YouTubeRelayCog(commands.Cog):
         # Cache classifications so each video is checked once across all relay rows.
         classification_cache: dict[str, tuple[bool, bool]] = {}
         for relay in relays:
-            await self._poll_relay(
-                relay, feed.entries, classification_cache, active_live_ids
-            )
+            # The relay's bookkeeping writes share one transaction; the row is
+            # read once instead of once per write.
+            async with unit_of_work() as uow:
+                await self._poll_relay(
+                    relay, feed.entries, classification_cache, active_live_ids, uow
+                )
 
     async def _poll_relay(
         self,
@@ -1297,6 +1343,7 @@ class YouTubeRelayCog(commands.Cog):
         entries: list,
         classification_cache: dict[str, tuple[bool, bool]],
         active_live_ids: dict[int, set[str]],
+        uow: UnitOfWork,
     ) -> None:
         """Forward new entries from an already-fetched feed to one relay row.
 
@@ -1305,6 +1352,7 @@ class YouTubeRelayCog(commands.Cog):
             entries: Parsed feed entries for this YouTube channel.
             classification_cache: Shared cache of (is_short, is_live) per video ID.
             active_live_ids: Per-relay set of live video IDs already being tracked.
+            uow: Unit of work the relay's writes run in; committed before posting.
         """
         seen_ids = set(relay.seen_video_ids or [])
 
@@ -1366,12 +1414,15 @@ class YouTubeRelayCog(commands.Cog):
             )
             return
 
-        # Maintained across posts so each per-post DB write includes all IDs posted so far.
+        # Classify and filter first, so the dedupe bookkeeping for every post in
+        # this poll can be written in one commit before anything is sent.
         current_seen: list[str] = list(relay.seen_video_ids or [])
-        posted = 0
+        # (entry, video_id, is_short, is_live, seen IDs once this entry is posted)
+        to_post: list[
+            tuple[feedparser.FeedParserDict, str | None, bool, bool, list[str]]
+        ] = []
         for entry in reversed(new_entries):
-            link = entry.get('link')
-            if not link:
+            if not entry.get('link'):
                 continue
 
             video_id = self._video_id_from_entry(entry)
@@ -1398,18 +1449,25 @@ class YouTubeRelayCog(commands.Cog):
             ):
                 continue
 
+            if video_id:
+                current_seen = [video_id] + [v for v in current_seen if v != video_id]
+            to_post.append((entry, video_id, is_short, is_live, current_seen))
+
+        # Commit every video_id to seen_video_ids BEFORE sending to Discord.
+        # If the process is killed between this write and a Discord send, the
+        # next poll will find the video in seen_ids and skip it (a miss), which
+        # is far preferable to a duplicate post.
+        latest_id = self._video_id_from_entry(entries[0])
+        last_posted_id = next((p[1] for p in reversed(to_post) if p[1]), None)
+        sentinel = latest_id or last_posted_id or relay.last_video_id
+        await update_last_video_id(relay.id, sentinel, current_seen[:_SEEN_WINDOW])
+        await uow.commit()
+
+        posted = 0
+        sent_up_to = relay.last_video_id
+        for entry, video_id, is_short, is_live, seen_after in to_post:
+            link = entry['link']
             try:
-                if video_id:
-                    # Write video_id to seen_video_ids BEFORE sending to Discord.
-                    # If the process is killed between this write and the Discord send,
-                    # the next poll will find the video in seen_ids and skip it (a miss),
-                    # which is far preferable to a duplicate post.
-                    current_seen = [video_id] + [
-                        v for v in current_seen if v != video_id
-                    ]
-                    await update_last_video_id(
-                        relay.id, video_id, current_seen[:_SEEN_WINDOW]
-                    )
                 if is_live and video_id:
                     (
                         viewers,
@@ -1430,6 +1488,9 @@ class YouTubeRelayCog(commands.Cog):
                     )
                     sent = await channel.send(embed=embed)
                     await add_live_session(relay.id, video_id, sent.id)
+                    # Made durable before the next post's HTTP calls, so a crash
+                    # there cannot lose the announcement's live session.
+                    await uow.commit()
                     relay_posts.labels(service='youtube', type='live').inc()
                 else:
                     message = self._notification_message(relay, is_short, is_live)
@@ -1438,15 +1499,22 @@ class YouTubeRelayCog(commands.Cog):
                         service='youtube', type='short' if is_short else 'video'
                     ).inc()
                 posted += 1
-            except discord.Forbidden:
+            except Exception as exc:
+                # Forget the posts not attempted yet so the next poll retries
+                # them; the failed one stays seen, as before.
+                await uow.rollback()
+                await update_last_video_id(
+                    relay.id, video_id or sent_up_to, seen_after[:_SEEN_WINDOW]
+                )
+                await uow.commit()
+                if not isinstance(exc, discord.Forbidden):
+                    raise
                 self.logger.warning(
                     'No permission to post in channel %d for relay %d',
                     relay.discord_channel_id,
                     relay.id,
                 )
                 return
+            sent_up_to = video_id or sent_up_to
 
-        latest_id = self._video_id_from_entry(entries[0])
-        if latest_id:
-            await update_last_video_id(relay.id, latest_id, current_seen[:_SEEN_WINDOW])
         self.logger.info('Relay %d: posted %d new video(s)', relay.id, posted)
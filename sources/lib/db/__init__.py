@@ -9,13 +9,33 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from sources.config import config
+from sources.lib.db.instrumentation import (
+    SlowQueryMonitor,
+    TimedQueuePool,
+    register_pool_metrics,
+)
+from sources.lib.db.unit_of_work import SessionSource
 
-async_engine = create_async_engine(url=config.async_db_url)
+async_engine = create_async_engine(
+    url=config.async_db_url,
+    poolclass=TimedQueuePool,
+    pool_size=config.db_pool_size,
+    max_overflow=config.db_max_overflow,
+    pool_timeout=config.db_pool_timeout,
+    pool_recycle=config.db_pool_recycle,
+    pool_pre_ping=config.db_pool_pre_ping,
+)
+SlowQueryMonitor(config.db_slow_query_ms / 1000).attach(async_engine)
+register_pool_metrics(async_engine)
 async_session_factory = async_sessionmaker(
     bind=async_engine,
     expire_on_commit=False,
 )
-AsyncSession = async_scoped_session(
-    session_factory=async_session_factory,
-    scopefunc=current_task,
+AsyncSession = SessionSource(
+    async_scoped_session(
+        session_factory=async_session_factory,
+        scopefunc=current_task,
+    ),
+    async_session_factory,
 )
+unit_of_work = AsyncSession.unit_of_work
@@ -0,0 +1,35 @@
+"""add message_stats_buckets table
+
+Revision ID: a4b5c6d7e8f9
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-18 14:03:27.118604
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4b5c6d7e8f9'
+down_revision: str | None = 'f1a2b3c4d5e6'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'message_stats_buckets',
+        sa.Column('guild_id', sa.BigInteger(), nullable=False),
+        sa.Column('period', sa.Text(), nullable=False),
+        sa.Column('bucket_start', sa.Date(), nullable=False),
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        sa.Column('message_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['guild_id'], ['guilds.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('guild_id', 'period', 'bucket_start', 'user_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('message_stats_buckets')
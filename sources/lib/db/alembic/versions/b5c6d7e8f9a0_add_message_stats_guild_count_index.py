@@ -0,0 +1,30 @@
+"""add message_stats (guild_id, message_count DESC) index
+
+Revision ID: b5c6d7e8f9a0
+Revises: a4b5c6d7e8f9
+Create Date: 2026-10-18 15:21:09.642871
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c6d7e8f9a0'
+down_revision: str | None = 'a4b5c6d7e8f9'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_message_stats_guild_count',
+        'message_stats',
+        ['guild_id', sa.text('message_count DESC')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_message_stats_guild_count', table_name='message_stats')
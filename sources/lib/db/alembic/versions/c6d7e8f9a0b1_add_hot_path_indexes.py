@@ -0,0 +1,64 @@
+"""add partial and composite indexes for hot-path queries
+
+Revision ID: c6d7e8f9a0b1
+Revises: b5c6d7e8f9a0
+Create Date: 2026-10-18 18:42:31.208514
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6d7e8f9a0b1'
+down_revision: str | None = 'b5c6d7e8f9a0'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Predicates are written exactly as the queries filter, so the planner can
+    # prove the partial index covers them.
+    op.create_index(
+        'ix_reminders_pending',
+        'reminders',
+        ['remind_at'],
+        postgresql_where=sa.text('is_sent IS false'),
+    )
+    op.create_index(
+        'ix_reminders_pending_user',
+        'reminders',
+        ['user_id', 'remind_at'],
+        postgresql_where=sa.text('is_sent IS false'),
+    )
+    op.create_index(
+        'ix_auto_responders_expires_at',
+        'auto_responders',
+        ['expires_at'],
+        postgresql_where=sa.text('expires_at IS NOT NULL'),
+    )
+    op.create_index(
+        'ix_guild_member_birthdays_announced',
+        'guild_member_birthdays',
+        ['guild_id', 'last_announced_year'],
+    )
+    op.create_index(
+        'ix_stats_import_progress_incomplete',
+        'stats_import_progress',
+        ['guild_id'],
+        postgresql_where=sa.text('is_completed IS false'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_stats_import_progress_incomplete', table_name='stats_import_progress'
+    )
+    op.drop_index(
+        'ix_guild_member_birthdays_announced', table_name='guild_member_birthdays'
+    )
+    op.drop_index('ix_auto_responders_expires_at', table_name='auto_responders')
+    op.drop_index('ix_reminders_pending_user', table_name='reminders')
+    op.drop_index('ix_reminders_pending', table_name='reminders')
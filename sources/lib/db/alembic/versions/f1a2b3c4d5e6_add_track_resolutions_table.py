@@ -0,0 +1,33 @@
+"""add track_resolutions table
+
+Revision ID: f1a2b3c4d5e6
+Revises: bc25943c8c1d
+Create Date: 2026-10-18 10:12:41.503112
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a2b3c4d5e6'
+down_revision: str | None = 'bc25943c8c1d'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'track_resolutions',
+        sa.Column('source_platform', sa.Text(), nullable=False),
+        sa.Column('source_id', sa.Text(), nullable=False),
+        sa.Column('target_id', sa.Text(), nullable=True),
+        sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('source_platform', 'source_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('track_resolutions')
@@ -0,0 +1,116 @@
+"""Read-through in-memory caches for frequently read DB rows."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from sources.lib.db.unit_of_work import after_commit, current_unit_of_work
+from sources.lib.utils.metrics import db_row_cache_lookups
+
+_TTL_SECONDS = 300
+_MAX_ENTRIES = 10_000
+
+
+class RowCache:
+    """LRU cache with TTL in front of a single-row lookup.
+
+    Missing rows are cached too, as None. Writers must call :meth:`invalidate`
+    after committing. Every invalidation bumps a generation counter, and a
+    load that started before an invalidation is returned but not stored, so
+    it cannot re-cache a row that was just replaced.
+
+    Args:
+        name: Cache name used as the metrics label.
+        ttl: Seconds an entry stays valid.
+        max_entries: Maximum number of entries kept.
+        clock: Monotonic time source in seconds, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float = _TTL_SECONDS,
+        max_entries: int = _MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialise an empty cache.
+
+        Args:
+            name: Cache name used as the metrics label.
+            ttl: Seconds an entry stays valid.
+            max_entries: Maximum number of entries kept.
+            clock: Monotonic time source in seconds, injectable for tests.
+        """
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._clock = clock
+        # key -> (row or None, monotonic expiry time), least recently used first
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._generation = 0
+        self._hits = db_row_cache_lookups.labels(cache=name, result='hit')
+        self._misses = db_row_cache_lookups.labels(cache=name, result='miss')
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached row for key, loading it on a miss.
+
+        Args:
+            key: Row key, e.g. a guild ID.
+            load: Coroutine function that reads the row from the database.
+
+        Returns:
+            The row, or None if it does not exist.
+        """
+        if current_unit_of_work() is not None:
+            # The row may carry the unit of work's uncommitted writes.
+            return await load()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            row, expires_at = entry
+            if self._clock() < expires_at:
+                self._entries.move_to_end(key)
+                self._hits.inc()
+                return row
+            del self._entries[key]
+
+        self._misses.inc()
+        generation = self._generation
+        row = await load()
+        if self._generation == generation:
+            self._entries[key] = (row, self._clock() + self._ttl)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return row
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop the entry for key; the next lookup reads the database.
+
+        Inside a unit of work the entry is dropped once the write commits.
+
+        Args:
+            key: Row key.
+        """
+        after_commit(lambda: self._drop(key))
+
+    def _drop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+        self._generation += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self._generation += 1
+
+
+# guild_id -> GuildSettings
+guild_settings_cache = RowCache('guild_settings')
+# user_id -> User
+user_cache = RowCache('users')
@@ -1,12 +1,18 @@
 """Generic CRUD operations via a bound SQLAlchemy async session."""
 
+from collections.abc import Mapping, Sequence
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import Column, Row, delete, insert, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sources.lib.db.models import Base
 
+# Keys per DELETE statement; keeps bulk_delete well under PostgreSQL's limit
+# of 65535 bind parameters per statement.
+_DELETE_CHUNK_SIZE = 1000
+
 
 class CRUDBase:
     """Generic CRUD helper bound to a single SQLAlchemy async session.
@@ -79,21 +85,200 @@ class CRUDBase:
         if entity is not None:
             await self.delete(entity)
 
+    @staticmethod
+    def _columns(table_class: type[Base], names: Sequence[str]) -> list[Column]:
+        """Return the table columns with the given names.
+
+        Args:
+            table_class: ORM model class.
+            names: Column names.
+        """
+        return [table_class.__table__.c[name] for name in names]
+
     async def upsert(
         self,
         table_class: type[Base],
         filters: dict[str, Any],
         updates: dict[str, Any],
-    ) -> None:
+        returning: Sequence[str] = (),
+    ) -> Row | None:
         """Create a row if it does not exist, otherwise update it.
 
+        Runs a single INSERT ... ON CONFLICT statement, so concurrent callers
+        cannot race between the existence check and the write.
+
         Args:
             table_class: ORM model class.
-            filters: Column values used to look up the existing row.
+            filters: Column values identifying the row; their columns must
+                form the table's primary key or a unique index.
             updates: Column values to set on create or update.
+            returning: Column names to return from the written row.
+
+        Returns:
+            The requested columns of the written row, or None if returning is
+            empty or updates is empty and the row already existed.
         """
-        entity = await self.get(table_class, **filters)
-        if entity is None:
-            await self.create(table_class, **{**filters, **updates})
+        stmt = pg_insert(table_class).values(**filters, **updates)
+        if updates:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(filters),
+                set_={name: stmt.excluded[name] for name in updates},
+            )
         else:
-            await self.update(entity, **updates)
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(filters))
+        if returning:
+            stmt = stmt.returning(*self._columns(table_class, returning))
+        result = await self._session.execute(stmt)
+        row = result.one_or_none() if returning else None
+        await self._session.commit()
+        return row
+
+    async def bulk_upsert(
+        self,
+        table_class: type[Base],
+        rows: Sequence[Mapping[str, Any]],
+        conflict_columns: Sequence[str],
+        update_columns: Sequence[str] | None = None,
+        returning: Sequence[str] = (),
+    ) -> list[Row]:
+        """Create or update many rows with batched INSERT ... ON CONFLICT.
+
+        Rows sharing a conflict key are collapsed to the last one, since one
+        statement cannot update the same row twice.
+
+        Args:
+            table_class: ORM model class.
+            rows: Column values for each row; all rows must have the same keys.
+            conflict_columns: Columns of the primary key or unique index that
+                identifies a row.
+            update_columns: Columns overwritten on conflict; defaults to every
+                non-conflict column in rows. Empty leaves existing rows as is.
+            returning: Column names to return from each written row.
+
+        Returns:
+            The requested columns of each written row, or an empty list. When
+            update_columns is empty only newly inserted rows are returned, in
+            no particular order.
+        """
+        if not rows:
+            return []
+        unique = list(
+            {
+                tuple(row[name] for name in conflict_columns): row for row in rows
+            }.values()
+        )
+        if update_columns is None:
+            update_columns = [
+                name for name in unique[0] if name not in conflict_columns
+            ]
+
+        stmt = pg_insert(table_class)
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(conflict_columns),
+                set_={name: stmt.excluded[name] for name in update_columns},
+            )
+            return await self._execute_many(table_class, stmt, unique, returning)
+        stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+        # Skipped rows return nothing, so results cannot be matched back to
+        # their parameter sets; insertmanyvalues would reject the short result.
+        return await self._execute_many(
+            table_class, stmt, unique, returning, sort_by_parameter_order=False
+        )
+
+    async def bulk_create(
+        self,
+        table_class: type[Base],
+        rows: Sequence[Mapping[str, Any]],
+        returning: Sequence[str] = (),
+    ) -> list[Row]:
+        """Insert many rows with batched multi-row INSERT statements.
+
+        Args:
+            table_class: ORM model class.
+            rows: Column values for each row; all rows must have the same keys.
+            returning: Column names to return from each inserted row, e.g.
+                generated primary keys.
+
+        Returns:
+            The requested columns of each inserted row, in input order, or an
+            empty list.
+        """
+        if not rows:
+            return []
+        return await self._execute_many(
+            table_class, insert(table_class), list(rows), returning
+        )
+
+    async def bulk_delete(
+        self,
+        table_class: type[Base],
+        keys: Sequence[Mapping[str, Any]],
+        returning: Sequence[str] = (),
+    ) -> list[Row]:
+        """Delete many rows identified by their key column values.
+
+        Args:
+            table_class: ORM model class.
+            keys: Column values identifying each row, e.g.
+                ``[{'guild_id': 1, 'user_id': 2}]``; all keys must have the
+                same columns.
+            returning: Column names to return from each deleted row.
+
+        Returns:
+            The requested columns of each deleted row, or an empty list.
+        """
+        if not keys:
+            return []
+        names = list(keys[0])
+        columns = self._columns(table_class, names)
+        key_column = columns[0] if len(columns) == 1 else tuple_(*columns)
+        deleted: list[Row] = []
+        for start in range(0, len(keys), _DELETE_CHUNK_SIZE):
+            chunk = keys[start : start + _DELETE_CHUNK_SIZE]
+            values = [
+                key[names[0]] if len(names) == 1 else tuple(key[n] for n in names)
+                for key in chunk
+            ]
+            stmt = delete(table_class).where(key_column.in_(values))
+            if returning:
+                stmt = stmt.returning(*self._columns(table_class, returning))
+            result = await self._session.execute(stmt)
+            if returning:
+                deleted.extend(result.all())
+        await self._session.commit()
+        return deleted
+
+    async def _execute_many(
+        self,
+        table_class: type[Base],
+        stmt: Any,
+        rows: list[Mapping[str, Any]],
+        returning: Sequence[str],
+        sort_by_parameter_order: bool = True,
+    ) -> list[Row]:
+        """Execute an INSERT for many rows and commit.
+
+        SQLAlchemy's insertmanyvalues mode sends the rows as batched
+        multi-row VALUES statements rather than one statement per row.
+
+        Args:
+            table_class: ORM model class.
+            stmt: INSERT statement without values.
+            rows: Column values for each row.
+            returning: Column names to return from each written row.
+            sort_by_parameter_order: Return rows in the order of rows; requires
+                every row to produce exactly one result row.
+
+        Returns:
+            The requested columns of each written row, or an empty list.
+        """
+        if returning:
+            stmt = stmt.returning(
+                *self._columns(table_class, returning),
+                sort_by_parameter_order=sort_by_parameter_order,
+            )
+        result = await self._session.execute(stmt, rows)
+        written = list(result.all()) if returning else []
+        await self._session.commit()
+        return written
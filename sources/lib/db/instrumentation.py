@@ -0,0 +1,206 @@
+"""Operation latency, slow query and connection pool metrics for the DB layer."""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import time
+from collections.abc import Callable, Coroutine
+from contextvars import ContextVar
+from types import ModuleType
+from typing import Any, ParamSpec, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from sources.lib.utils.logger import Logger
+from sources.lib.utils.metrics import (
+    db_operation_calls,
+    db_operation_latency,
+    db_pool_checked_out,
+    db_pool_idle,
+    db_pool_overflow,
+    db_pool_wait,
+    db_query_latency,
+)
+
+_P = ParamSpec('_P')
+_R = TypeVar('_R')
+
+# Queries run outside any instrumented operation are labelled with this name.
+UNATTRIBUTED = 'other'
+# Longest parameter repr written to a slow query log line.
+_MAX_LOGGED_PARAMS = 500
+
+_current_operation: ContextVar[str] = ContextVar(
+    'db_current_operation', default=UNATTRIBUTED
+)
+_START_KEY = 'instrumentation_query_start'
+
+
+def current_operation() -> str:
+    """Return the name of the innermost operation running in this context."""
+    return _current_operation.get()
+
+
+def timed_operation(
+    name: str,
+) -> Callable[
+    [Callable[_P, Coroutine[Any, Any, _R]]], Callable[_P, Coroutine[Any, Any, _R]]
+]:
+    """Decorate a coroutine function to record its latency and outcome.
+
+    Queries it issues are attributed to name while it runs.
+
+    Args:
+        name: Operation label, e.g. 'stats.get_leaderboard'.
+    """
+
+    def decorator(
+        func: Callable[_P, Coroutine[Any, Any, _R]],
+    ) -> Callable[_P, Coroutine[Any, Any, _R]]:
+        @functools.wraps(func)
+        async def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+            token = _current_operation.set(name)
+            started = time.perf_counter()
+            outcome = 'error'
+            try:
+                result = await func(*args, **kwargs)
+                outcome = 'ok'
+                return result
+            finally:
+                db_operation_latency.labels(operation=name).observe(
+                    time.perf_counter() - started
+                )
+                db_operation_calls.labels(operation=name, outcome=outcome).inc()
+                _current_operation.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_module(module: ModuleType) -> None:
+    """Wrap every public coroutine function defined in an operations module.
+
+    The operation name is the module's last dotted component plus the
+    function name, e.g. 'stats.get_leaderboard'. Must run before other
+    modules import the functions, which the operations package guarantees.
+
+    Args:
+        module: An imported module from sources.lib.db.operations.
+    """
+    prefix = module.__name__.rsplit('.', 1)[-1]
+    for attr, func in list(vars(module).items()):
+        if (
+            attr.startswith('_')
+            or not inspect.iscoroutinefunction(func)
+            or func.__module__ != module.__name__
+            or hasattr(func, '__wrapped__')
+        ):
+            continue
+        setattr(module, attr, timed_operation(f'{prefix}.{attr}')(func))
+
+
+class SlowQueryMonitor:
+    """Engine event hooks that time every statement.
+
+    Each statement's latency is recorded under the operation that issued it.
+    Statements slower than the threshold are logged with their SQL and
+    parameters.
+
+    Args:
+        slow_query_seconds: Latency above which a statement is logged.
+    """
+
+    def __init__(self, slow_query_seconds: float) -> None:
+        """Initialise the monitor.
+
+        Args:
+            slow_query_seconds: Latency above which a statement is logged.
+        """
+        self._slow_query_seconds = slow_query_seconds
+        self._logger = Logger()
+
+    def attach(self, engine: AsyncEngine) -> None:
+        """Register the hooks on an engine.
+
+        Args:
+            engine: The async engine whose statements are timed.
+        """
+        event.listen(engine.sync_engine, 'before_cursor_execute', self.before_execute)
+        event.listen(engine.sync_engine, 'after_cursor_execute', self.after_execute)
+
+    def before_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        """Remember when a statement started.
+
+        A connection runs one statement at a time, so a single start time is
+        kept. A statement that raised never reaches after_execute; its start
+        time is overwritten here by the next one rather than piling up.
+        """
+        conn.info[_START_KEY] = time.perf_counter()
+
+    def after_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        """Record a finished statement and log it if it was slow."""
+        started = conn.info.pop(_START_KEY, None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        operation = current_operation()
+        db_query_latency.labels(operation=operation).observe(elapsed)
+        if elapsed >= self._slow_query_seconds:
+            params = repr(parameters)
+            if len(params) > _MAX_LOGGED_PARAMS:
+                params = params[:_MAX_LOGGED_PARAMS] + '...'
+            self._logger.warning(
+                'Slow query in %s (%.0f ms): %s | params: %s',
+                operation,
+                elapsed * 1000,
+                ' '.join(statement.split()),
+                params,
+            )
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waits."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        """Take a connection from the pool, timing the wait."""
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait.observe(time.perf_counter() - started)
+
+
+def register_pool_metrics(engine: AsyncEngine) -> None:
+    """Publish an engine's pool occupancy through the pool gauges.
+
+    The gauges read the pool on every scrape, so they follow the engine's
+    current pool even after it is disposed and recreated.
+
+    Args:
+        engine: The async engine whose pool is reported.
+    """
+    db_pool_checked_out.set_function(lambda: engine.sync_engine.pool.checkedout())
+    db_pool_idle.set_function(lambda: engine.sync_engine.pool.checkedin())
+    # QueuePool counts overflow from -pool_size, so only positive values are extra.
+    db_pool_overflow.set_function(lambda: max(engine.sync_engine.pool.overflow(), 0))
@@ -1,17 +1,20 @@
 """DB models"""
 
-from datetime import datetime
+from datetime import date, datetime
 
 from sqlalchemy import (
     JSON,
     BigInteger,
     Boolean,
+    Date,
     DateTime,
     ForeignKey,
     Index,
     Integer,
     SmallInteger,
     Text,
+    desc,
+    text,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -122,6 +125,14 @@ class GuildMemberBirthday(Base):
     # Tracks the last calendar year an announcement was sent to avoid duplicates.
     last_announced_year: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
 
+    __table_args__ = (
+        Index(
+            'ix_guild_member_birthdays_announced',
+            'guild_id',
+            'last_announced_year',
+        ),
+    )
+
 
 class MusicLinksChannel(Base):
     """Allowlist of channels where music link conversion is active for a guild.
@@ -154,6 +165,21 @@ class Reminder(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     is_sent: Mapped[bool] = mapped_column(Boolean, default=False)
 
+    # Only unsent reminders are ever queried, so both indexes skip sent rows.
+    __table_args__ = (
+        Index(
+            'ix_reminders_pending',
+            'remind_at',
+            postgresql_where=text('is_sent IS false'),
+        ),
+        Index(
+            'ix_reminders_pending_user',
+            'user_id',
+            'remind_at',
+            postgresql_where=text('is_sent IS false'),
+        ),
+    )
+
 
 class TelegramRelay(Base):
     """A Telegram public channel relayed to a Discord channel."""
@@ -339,7 +365,14 @@ class AutoResponder(Base):
         DateTime(timezone=True), nullable=True
     )
 
-    __table_args__ = (Index('uq_auto_responders', 'guild_id', 'user_id', unique=True),)
+    __table_args__ = (
+        Index('uq_auto_responders', 'guild_id', 'user_id', unique=True),
+        Index(
+            'ix_auto_responders_expires_at',
+            'expires_at',
+            postgresql_where=text('expires_at IS NOT NULL'),
+        ),
+    )
 
 
 class MessageStats(Base):
@@ -355,6 +388,33 @@ class MessageStats(Base):
     user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     message_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
+    __table_args__ = (
+        Index('ix_message_stats_guild_count', 'guild_id', desc('message_count')),
+    )
+
+
+class MessageStatsBucket(Base):
+    """Message count per user per guild within one day or one calendar month.
+
+    Recent activity is kept in daily buckets; older daily buckets are rolled up
+    into monthly ones. The primary key leads with (guild_id, period, bucket_start)
+    so windowed leaderboards are a range scan over a single guild.
+    """
+
+    __tablename__ = 'message_stats_buckets'
+
+    guild_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey('guilds.id', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    # 'day' or 'month'
+    period: Mapped[str] = mapped_column(Text, primary_key=True)
+    # UTC date the bucket starts on; the first of the month for monthly buckets.
+    bucket_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    message_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
 
 class StatsImportProgress(Base):
     """Per-channel checkpoint for historical message import."""
@@ -370,3 +430,26 @@ class StatsImportProgress(Base):
     # Snowflake ID of the last processed message; NULL means not yet started.
     last_message_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     is_completed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        Index(
+            'ix_stats_import_progress_incomplete',
+            'guild_id',
+            postgresql_where=text('is_completed IS false'),
+        ),
+    )
+
+
+class TrackResolution(Base):
+    """Cached cross-platform match for a music track, e.g. YouTube -> Spotify."""
+
+    __tablename__ = 'track_resolutions'
+
+    # Platform the source_id belongs to: 'youtube' or 'spotify'.
+    source_platform: Mapped[str] = mapped_column(Text, primary_key=True)
+    source_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    # ID on the other platform; NULL records that no match was found.
+    target_id: Mapped[str | None] = mapped_column(Text, nullable=True)
+    resolved_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
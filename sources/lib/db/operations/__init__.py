@@ -1 +1,13 @@
-"""DB operations package"""
+"""DB operations package
+
+Every public coroutine in the submodules is wrapped with latency and call
+metrics on package import, before any caller can import it.
+"""
+
+import importlib
+import pkgutil
+
+from sources.lib.db.instrumentation import instrument_module
+
+for _module_info in pkgutil.iter_modules(__path__):
+    instrument_module(importlib.import_module(f'{__name__}.{_module_info.name}'))
@@ -94,6 +94,20 @@ async def list_auto_responders(guild_id: int) -> list[AutoResponder]:
         return list((await session.scalars(stmt)).all())
 
 
+async def list_all_auto_responders() -> list[AutoResponder]:
+    """Return every active (non-expired) auto-responder across all guilds.
+
+    Returns:
+        List of active AutoResponder instances.
+    """
+    async with AsyncSession() as session:
+        now = datetime.now(tz=UTC)
+        stmt = select(AutoResponder).where(
+            (AutoResponder.expires_at.is_(None)) | (AutoResponder.expires_at > now),
+        )
+        return list((await session.scalars(stmt)).all())
+
+
 async def delete_expired_auto_responders() -> int:
     """Delete all auto-responders whose expiry has passed.
 
@@ -3,6 +3,7 @@
 from sqlalchemy import select
 
 from sources.lib.db import AsyncSession
+from sources.lib.db.cache import guild_settings_cache
 from sources.lib.db.crud.base import CRUDBase
 from sources.lib.db.models import GuildMemberBirthday, GuildSettings
 
@@ -124,8 +125,8 @@ async def mark_birthday_announced(guild_id: int, user_id: int, year: int) -> Non
             await crud.update(record, last_announced_year=year)
 
 
-async def get_guild_settings(guild_id: int) -> GuildSettings | None:
-    """Return guild settings, or None if not yet configured.
+async def _load_guild_settings(guild_id: int) -> GuildSettings | None:
+    """Read guild settings from the database, bypassing the cache.
 
     Args:
         guild_id: Discord guild ID.
@@ -134,6 +135,19 @@ async def get_guild_settings(guild_id: int) -> GuildSettings | None:
         return await CRUDBase(session).get(GuildSettings, guild_id=guild_id)
 
 
+async def get_guild_settings(guild_id: int) -> GuildSettings | None:
+    """Return guild settings, or None if not yet configured.
+
+    Served from guild_settings_cache; the returned row must not be mutated.
+
+    Args:
+        guild_id: Discord guild ID.
+    """
+    return await guild_settings_cache.get(
+        guild_id, lambda: _load_guild_settings(guild_id)
+    )
+
+
 async def upsert_guild_settings(guild_id: int, **updates: object) -> None:
     """Create or update guild settings with the provided field values.
 
@@ -147,3 +161,4 @@ async def upsert_guild_settings(guild_id: int, **updates: object) -> None:
             filters={'guild_id': guild_id},
             updates=dict(updates),
         )
+    guild_settings_cache.invalidate(guild_id)
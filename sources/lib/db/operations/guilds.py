@@ -1,8 +1,15 @@
 """Operations with DB table `guilds`"""
 
+from collections.abc import Collection, Mapping
+
+from sqlalchemy import BigInteger, Text, all_, any_, bindparam, delete, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
 from sources.lib.db import AsyncSession
+from sources.lib.db.cache import guild_settings_cache
 from sources.lib.db.crud.base import CRUDBase
-from sources.lib.db.models import Guild
+from sources.lib.db.models import Guild, VoiceChannel
 
 
 async def upsert_guild(guild_id: int, guild_name: str) -> None:
@@ -19,3 +26,114 @@ async def delete_guild(guild_id: int) -> None:
     """Delete a guild record from DB. Cascades to guild_domain_fixers."""
     async with AsyncSession() as session:
         await CRUDBase(session).delete_if_exists(Guild, id=guild_id)
+    guild_settings_cache.invalidate(guild_id)
+
+
+async def reconcile_guilds(
+    guild_names: Mapping[int, str],
+    voice_channels: Mapping[int, tuple[int, str]],
+    unavailable_guild_ids: Collection[int] = (),
+) -> list[int]:
+    """Bring the guilds and voice_channels tables in line with Discord at once.
+
+    Runs four set-based statements in one transaction, whatever the number
+    of guilds: upsert all guilds, delete guilds the bot is no longer in
+    (cascading to their data), upsert all voice channels keeping their
+    status, and delete voice channels that no longer exist in synced guilds.
+    Each statement binds its rows as array parameters.
+
+    Unavailable guilds (e.g. during a Discord outage) are kept with their
+    rows untouched. Nothing is deleted when no guilds are given at all, so
+    an empty guild cache can never wipe the database.
+
+    Args:
+        guild_names: Mapping of available guild ID to guild name.
+        voice_channels: Mapping of voice channel ID to (guild_id, name) for
+            every voice and stage channel in the available guilds.
+        unavailable_guild_ids: Guilds the bot is in whose data is unknown.
+
+    Returns:
+        IDs of the guilds that were deleted.
+    """
+    guild_ids = list(guild_names)
+    kept_ids = guild_ids + list(unavailable_guild_ids)
+    channel_ids = list(voice_channels)
+    async with AsyncSession() as session:
+        if guild_ids:
+            incoming = (
+                func.unnest(
+                    bindparam('ids', guild_ids, type_=ARRAY(BigInteger)),
+                    bindparam('names', list(guild_names.values()), type_=ARRAY(Text)),
+                )
+                .table_valued('id', 'name')
+                .render_derived(name='incoming')
+            )
+            stmt = pg_insert(Guild).from_select(['id', 'name'], select(incoming))
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=['id'],
+                    set_={'name': stmt.excluded.name},
+                    where=Guild.name.is_distinct_from(stmt.excluded.name),
+                )
+            )
+
+        deleted: list[int] = []
+        if kept_ids:
+            result = await session.execute(
+                delete(Guild)
+                .where(
+                    Guild.id
+                    != all_(bindparam('kept', kept_ids, type_=ARRAY(BigInteger)))
+                )
+                .returning(Guild.id)
+            )
+            deleted = list(result.scalars().all())
+
+        if channel_ids:
+            incoming = (
+                func.unnest(
+                    bindparam('channel_ids', channel_ids, type_=ARRAY(BigInteger)),
+                    bindparam(
+                        'guild_ids',
+                        [guild_id for guild_id, _ in voice_channels.values()],
+                        type_=ARRAY(BigInteger),
+                    ),
+                    bindparam(
+                        'names',
+                        [name for _, name in voice_channels.values()],
+                        type_=ARRAY(Text),
+                    ),
+                )
+                .table_valued('channel_id', 'guild_id', 'name')
+                .render_derived(name='incoming')
+            )
+            stmt = pg_insert(VoiceChannel).from_select(
+                ['channel_id', 'guild_id', 'name'], select(incoming)
+            )
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=['channel_id'],
+                    set_={
+                        'guild_id': stmt.excluded.guild_id,
+                        'name': stmt.excluded.name,
+                    },
+                    where=(
+                        VoiceChannel.guild_id.is_distinct_from(stmt.excluded.guild_id)
+                        | VoiceChannel.name.is_distinct_from(stmt.excluded.name)
+                    ),
+                )
+            )
+
+        if guild_ids:
+            await session.execute(
+                delete(VoiceChannel).where(
+                    VoiceChannel.guild_id
+                    == any_(bindparam('synced', guild_ids, type_=ARRAY(BigInteger))),
+                    VoiceChannel.channel_id
+                    != all_(bindparam('current', channel_ids, type_=ARRAY(BigInteger))),
+                )
+            )
+        await session.commit()
+    for guild_id in deleted:
+        guild_settings_cache.invalidate(guild_id)
+    return deleted
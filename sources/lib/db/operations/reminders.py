@@ -60,14 +60,16 @@ async def create_reminder(
 
 
 async def get_pending_reminders() -> list[Reminder]:
-    """Return all reminders that have not been sent yet.
+    """Return all reminders that have not been sent yet, ordered by fire time.
 
     Returns:
         List of unsent Reminder instances.
     """
     async with AsyncSession() as session:
         result = await session.scalars(
-            select(Reminder).where(Reminder.is_sent.is_(False))
+            select(Reminder)
+            .where(Reminder.is_sent.is_(False))
+            .order_by(Reminder.remind_at)
         )
         return list(result.all())
 
@@ -1,10 +1,180 @@
-"""Operations with DB tables `message_stats` and `stats_import_progress`"""
+"""Operations with DB tables `message_stats`, `message_stats_buckets` and `stats_import_progress`"""
 
-from sqlalchemy import select
+from datetime import date
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Date,
+    Integer,
+    Row,
+    Select,
+    bindparam,
+    cast,
+    delete,
+    func,
+    literal,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, Insert
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from sources.lib.db import AsyncSession
-from sources.lib.db.models import MessageStats, StatsImportProgress
+from sources.lib.db.models import (
+    Guild,
+    MessageStats,
+    MessageStatsBucket,
+    StatsImportProgress,
+)
+
+# Batches at or above this many rows are streamed through COPY into a staging
+# table instead of being bound as array parameters.
+_COPY_THRESHOLD = 5000
+
+_STAGING_TABLE = 'message_stats_staging'
+
+# MessageStatsBucket.period values
+BUCKET_DAY = 'day'
+BUCKET_MONTH = 'month'
+_BUCKET_KEY = ['guild_id', 'period', 'bucket_start', 'user_id']
+
+
+def _existing_guilds_only(query: Select, guild_id: ColumnElement) -> Select:
+    """Restrict an INSERT source query to rows whose guild still exists.
+
+    Counts can still be buffered for a guild the bot has just left; without
+    this filter the guilds foreign key would fail the whole multi-guild
+    batch. The matched guild rows are locked FOR KEY SHARE, so a concurrent
+    delete_guild either waits for this transaction or removes the guild
+    before its rows are read.
+
+    Args:
+        query: SELECT producing the rows to insert.
+        guild_id: The query's guild ID column.
+    """
+    return query.join(Guild, Guild.id == guild_id).with_for_update(
+        of=Guild, read=True, key_share=True
+    )
+
+
+def _unnest_upsert(counts: dict[tuple[int, int], int]) -> Insert:
+    """Build one INSERT ... SELECT FROM unnest(...) ON CONFLICT statement.
+
+    The whole mapping is bound as three array parameters, so the statement
+    text and parameter count stay the same regardless of batch size. Rows for
+    guilds that no longer exist are skipped.
+
+    Args:
+        counts: Mapping of (guild_id, user_id) to the number of messages to add.
+
+    Returns:
+        The upsert statement, ready to execute. It returns the new
+        (guild_id, user_id, message_count) totals of every affected row.
+    """
+    keys = list(counts)
+    incoming = (
+        func.unnest(
+            bindparam('guild_ids', [k[0] for k in keys], type_=ARRAY(BigInteger)),
+            bindparam('user_ids', [k[1] for k in keys], type_=ARRAY(BigInteger)),
+            bindparam('deltas', list(counts.values()), type_=ARRAY(Integer)),
+        )
+        .table_valued('guild_id', 'user_id', 'message_count')
+        .render_derived(name='incoming')
+    )
+    stmt = pg_insert(MessageStats).from_select(
+        ['guild_id', 'user_id', 'message_count'],
+        _existing_guilds_only(
+            select(incoming.c.guild_id, incoming.c.user_id, incoming.c.message_count),
+            incoming.c.guild_id,
+        ),
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=['guild_id', 'user_id'],
+        set_={
+            'message_count': MessageStats.message_count + stmt.excluded.message_count
+        },
+    ).returning(MessageStats.guild_id, MessageStats.user_id, MessageStats.message_count)
+
+
+async def _copy_upsert(
+    session: AsyncSession, counts: dict[tuple[int, int], int]
+) -> list[Row]:
+    """Stream counts into a temporary staging table via COPY, then merge them.
+
+    Rows for guilds that no longer exist are skipped. Runs inside the caller's
+    transaction; the caller is responsible for commit.
+
+    Args:
+        session: Active async DB session.
+        counts: Mapping of (guild_id, user_id) to the number of messages to add.
+
+    Returns:
+        New (guild_id, user_id, message_count) totals of every affected row.
+    """
+    await session.execute(
+        text(
+            f'CREATE TEMP TABLE {_STAGING_TABLE} '
+            '(guild_id BIGINT, user_id BIGINT, message_count INTEGER) ON COMMIT DROP'
+        )
+    )
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    async with raw_connection.driver_connection.cursor() as cursor:
+        async with cursor.copy(
+            f'COPY {_STAGING_TABLE} (guild_id, user_id, message_count) FROM STDIN'
+        ) as copy:
+            for (guild_id, user_id), delta in counts.items():
+                await copy.write_row((guild_id, user_id, delta))
+    result = await session.execute(
+        text(
+            'INSERT INTO message_stats (guild_id, user_id, message_count) '
+            'SELECT s.guild_id, s.user_id, s.message_count '
+            f'FROM {_STAGING_TABLE} s JOIN guilds ON guilds.id = s.guild_id '
+            'FOR KEY SHARE OF guilds '
+            'ON CONFLICT (guild_id, user_id) DO UPDATE '
+            'SET message_count = message_stats.message_count + EXCLUDED.message_count '
+            'RETURNING guild_id, user_id, message_count'
+        )
+    )
+    totals = list(result.all())
+    await session.execute(text(f'DROP TABLE {_STAGING_TABLE}'))
+    return totals
+
+
+async def write_message_counts(
+    session: AsyncSession, counts: dict[tuple[int, int], int]
+) -> list[Row]:
+    """Add message count deltas within an existing session, without committing.
+
+    Uses a single unnest-based upsert, switching to COPY into a staging table
+    for batches of _COPY_THRESHOLD rows or more.
+
+    Args:
+        session: Active async DB session.
+        counts: Mapping of (guild_id, user_id) to the number of messages to add.
+
+    Returns:
+        New (guild_id, user_id, message_count) totals of every affected row.
+    """
+    if not counts:
+        return []
+    if len(counts) >= _COPY_THRESHOLD:
+        return await _copy_upsert(session, counts)
+    return list((await session.execute(_unnest_upsert(counts))).all())
+
+
+async def add_message_counts(counts: dict[tuple[int, int], int]) -> None:
+    """Increment message counts for many (guild, user) pairs in one transaction.
+
+    Args:
+        counts: Mapping of (guild_id, user_id) to the number of messages to add.
+    """
+    if not counts:
+        return
+    async with AsyncSession() as session:
+        await write_message_counts(session, counts)
+        await session.commit()
 
 
 async def increment_message_counts(guild_id: int, counts: dict[int, int]) -> None:
@@ -14,18 +184,177 @@ async def increment_message_counts(guild_id: int, counts: dict[int, int]) -> Non
         guild_id: Discord guild ID.
         counts: Mapping of user_id to the number of messages to add.
     """
+    await add_message_counts(
+        {(guild_id, user_id): delta for user_id, delta in counts.items()}
+    )
+
+
+def _unnest_daily_upsert(counts: dict[tuple[int, int, date], int]) -> Insert:
+    """Build one INSERT ... SELECT FROM unnest(...) ON CONFLICT for daily buckets.
+
+    Rows for guilds that no longer exist are skipped.
+
+    Args:
+        counts: Mapping of (guild_id, user_id, day) to the number of messages to add.
+
+    Returns:
+        The upsert statement, ready to execute.
+    """
+    keys = list(counts)
+    incoming = (
+        func.unnest(
+            bindparam('guild_ids', [k[0] for k in keys], type_=ARRAY(BigInteger)),
+            bindparam('user_ids', [k[1] for k in keys], type_=ARRAY(BigInteger)),
+            bindparam('days', [k[2] for k in keys], type_=ARRAY(Date)),
+            bindparam('deltas', list(counts.values()), type_=ARRAY(Integer)),
+        )
+        .table_valued('guild_id', 'user_id', 'bucket_start', 'message_count')
+        .render_derived(name='incoming')
+    )
+    stmt = pg_insert(MessageStatsBucket).from_select(
+        ['guild_id', 'period', 'bucket_start', 'user_id', 'message_count'],
+        _existing_guilds_only(
+            select(
+                incoming.c.guild_id,
+                literal(BUCKET_DAY),
+                incoming.c.bucket_start,
+                incoming.c.user_id,
+                incoming.c.message_count,
+            ),
+            incoming.c.guild_id,
+        ),
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=_BUCKET_KEY,
+        set_={
+            'message_count': MessageStatsBucket.message_count
+            + stmt.excluded.message_count
+        },
+    )
+
+
+async def write_daily_message_counts(
+    session: AsyncSession, counts: dict[tuple[int, int, date], int]
+) -> list[Row]:
+    """Add message count deltas to all-time totals and daily buckets, without committing.
+
+    Args:
+        session: Active async DB session.
+        counts: Mapping of (guild_id, user_id, day) to the number of messages to add.
+
+    Returns:
+        New all-time (guild_id, user_id, message_count) totals of every affected row.
+    """
+    if not counts:
+        return []
+    deltas: dict[tuple[int, int], int] = {}
+    for (guild_id, user_id, _), delta in counts.items():
+        deltas[guild_id, user_id] = deltas.get((guild_id, user_id), 0) + delta
+    totals = await write_message_counts(session, deltas)
+    await session.execute(_unnest_daily_upsert(counts))
+    return totals
+
+
+async def add_daily_message_counts(
+    counts: dict[tuple[int, int, date], int],
+) -> list[Row]:
+    """Increment all-time totals and daily buckets in one transaction.
+
+    Args:
+        counts: Mapping of (guild_id, user_id, day) to the number of messages to add.
+
+    Returns:
+        New all-time (guild_id, user_id, message_count) totals of every affected row.
+    """
+    if not counts:
+        return []
     async with AsyncSession() as session:
-        for user_id, delta in counts.items():
-            stmt = (
-                pg_insert(MessageStats)
-                .values(guild_id=guild_id, user_id=user_id, message_count=delta)
-                .on_conflict_do_update(
-                    index_elements=['guild_id', 'user_id'],
-                    set_={'message_count': MessageStats.message_count + delta},
-                )
+        totals = await write_daily_message_counts(session, counts)
+        await session.commit()
+        return totals
+
+
+async def get_windowed_leaderboard(
+    guild_id: int, since: date, limit: int = 10
+) -> list[Row]:
+    """Return the top users by messages sent on or after a given day.
+
+    Args:
+        guild_id: Discord guild ID.
+        since: First UTC day included in the window.
+        limit: Maximum number of rows to return.
+
+    Returns:
+        Rows with ``user_id`` and ``message_count``, ordered by count descending.
+    """
+    total = func.sum(MessageStatsBucket.message_count).label('message_count')
+    async with AsyncSession() as session:
+        result = await session.execute(
+            select(MessageStatsBucket.user_id, total)
+            .where(
+                MessageStatsBucket.guild_id == guild_id,
+                MessageStatsBucket.period == BUCKET_DAY,
+                MessageStatsBucket.bucket_start >= since,
             )
-            await session.execute(stmt)
+            .group_by(MessageStatsBucket.user_id)
+            .order_by(total.desc())
+            .limit(limit)
+        )
+        return list(result.all())
+
+
+async def roll_up_daily_buckets(before: date) -> int:
+    """Merge daily buckets older than a cutoff into monthly buckets.
+
+    The delete and the monthly upsert are one statement: the monthly sums are
+    built from the rows the DELETE returns. A concurrent write to an old
+    daily bucket is therefore either rolled up with it or, if it commits
+    after the delete, left as a daily bucket for the next run; never
+    deleted without being counted.
+
+    Args:
+        before: Daily buckets starting before this day are rolled up.
+
+    Returns:
+        Number of daily buckets removed.
+    """
+    moved = (
+        delete(MessageStatsBucket)
+        .where(
+            MessageStatsBucket.period == BUCKET_DAY,
+            MessageStatsBucket.bucket_start < before,
+        )
+        .returning(
+            MessageStatsBucket.guild_id,
+            MessageStatsBucket.bucket_start,
+            MessageStatsBucket.user_id,
+            MessageStatsBucket.message_count,
+        )
+        .cte('moved')
+    )
+    month = cast(func.date_trunc('month', moved.c.bucket_start), Date)
+    merge = pg_insert(MessageStatsBucket).from_select(
+        ['guild_id', 'period', 'bucket_start', 'user_id', 'message_count'],
+        select(
+            moved.c.guild_id,
+            literal(BUCKET_MONTH),
+            month,
+            moved.c.user_id,
+            func.sum(moved.c.message_count),
+        ).group_by(moved.c.guild_id, month, moved.c.user_id),
+    )
+    merge = merge.on_conflict_do_update(
+        index_elements=_BUCKET_KEY,
+        set_={
+            'message_count': MessageStatsBucket.message_count
+            + merge.excluded.message_count
+        },
+    ).cte('merged')
+    stmt = select(func.count()).select_from(moved).add_cte(merge)
+    async with AsyncSession() as session:
+        removed = await session.scalar(stmt)
         await session.commit()
+        return removed
 
 
 async def get_leaderboard(guild_id: int, limit: int = 10) -> list[MessageStats]:
@@ -95,6 +424,41 @@ async def get_all_channel_progress(guild_id: int) -> list[StatsImportProgress]:
         return list(result.all())
 
 
+def _progress_upsert(
+    guild_id: int,
+    channel_id: int,
+    last_message_id: int | None,
+    is_completed: bool,
+) -> Insert:
+    """Build the INSERT ... ON CONFLICT statement for a channel's import progress.
+
+    Args:
+        guild_id: Discord guild ID.
+        channel_id: Discord channel ID.
+        last_message_id: Snowflake ID of the last processed message.
+        is_completed: Whether this channel's history has been fully processed.
+
+    Returns:
+        The upsert statement.
+    """
+    return (
+        pg_insert(StatsImportProgress)
+        .values(
+            guild_id=guild_id,
+            channel_id=channel_id,
+            last_message_id=last_message_id,
+            is_completed=is_completed,
+        )
+        .on_conflict_do_update(
+            index_elements=['guild_id', 'channel_id'],
+            set_={
+                'last_message_id': last_message_id,
+                'is_completed': is_completed,
+            },
+        )
+    )
+
+
 async def save_channel_progress(
     guild_id: int,
     channel_id: int,
@@ -110,21 +474,45 @@ async def save_channel_progress(
         is_completed: Whether this channel's history has been fully processed.
     """
     async with AsyncSession() as session:
-        stmt = (
-            pg_insert(StatsImportProgress)
-            .values(
-                guild_id=guild_id,
-                channel_id=channel_id,
-                last_message_id=last_message_id,
-                is_completed=is_completed,
-            )
-            .on_conflict_do_update(
-                index_elements=['guild_id', 'channel_id'],
-                set_={
-                    'last_message_id': last_message_id,
-                    'is_completed': is_completed,
-                },
-            )
+        await session.execute(
+            _progress_upsert(guild_id, channel_id, last_message_id, is_completed)
+        )
+        await session.commit()
+
+
+async def save_import_checkpoint(
+    guild_id: int,
+    channel_id: int,
+    counts: dict[tuple[int, date], int],
+    last_message_id: int | None,
+    is_completed: bool,
+) -> list[Row]:
+    """Add imported message counts and advance channel progress in one commit.
+
+    Either both writes land or neither does, so resuming after a crash never
+    counts the same messages twice.
+
+    Args:
+        guild_id: Discord guild ID.
+        channel_id: Discord channel ID.
+        counts: Mapping of (user_id, day) to the number of messages imported
+            since the previous checkpoint.
+        last_message_id: Snowflake ID of the last processed message.
+        is_completed: Whether this channel's history has been fully processed.
+
+    Returns:
+        New all-time (guild_id, user_id, message_count) totals of every affected row.
+    """
+    async with AsyncSession() as session:
+        totals = await write_daily_message_counts(
+            session,
+            {
+                (guild_id, user_id, day): delta
+                for (user_id, day), delta in counts.items()
+            },
+        )
+        await session.execute(
+            _progress_upsert(guild_id, channel_id, last_message_id, is_completed)
         )
-        await session.execute(stmt)
         await session.commit()
+        return totals
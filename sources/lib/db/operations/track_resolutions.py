@@ -0,0 +1,50 @@
+"""DB operations for the cross-platform track resolution cache."""
+
+from datetime import UTC, datetime
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from sources.lib.db import AsyncSession
+from sources.lib.db.models import TrackResolution
+
+
+async def get_track_resolution(
+    source_platform: str, source_id: str
+) -> TrackResolution | None:
+    """Return the stored resolution for a track, or None if it was never resolved.
+
+    Args:
+        source_platform: Platform of the source track: 'youtube' or 'spotify'.
+        source_id: Track or video ID on the source platform.
+    """
+    async with AsyncSession() as session:
+        return await session.get(TrackResolution, (source_platform, source_id))
+
+
+async def save_track_resolution(
+    source_platform: str, source_id: str, target_id: str | None
+) -> None:
+    """Insert or refresh the resolution for a track.
+
+    Args:
+        source_platform: Platform of the source track: 'youtube' or 'spotify'.
+        source_id: Track or video ID on the source platform.
+        target_id: Matching ID on the other platform, or None if there is no match.
+    """
+    now = datetime.now(tz=UTC)
+    async with AsyncSession() as session:
+        stmt = (
+            pg_insert(TrackResolution)
+            .values(
+                source_platform=source_platform,
+                source_id=source_id,
+                target_id=target_id,
+                resolved_at=now,
+            )
+            .on_conflict_do_update(
+                index_elements=['source_platform', 'source_id'],
+                set_={'target_id': target_id, 'resolved_at': now},
+            )
+        )
+        await session.execute(stmt)
+        await session.commit()
@@ -3,16 +3,25 @@
 from sqlalchemy import select
 
 from sources.lib.db import AsyncSession
+from sources.lib.db.cache import user_cache
 from sources.lib.db.crud.base import CRUDBase
 from sources.lib.db.models import User
 
 
-async def get_user(user_id: int) -> User | None:
-    """Get a user from DB by ID."""
+async def _load_user(user_id: int) -> User | None:
+    """Read a user from DB by ID, bypassing the cache."""
     async with AsyncSession() as session:
         return await CRUDBase(session).get(User, id=user_id)
 
 
+async def get_user(user_id: int) -> User | None:
+    """Get a user from DB by ID.
+
+    Served from user_cache; the returned row must not be mutated.
+    """
+    return await user_cache.get(user_id, lambda: _load_user(user_id))
+
+
 async def get_users_by_ids(user_ids: list[int]) -> list[User]:
     """Return User rows for the given IDs that have a timezone set.
 
@@ -39,3 +48,4 @@ async def upsert_user(user_id: int, name: str, timezone: str) -> None:
             filters={'id': user_id},
             updates={'name': name, 'timezone': timezone},
         )
+    user_cache.invalidate(user_id)
@@ -0,0 +1,192 @@
+"""Unit of work: several DB operations sharing one session and one commit."""
+
+from __future__ import annotations
+
+from asyncio import Task, current_task
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_scoped_session,
+    async_sessionmaker,
+)
+
+
+class UnitOfWork:
+    """A transaction shared by every operation its owning task runs inside it.
+
+    Args:
+        session: The session all operations in the unit of work use.
+        owner: The task that opened the unit of work.
+    """
+
+    def __init__(self, session: AsyncSession, owner: Task | None) -> None:
+        """Initialise the unit of work.
+
+        Args:
+            session: The session all operations in the unit of work use.
+            owner: The task that opened the unit of work.
+        """
+        self.session = session
+        self.owner = owner
+        self._after_commit: list[Callable[[], None]] = []
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback once the writes made so far are committed.
+
+        Args:
+            callback: Called without arguments after the next commit.
+        """
+        self._after_commit.append(callback)
+
+    async def commit(self) -> None:
+        """Commit the writes made so far; the unit of work stays open."""
+        await self.session.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    async def rollback(self) -> None:
+        """Discard the writes made since the last commit; the unit stays open."""
+        await self.session.rollback()
+        self._after_commit = []
+
+
+_active_unit: ContextVar[UnitOfWork | None] = ContextVar(
+    'db_unit_of_work', default=None
+)
+
+
+def current_unit_of_work() -> UnitOfWork | None:
+    """Return the unit of work the current task is running in, if any."""
+    unit = _active_unit.get()
+    # Tasks started inside a unit of work inherit the context variable, but an
+    # AsyncSession cannot run two statements at once, so only the owner joins.
+    if unit is None or unit.owner is not current_task():
+        return None
+    return unit
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """Run callback after the current unit of work commits, or now outside one.
+
+    Args:
+        callback: Called without arguments once the write is durable.
+    """
+    unit = current_unit_of_work()
+    if unit is None:
+        callback()
+    else:
+        unit.after_commit(callback)
+
+
+class _JoinedSession:
+    """An operation's handle on the unit of work session.
+
+    Leaving it does not close the session and commit only flushes, so the
+    operation's writes become part of the surrounding transaction.
+
+    Args:
+        session: The unit of work session to delegate to.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialise the handle.
+
+        Args:
+            session: The unit of work session to delegate to.
+        """
+        self._session = session
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate every other attribute to the unit of work session.
+
+        Args:
+            name: Attribute name.
+
+        Returns:
+            The session's attribute.
+        """
+        return getattr(self._session, name)
+
+    async def __aenter__(self) -> _JoinedSession:
+        """Return the handle itself; the session is already open."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Leave the session open; the unit of work closes it.
+
+        Args:
+            *exc_info: Exception type, value and traceback, if any.
+        """
+        return None
+
+    async def commit(self) -> None:
+        """Send pending writes to the database without committing them."""
+        await self._session.flush()
+
+
+class SessionSource:
+    """Session factory the operations call as ``AsyncSession()``.
+
+    Outside a unit of work it returns the task-scoped session, so every
+    operation commits its own transaction. Inside one it returns a handle on
+    the unit of work session.
+
+    Args:
+        scoped: Task-scoped session registry used for standalone operations.
+        factory: Factory for the sessions units of work open.
+    """
+
+    def __init__(
+        self,
+        scoped: async_scoped_session[AsyncSession],
+        factory: async_sessionmaker[AsyncSession],
+    ) -> None:
+        """Initialise the source.
+
+        Args:
+            scoped: Task-scoped session registry used for standalone operations.
+            factory: Factory for the sessions units of work open.
+        """
+        self._scoped = scoped
+        self._factory = factory
+
+    def __call__(self) -> AsyncSession | _JoinedSession:
+        """Return the session the next operation should use."""
+        unit = current_unit_of_work()
+        if unit is not None:
+            return _JoinedSession(unit.session)
+        return self._scoped()
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[UnitOfWork]:
+        """Run the operations awaited inside the block in a single transaction.
+
+        Commits when the block exits normally and rolls back if it raises.
+        Nested blocks join the outer unit of work. Call
+        :meth:`UnitOfWork.commit` to make the writes so far durable before an
+        external side effect.
+
+        Yields:
+            The unit of work.
+        """
+        outer = current_unit_of_work()
+        if outer is not None:
+            yield outer
+            return
+
+        async with self._factory() as session:
+            unit = UnitOfWork(session, current_task())
+            token = _active_unit.set(unit)
+            try:
+                yield unit
+                await unit.commit()
+            except BaseException:
+                await unit.rollback()
+                raise
+            finally:
+                _active_unit.reset(token)
@@ -1,5 +1,8 @@
 """DB utilities"""
 
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy_utils import (
     create_database,
     database_exists,
@@ -18,3 +21,39 @@ async def create_db_if_not_exists():
     if not database_exists(config.sync_db_url):
         Logger().info('Database not found, creating')
         create_database(config.sync_db_url)
+
+
+async def prewarm_pool(engine: AsyncEngine, count: int) -> None:
+    """Open count pooled connections at once so early queries skip connecting.
+
+    The connections are held together, so the pool has to create each one,
+    and are then returned to it idle. Failures are logged, not raised; the
+    pool connects lazily as usual when the database is not reachable yet.
+
+    Args:
+        engine: The async engine whose pool is warmed.
+        count: Number of connections to open, usually the pool size.
+    """
+    if count <= 0:
+        return
+    connections = [engine.connect() for _ in range(count)]
+    results = await asyncio.gather(
+        *(connection.start() for connection in connections), return_exceptions=True
+    )
+    await asyncio.gather(
+        *(
+            connection.close()
+            for connection, result in zip(connections, results, strict=True)
+            if not isinstance(result, BaseException)
+        )
+    )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        Logger().warning(
+            'DB pool pre-warm opened %d of %d connections: %s',
+            count - len(errors),
+            count,
+            errors[0],
+        )
+    else:
+        Logger().info('DB pool pre-warmed with %d connections', count)
@@ -0,0 +1,187 @@
+"""Live throughput telemetry for historical message imports."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+
+import discord
+
+from sources.lib.utils.metrics import (
+    stats_import_api_wait,
+    stats_import_channels,
+    stats_import_eta,
+    stats_import_messages,
+    stats_import_rate,
+)
+
+
+@dataclass
+class ChannelProgress:
+    """Position of one channel that is currently being imported.
+
+    Attributes:
+        name: Channel name.
+        start_id: Snowflake the import of this channel started after.
+        end_id: ID of the channel's newest message when the import started,
+            or None if the channel had no messages.
+        current_id: ID of the last message processed.
+        messages: Messages processed in this channel during this run.
+    """
+
+    name: str
+    start_id: int
+    end_id: int | None
+    current_id: int
+    messages: int = 0
+
+    @property
+    def fraction(self) -> float:
+        """Share of the channel's snowflake range covered so far, from 0 to 1.
+
+        Snowflakes grow with time, so this is the share of the channel's
+        timeline imported. It is an estimate; message density varies.
+        """
+        if self.end_id is None or self.end_id <= self.start_id:
+            return 0.0
+        covered = (self.current_id - self.start_id) / (self.end_id - self.start_id)
+        return min(max(covered, 0.0), 1.0)
+
+
+class ImportProgress:
+    """Running totals for one guild's import, published to Prometheus.
+
+    The importer wraps each channel's history iterator with :meth:`track`,
+    which counts messages and times every wait for the next message. Messages
+    arrive in pages, so that time is spent on Discord history requests,
+    including any rate-limit sleeps discord.py takes. The ETA assumes the
+    remaining channels progress at the average per-channel rate so far.
+
+    Args:
+        guild_id: Discord guild ID.
+        total_channels: Number of channels the import covers.
+        clock: Monotonic time source in seconds, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        guild_id: int,
+        total_channels: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Start tracking an import.
+
+        Args:
+            guild_id: Discord guild ID.
+            total_channels: Number of channels the import covers.
+            clock: Monotonic time source in seconds, injectable for tests.
+        """
+        self._guild = str(guild_id)
+        self._clock = clock
+        self._started_at = clock()
+        self.total_channels = total_channels
+        self.done_channels = 0
+        # Channels found already complete; excluded from the rate estimate.
+        self._skipped_channels = 0
+        self.active: dict[int, ChannelProgress] = {}
+        self.messages = 0
+        self.api_wait = 0.0
+        self._published_messages = 0
+        self._published_wait = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the import started."""
+        return self._clock() - self._started_at
+
+    @property
+    def rate(self) -> float:
+        """Average messages processed per second since the import started."""
+        elapsed = self.elapsed
+        return self.messages / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float | None:
+        """Estimated seconds until the import finishes, or None if unknown yet."""
+        progressed = (
+            self.done_channels
+            - self._skipped_channels
+            + sum(channel.fraction for channel in self.active.values())
+        )
+        if progressed <= 0:
+            return None
+        remaining = self.total_channels - self._skipped_channels - progressed
+        return max(remaining, 0.0) * self.elapsed / progressed
+
+    async def track(
+        self,
+        channel: discord.TextChannel,
+        start_id: int,
+        history: AsyncIterator[discord.Message],
+    ) -> AsyncIterator[discord.Message]:
+        """Yield a channel's messages while recording throughput and wait time.
+
+        Args:
+            channel: The channel being imported.
+            start_id: Snowflake the history starts after.
+            history: The channel's history iterator, oldest first.
+
+        Yields:
+            Each message from history.
+        """
+        progress = ChannelProgress(
+            channel.name, start_id, channel.last_message_id, start_id
+        )
+        self.active[channel.id] = progress
+        iterator = aiter(history)
+        while True:
+            waited_from = self._clock()
+            try:
+                message = await anext(iterator)
+            except StopAsyncIteration:
+                return
+            finally:
+                self.api_wait += self._clock() - waited_from
+            progress.current_id = message.id
+            progress.messages += 1
+            self.messages += 1
+            yield message
+
+    def channel_finished(self, channel_id: int, *, skipped: bool = False) -> None:
+        """Mark a channel as done and publish the updated totals.
+
+        Args:
+            channel_id: Discord channel ID.
+            skipped: True if the channel was already complete before this run.
+        """
+        self.active.pop(channel_id, None)
+        self.done_channels += 1
+        if skipped:
+            self._skipped_channels += 1
+        self.publish()
+
+    def publish(self) -> None:
+        """Push the current totals to the Prometheus metrics."""
+        stats_import_messages.inc(self.messages - self._published_messages)
+        stats_import_api_wait.inc(self.api_wait - self._published_wait)
+        self._published_messages = self.messages
+        self._published_wait = self.api_wait
+        stats_import_rate.labels(guild=self._guild).set(self.rate)
+        eta = self.eta
+        if eta is not None:
+            stats_import_eta.labels(guild=self._guild).set(eta)
+        for state, value in (
+            ('done', self.done_channels),
+            ('active', len(self.active)),
+            ('total', self.total_channels),
+        ):
+            stats_import_channels.labels(guild=self._guild, state=state).set(value)
+
+    def close(self) -> None:
+        """Publish the final totals and drop this guild's gauges."""
+        self.publish()
+        stats_import_rate.remove(self._guild)
+        stats_import_eta.remove(self._guild)
+        for state in ('done', 'active', 'total'):
+            stats_import_channels.remove(self._guild, state)
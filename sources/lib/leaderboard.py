@@ -0,0 +1,125 @@
+"""In-memory all-time top-K message leaderboard per guild."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from sources.lib.db.operations.stats import get_leaderboard
+
+LEADERBOARD_SIZE = 10
+
+
+class LeaderboardEntry(NamedTuple):
+    """One leaderboard position.
+
+    Attributes:
+        user_id: Discord user ID.
+        message_count: All-time number of messages sent in the guild.
+    """
+
+    user_id: int
+    message_count: int
+
+
+class LeaderboardCache:
+    """Per-guild top-K of all-time message counts, kept current from write results.
+
+    A guild is seeded from the database on its first request. After that it is
+    updated from the new totals returned by every message count upsert.
+    Counts only ever grow, so a user outside the top K can enter it only
+    through an update, and updates always carry that user's exact total.
+    Applying them keeps the cached top K exact with O(K) work per row and no
+    extra queries.
+
+    Args:
+        size: Number of positions kept per guild.
+    """
+
+    def __init__(self, size: int = LEADERBOARD_SIZE) -> None:
+        """Initialise an empty cache.
+
+        Args:
+            size: Number of positions kept per guild.
+        """
+        self._size = size
+        # guild_id -> {user_id: message_count} for the guild's top users.
+        self._guilds: dict[int, dict[int, int]] = {}
+        # guild_id -> totals that arrived while the guild was being seeded.
+        self._seeding: dict[int, list[tuple[int, int]]] = {}
+
+    def _offer(self, top: dict[int, int], user_id: int, total: int) -> None:
+        """Place a user's new total into a guild's top set if it qualifies.
+
+        Args:
+            top: The guild's top users.
+            user_id: Discord user ID.
+            total: The user's new all-time message count.
+        """
+        current = top.get(user_id)
+        if current is not None:
+            # Totals may arrive out of order from concurrent writers.
+            top[user_id] = max(current, total)
+            return
+        if len(top) < self._size:
+            top[user_id] = total
+            return
+        lowest = min(top, key=top.__getitem__)
+        if total > top[lowest]:
+            del top[lowest]
+            top[user_id] = total
+
+    def apply(self, totals: Iterable[tuple[int, int, int]]) -> None:
+        """Fold new all-time totals into the cached leaderboards.
+
+        Totals for guilds that were never requested are ignored.
+
+        Args:
+            totals: (guild_id, user_id, message_count) rows returned by an upsert.
+        """
+        for guild_id, user_id, total in totals:
+            top = self._guilds.get(guild_id)
+            if top is not None:
+                self._offer(top, user_id, total)
+            elif guild_id in self._seeding:
+                self._seeding[guild_id].append((user_id, total))
+
+    def invalidate(self, guild_id: int) -> None:
+        """Forget a guild's leaderboard so the next request reseeds it.
+
+        Args:
+            guild_id: Discord guild ID.
+        """
+        self._guilds.pop(guild_id, None)
+        self._seeding.pop(guild_id, None)
+
+    async def top(self, guild_id: int) -> list[LeaderboardEntry]:
+        """Return a guild's leaderboard, highest count first.
+
+        Args:
+            guild_id: Discord guild ID.
+
+        Returns:
+            Up to ``size`` entries ordered by message count descending.
+        """
+        top = self._guilds.get(guild_id)
+        if top is None:
+            pending = self._seeding.setdefault(guild_id, [])
+            try:
+                rows = await get_leaderboard(guild_id, limit=self._size)
+            finally:
+                # An invalidation during the load drops this guild's pending list.
+                seeded = self._seeding.pop(guild_id, None) is pending
+            top = {row.user_id: row.message_count for row in rows}
+            # Replay totals written while the seed query was running.
+            for user_id, total in pending:
+                self._offer(top, user_id, total)
+            if seeded:
+                self._guilds[guild_id] = top
+        return [
+            LeaderboardEntry(user_id, count)
+            for user_id, count in sorted(top.items(), key=lambda item: -item[1])
+        ]
+
+
+leaderboards = LeaderboardCache()
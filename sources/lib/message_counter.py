@@ -0,0 +1,139 @@
+"""Write-behind message counter — batches per-message stats increments."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import date
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from sources.lib.db.operations.stats import add_daily_message_counts
+from sources.lib.leaderboard import leaderboards
+from sources.lib.utils.logger import Logger
+from sources.lib.utils.metrics import (
+    stats_dropped_rows,
+    stats_flush_latency,
+    stats_flush_size,
+    stats_pending_rows,
+)
+
+_MAX_PENDING_ROWS = 500
+# Cap on rows kept while flushes keep failing, e.g. during a database outage.
+_MAX_BUFFERED_ROWS = 50_000
+
+
+class MessageCounter:
+    """In-process aggregator for live message counts.
+
+    Increments are accumulated in memory as ``(guild_id, user_id, day) -> delta``
+    and written to ``message_stats`` and the daily ``message_stats_buckets``
+    in one transaction per flush.
+    A flush is scheduled automatically once the buffer reaches
+    ``max_pending`` distinct rows; the owner is expected to call
+    :meth:`flush` periodically and once more on shutdown.
+
+    Args:
+        max_pending: Number of buffered rows that triggers an immediate flush.
+        max_buffered: Number of rows kept when a failed flush is put back;
+            rows of the oldest days beyond it are dropped.
+    """
+
+    def __init__(
+        self,
+        max_pending: int = _MAX_PENDING_ROWS,
+        max_buffered: int = _MAX_BUFFERED_ROWS,
+    ) -> None:
+        """Initialise an empty buffer.
+
+        Args:
+            max_pending: Number of buffered rows that triggers an immediate flush.
+            max_buffered: Number of rows kept when a failed flush is put back.
+        """
+        self._max_pending = max_pending
+        self._max_buffered = max_buffered
+        self._pending: dict[tuple[int, int, date], int] = {}
+        self._lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self._logger = Logger()
+
+    def __len__(self) -> int:
+        """Return the number of buffered (guild, user, day) rows."""
+        return len(self._pending)
+
+    def add(self, guild_id: int, user_id: int, day: date, delta: int = 1) -> None:
+        """Buffer a message count increment.
+
+        Args:
+            guild_id: Discord guild ID.
+            user_id: Discord user ID of the message author.
+            day: UTC day the messages were sent on.
+            delta: Number of messages to add.
+        """
+        key = (guild_id, user_id, day)
+        self._pending[key] = self._pending.get(key, 0) + delta
+        stats_pending_rows.set(len(self._pending))
+        if len(self._pending) >= self._max_pending and (
+            self._flush_task is None or self._flush_task.done()
+        ):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    async def flush(self) -> int:
+        """Write all buffered increments to the database.
+
+        Counts for guilds that were deleted while buffered are skipped by the
+        upsert itself. Transient database errors put the batch back into the
+        buffer so it is retried on the next flush; if that takes the buffer
+        past ``max_buffered`` rows, the rows of the oldest days are dropped.
+        Other integrity errors cannot succeed on retry, so that batch is
+        dropped.
+
+        Returns:
+            Number of rows written.
+        """
+        async with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            stats_pending_rows.set(0)
+            start = time.perf_counter()
+            try:
+                totals = await add_daily_message_counts(batch)
+            except IntegrityError as exc:
+                self._logger.error(
+                    'Message counter: dropping %d rows after integrity error: %s',
+                    len(batch),
+                    exc,
+                )
+                return 0
+            except SQLAlchemyError as exc:
+                self._logger.warning(
+                    'Message counter: flush of %d rows failed, will retry: %s',
+                    len(batch),
+                    exc,
+                )
+                for key, delta in batch.items():
+                    self._pending[key] = self._pending.get(key, 0) + delta
+                self._drop_oldest_overflow()
+                stats_pending_rows.set(len(self._pending))
+                return 0
+            leaderboards.apply(totals)
+            stats_flush_latency.observe(time.perf_counter() - start)
+            stats_flush_size.observe(len(batch))
+            return len(batch)
+
+    def _drop_oldest_overflow(self) -> None:
+        """Discard rows of the oldest days until at most max_buffered remain."""
+        excess = len(self._pending) - self._max_buffered
+        if excess <= 0:
+            return
+        oldest = sorted(self._pending, key=lambda key: key[2])[:excess]
+        messages = sum(self._pending.pop(key) for key in oldest)
+        stats_dropped_rows.inc(excess)
+        self._logger.error(
+            'Message counter: buffer full, dropped %d rows (%d messages) from %s to %s',
+            excess,
+            messages,
+            oldest[0][2],
+            oldest[-1][2],
+        )
@@ -10,6 +10,7 @@ from datetime import UTC, datetime, timedelta
 import aiohttp
 
 from sources.config import config
+from sources.lib.utils.single_flight import SingleFlight
 
 _TITLE_NOISE_RE = re.compile(
     r'[\(\[][^\)\]]*'
@@ -58,16 +59,26 @@ class SpotifyClient:
         """
         self._session = session
         self._token: _SpotifyToken | None = None
+        self._token_flight = SingleFlight('spotify_token')
 
     async def get_token(self) -> str | None:
         """Return a valid access token, refreshing if needed.
 
+        Concurrent callers share a single refresh request.
+
         Returns:
             Access token string, or None if authentication failed.
         """
         if self._token and self._token.is_valid():
             return self._token.access_token
+        return await self._token_flight.do('token', self._refresh_token)
+
+    async def _refresh_token(self) -> str | None:
+        """Request a new client-credentials access token.
 
+        Returns:
+            Access token string, or None if authentication failed.
+        """
         credentials = base64.b64encode(
             f'{config.spotify_api_client_id}:{config.spotify_api_client_secret}'.encode()
         ).decode()
@@ -0,0 +1,148 @@
+"""Two-tier cache for cross-platform music track resolutions."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from datetime import UTC, datetime, timedelta
+from typing import NamedTuple
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from sources.lib.db.operations.track_resolutions import (
+    get_track_resolution,
+    save_track_resolution,
+)
+from sources.lib.utils.logger import Logger
+from sources.lib.utils.metrics import track_cache_lookups
+
+_MAX_ENTRIES = 1024
+_HIT_TTL = timedelta(days=30)
+# Shorter, so tracks that appear on the other platform later get picked up.
+_MISS_TTL = timedelta(days=1)
+
+
+class TrackMatch(NamedTuple):
+    """A cached resolution result.
+
+    Attributes:
+        target_id: ID on the other platform, or None if no match exists.
+    """
+
+    target_id: str | None
+
+
+class TrackResolutionCache:
+    """In-process LRU with TTL, backed by the ``track_resolutions`` table.
+
+    Lookups check memory first and fall back to the database; database hits
+    are promoted into memory for their remaining lifetime. Negative results
+    ("no match found") are cached too, with a shorter TTL. Database errors
+    are logged and treated as a miss so conversion keeps working.
+
+    Args:
+        max_entries: Maximum number of resolutions kept in memory.
+        hit_ttl: Lifetime of a resolution that found a match.
+        miss_ttl: Lifetime of a resolution that found no match.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = _MAX_ENTRIES,
+        hit_ttl: timedelta = _HIT_TTL,
+        miss_ttl: timedelta = _MISS_TTL,
+    ) -> None:
+        """Initialise an empty cache.
+
+        Args:
+            max_entries: Maximum number of resolutions kept in memory.
+            hit_ttl: Lifetime of a resolution that found a match.
+            miss_ttl: Lifetime of a resolution that found no match.
+        """
+        self._max_entries = max_entries
+        self._hit_ttl = hit_ttl
+        self._miss_ttl = miss_ttl
+        # (platform, source_id) -> (target_id, monotonic expiry time)
+        self._entries: OrderedDict[tuple[str, str], tuple[str | None, float]] = (
+            OrderedDict()
+        )
+        self._logger = Logger()
+
+    def __len__(self) -> int:
+        """Return the number of resolutions held in memory."""
+        return len(self._entries)
+
+    def _ttl(self, target_id: str | None) -> timedelta:
+        """Return the lifetime for a resolution.
+
+        Args:
+            target_id: Resolved ID, or None for a negative result.
+        """
+        return self._hit_ttl if target_id is not None else self._miss_ttl
+
+    def _remember(
+        self, key: tuple[str, str], target_id: str | None, lifetime: timedelta
+    ) -> None:
+        """Store a resolution in memory, evicting the least recently used entry.
+
+        Args:
+            key: (platform, source_id) cache key.
+            target_id: Resolved ID, or None for a negative result.
+            lifetime: How long the entry stays valid.
+        """
+        self._entries[key] = (target_id, time.monotonic() + lifetime.total_seconds())
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, platform: str, source_id: str) -> TrackMatch | None:
+        """Return the cached resolution for a track.
+
+        Args:
+            platform: Platform of the source track: 'youtube' or 'spotify'.
+            source_id: Track or video ID on the source platform.
+
+        Returns:
+            The cached match (whose target_id may be None for a cached
+            negative result), or None if the track must be resolved.
+        """
+        key = (platform, source_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            target_id, expires_at = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                track_cache_lookups.labels(result='memory').inc()
+                return TrackMatch(target_id)
+            del self._entries[key]
+
+        try:
+            row = await get_track_resolution(platform, source_id)
+        except SQLAlchemyError as exc:
+            self._logger.warning('Track resolution lookup failed: %s', exc)
+            row = None
+        if row is not None:
+            remaining = (
+                row.resolved_at + self._ttl(row.target_id) - datetime.now(tz=UTC)
+            )
+            if remaining > timedelta(0):
+                self._remember(key, row.target_id, remaining)
+                track_cache_lookups.labels(result='db').inc()
+                return TrackMatch(row.target_id)
+
+        track_cache_lookups.labels(result='miss').inc()
+        return None
+
+    async def put(self, platform: str, source_id: str, target_id: str | None) -> None:
+        """Record a fresh resolution in both tiers.
+
+        Args:
+            platform: Platform of the source track: 'youtube' or 'spotify'.
+            source_id: Track or video ID on the source platform.
+            target_id: Matching ID on the other platform, or None if no match.
+        """
+        self._remember((platform, source_id), target_id, self._ttl(target_id))
+        try:
+            await save_track_resolution(platform, source_id, target_id)
+        except SQLAlchemyError as exc:
+            self._logger.warning('Track resolution save failed: %s', exc)
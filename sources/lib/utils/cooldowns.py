@@ -0,0 +1,102 @@
+"""Bounded, self-expiring cooldown store."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+from prometheus_client import Gauge
+
+
+class CooldownStore:
+    """Track per-key cooldowns with a fixed TTL and a hard size cap.
+
+    Every key shares the same TTL, so insertion order equals expiry order:
+    keys live in an OrderedDict and expired ones are popped from the front.
+    Each check-and-set is amortized O(1). When the cap is reached the oldest
+    cooldown is evicted early, trading an occasional early re-fire for
+    bounded memory.
+
+    Args:
+        ttl: Cooldown length in seconds.
+        max_entries: Maximum number of keys kept at once.
+        size_gauge: Optional gauge set to the current number of keys.
+        clock: Monotonic time source in seconds, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        size_gauge: Gauge | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialise an empty store.
+
+        Args:
+            ttl: Cooldown length in seconds.
+            max_entries: Maximum number of keys kept at once.
+            size_gauge: Optional gauge set to the current number of keys.
+            clock: Monotonic time source in seconds, injectable for tests.
+        """
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._size_gauge = size_gauge
+        self._clock = clock
+        self._started: OrderedDict[Hashable, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of keys currently cooling down."""
+        return len(self._started)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return True if key is still cooling down."""
+        self._purge(self._clock())
+        return key in self._started
+
+    def _purge(self, now: float) -> None:
+        """Drop cooldowns that started ttl seconds ago or earlier.
+
+        Args:
+            now: Current clock reading.
+        """
+        started = self._started
+        while started:
+            key, first = next(iter(started.items()))
+            if now - first < self._ttl:
+                break
+            del started[key]
+
+    def _update_gauge(self) -> None:
+        """Publish the current store size, if a gauge was given."""
+        if self._size_gauge is not None:
+            self._size_gauge.set(len(self._started))
+
+    def try_acquire(self, key: Hashable) -> bool:
+        """Start a cooldown for key unless one is already running.
+
+        Args:
+            key: Cooldown key, e.g. (guild_id, user_id).
+
+        Returns:
+            True if the cooldown was started, False if key is still cooling down.
+        """
+        now = self._clock()
+        self._purge(now)
+        if key in self._started:
+            return False
+        self._started[key] = now
+        if len(self._started) > self._max_entries:
+            self._started.popitem(last=False)
+        self._update_gauge()
+        return True
+
+    def discard(self, key: Hashable) -> None:
+        """Cancel the cooldown for key, if any.
+
+        Args:
+            key: Cooldown key.
+        """
+        if self._started.pop(key, None) is not None:
+            self._update_gauge()
@@ -1,13 +1,69 @@
 """Domains fixer module"""
 
-from urllib.parse import ParseResult, urlparse
+from typing import NamedTuple
+from urllib.parse import ParseResult
 
 import discord
-from tldextract import extract
-from tldextract.tldextract import ExtractResult
 
 from sources.lib.db.operations.domain_fixers import get_all_domain_fixers
 from sources.lib.utils.logger import Logger
+from sources.lib.utils.message_analysis import analyze_message
+from sources.lib.utils.public_suffix import DomainParts, public_suffixes
+
+
+class DomainRule(NamedTuple):
+    """A compiled domain fixer rule.
+
+    Attributes:
+        domain: Replacement domain name, e.g. 'rxddit'.
+        subdomain: Subdomain override, or None to keep the original subdomain.
+    """
+
+    domain: str
+    subdomain: str | None
+
+
+# guild_id -> {source_domain: DomainRule}; filled lazily on first message.
+_rules_cache: dict[int, dict[str, DomainRule]] = {}
+# guild_id -> invalidation counter, so a load racing an invalidation is discarded.
+_rules_generation: dict[int, int] = {}
+
+
+async def get_guild_rules(guild_id: int) -> dict[str, DomainRule]:
+    """Return the compiled domain fixer rules for a guild, loading them on first use.
+
+    Args:
+        guild_id: Discord guild ID.
+
+    Returns:
+        Mapping of source domain to its rule. Must not be mutated by callers.
+    """
+    rules = _rules_cache.get(guild_id)
+    if rules is not None:
+        return rules
+    generation = _rules_generation.get(guild_id, 0)
+    fixers = await get_all_domain_fixers(guild_id=guild_id)
+    rules = {
+        f.source_domain: DomainRule(
+            domain=f.replacement_domain, subdomain=f.override_subdomain
+        )
+        for f in fixers
+    }
+    if _rules_generation.get(guild_id, 0) == generation:
+        _rules_cache[guild_id] = rules
+    return rules
+
+
+def invalidate_guild_rules(guild_id: int) -> None:
+    """Drop the cached rules for a guild so the next message reloads them.
+
+    Must be called after any change to the guild's domain fixer rules.
+
+    Args:
+        guild_id: Discord guild ID.
+    """
+    _rules_cache.pop(guild_id, None)
+    _rules_generation[guild_id] = _rules_generation.get(guild_id, 0) + 1
 
 
 class URLFixer:
@@ -27,8 +83,8 @@ class URLFixer:
         """
         self._message = message
         self._logger = Logger()
-        self._rules: dict[str, dict] = {}
-        self._parsed_urls: dict[ParseResult, ExtractResult] = {}
+        self._rules: dict[str, DomainRule] = {}
+        self._parsed_urls: dict[ParseResult, DomainParts] = {}
 
     async def fix(self) -> str:
         """Return the message content with matched domains replaced.
@@ -41,29 +97,23 @@ class URLFixer:
         """
         if self._message.guild is None:
             return self._message.content
-        await self._load_rules()
         self._parse_urls()
+        if not self._parsed_urls:
+            return self._message.content
+        await self._load_rules()
         if not self._has_matches():
             self._logger.info('No suitable domain or any URL found')
             return self._message.content
         return self._apply_replacements()
 
     async def _load_rules(self) -> None:
-        fixers = await get_all_domain_fixers(guild_id=self._message.guild.id)
-        self._rules = {
-            f.source_domain: {
-                'domain': f.replacement_domain,
-                'subdomain': f.override_subdomain,
-            }
-            for f in fixers
-        }
+        self._rules = await get_guild_rules(self._message.guild.id)
 
     def _parse_urls(self) -> None:
         self._parsed_urls = {}
-        for token in self._message.content.split():
-            if token.startswith('http://') or token.startswith('https://'):
-                parsed = urlparse(token)
-                self._parsed_urls[parsed] = extract(parsed.netloc)
+        for url in analyze_message(self._message).urls:
+            if url.standalone:
+                self._parsed_urls[url.parsed] = public_suffixes.split(url.host)
 
     def _has_matches(self) -> bool:
         return any(
@@ -71,9 +121,7 @@ class URLFixer:
             for d in self._parsed_urls.values()
         )
 
-    def _rewrite_url(
-        self, parsed_url: ParseResult, parsed_domain: ExtractResult
-    ) -> str:
+    def _rewrite_url(self, parsed_url: ParseResult, parsed_domain: DomainParts) -> str:
         """Build the replacement URL for a matched domain.
 
         Args:
@@ -86,12 +134,10 @@ class URLFixer:
         rule = self._rules[parsed_domain.top_domain_under_public_suffix]
         return ParseResult(
             parsed_url.scheme,
-            netloc=ExtractResult(
-                subdomain=rule.get('subdomain') or parsed_domain.subdomain,
-                domain=rule['domain'],
+            netloc=DomainParts(
+                subdomain=rule.subdomain or parsed_domain.subdomain,
+                domain=rule.domain,
                 suffix=parsed_domain.suffix,
-                is_private=parsed_domain.is_private,
-                registry_suffix=parsed_domain.registry_suffix,
             ).fqdn,
             path=parsed_url.path,
             query=parsed_url.query,
@@ -0,0 +1,121 @@
+"""Conditional-GET fetching of RSS/Atom feeds for the relay pollers."""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import aiohttp
+import feedparser
+
+from sources.lib.utils.metrics import relay_feed_bytes_saved, relay_feed_parses_skipped
+
+_MAX_ENTRIES = 2000
+
+
+@dataclass
+class _CachedFeed:
+    """Validators, content hash and parse result of a feed's last 200 response."""
+
+    etag: str | None
+    last_modified: str | None
+    digest: bytes
+    size: int
+    feed: feedparser.FeedParserDict
+
+
+class FeedFetcher:
+    """Fetch feeds with If-None-Match/If-Modified-Since and reuse unchanged parses.
+
+    The validators, a SHA-256 of the body and the parsed feed are kept per URL.
+    A 304 response, or a 200 whose body hashes the same as last time, returns
+    the previously parsed feed without running feedparser again. Callers must
+    not mutate the returned feed.
+
+    Args:
+        service: Relay name used as the metrics label, e.g. 'youtube'.
+        max_entries: Maximum number of feeds remembered, least recently used
+            first out.
+    """
+
+    def __init__(self, service: str, max_entries: int = _MAX_ENTRIES) -> None:
+        """Initialise with no remembered feeds.
+
+        Args:
+            service: Relay name used as the metrics label, e.g. 'youtube'.
+            max_entries: Maximum number of feeds remembered.
+        """
+        self._max_entries = max_entries
+        self._feeds: OrderedDict[str, _CachedFeed] = OrderedDict()
+        self._bytes_saved = relay_feed_bytes_saved.labels(service=service)
+        self._not_modified = relay_feed_parses_skipped.labels(
+            service=service, reason='not_modified'
+        )
+        self._unchanged = relay_feed_parses_skipped.labels(
+            service=service, reason='unchanged'
+        )
+
+    def __len__(self) -> int:
+        """Return the number of remembered feeds."""
+        return len(self._feeds)
+
+    async def fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        timeout: aiohttp.ClientTimeout,
+    ) -> feedparser.FeedParserDict:
+        """Return the parsed feed at url, reusing the last parse when unchanged.
+
+        Responses other than 200 and 304 are parsed as before but not
+        remembered.
+
+        Args:
+            session: HTTP session to fetch with.
+            url: Feed URL.
+            timeout: Request timeout.
+
+        Returns:
+            The parsed feed.
+
+        Raises:
+            aiohttp.ClientError: If the request fails.
+            asyncio.TimeoutError: If the request times out.
+        """
+        cached = self._feeds.get(url)
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+
+        async with session.get(url, headers=headers, timeout=timeout) as resp:
+            if resp.status == 304 and cached is not None:
+                self._feeds.move_to_end(url)
+                self._bytes_saved.inc(cached.size)
+                self._not_modified.inc()
+                return cached.feed
+            status = resp.status
+            etag = resp.headers.get('ETag')
+            last_modified = resp.headers.get('Last-Modified')
+            body = await resp.read()
+
+        if status != 200:
+            self._feeds.pop(url, None)
+            return feedparser.parse(body)
+
+        digest = hashlib.sha256(body).digest()
+        if cached is not None and cached.digest == digest:
+            cached.etag, cached.last_modified = etag, last_modified
+            self._feeds.move_to_end(url)
+            self._unchanged.inc()
+            return cached.feed
+
+        feed = feedparser.parse(body)
+        self._feeds[url] = _CachedFeed(etag, last_modified, digest, len(body), feed)
+        self._feeds.move_to_end(url)
+        if len(self._feeds) > self._max_entries:
+            self._feeds.popitem(last=False)
+        return feed
@@ -0,0 +1,151 @@
+"""Single-pass message content analysis shared by the message listeners."""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple
+from urllib.parse import ParseResult, urlparse
+
+import discord
+
+_URL_RE = re.compile(r'https?://\S+')
+_YT_PATTERN = re.compile(
+    r'https?://(?:www\.)?(?:youtube\.com/watch\?(?:[^&\s]*&)*v=|youtu\.be/)'
+    r'([a-zA-Z0-9_-]{11})'
+)
+_YT_MUSIC_PATTERN = re.compile(
+    r'https?://music\.youtube\.com/watch\?(?:[^&\s]*&)*v=([a-zA-Z0-9_-]{11})'
+)
+_SPOTIFY_PATTERN = re.compile(r'https?://open\.spotify\.com/track/([a-zA-Z0-9]+)')
+# Only URLs on these hosts are matched against the link patterns above.
+_YOUTUBE_HOSTS = frozenset({'youtube.com', 'www.youtube.com', 'youtu.be'})
+
+_CACHE_SIZE = 512
+
+
+class FoundURL(NamedTuple):
+    """A URL found in message content.
+
+    Attributes:
+        parsed: The parsed URL; ``parsed.geturl()`` round-trips the original text.
+        host: Lower-cased hostname without port or credentials.
+        standalone: True when the URL starts a whitespace-separated token,
+            i.e. it is not wrapped in ``<...>``, markdown, or other text.
+    """
+
+    parsed: ParseResult
+    host: str
+    standalone: bool
+
+
+@dataclass(frozen=True, slots=True)
+class MessageAnalysis:
+    """Immutable result of scanning a message's content once.
+
+    Attributes:
+        urls: Every http(s) URL in order of appearance.
+        youtube_music_ids: Video IDs from music.youtube.com links.
+        youtube_ids: Video IDs from youtube.com and youtu.be links.
+        spotify_track_ids: Track IDs from open.spotify.com links.
+    """
+
+    urls: tuple[FoundURL, ...] = ()
+    youtube_music_ids: tuple[str, ...] = ()
+    youtube_ids: tuple[str, ...] = ()
+    spotify_track_ids: tuple[str, ...] = ()
+
+    @property
+    def hosts(self) -> frozenset[str]:
+        """Return the distinct hostnames of all URLs."""
+        return frozenset(url.host for url in self.urls)
+
+    @property
+    def has_music_links(self) -> bool:
+        """Return True if any YouTube, YouTube Music, or Spotify track link was found."""
+        return bool(
+            self.youtube_music_ids or self.youtube_ids or self.spotify_track_ids
+        )
+
+
+_EMPTY = MessageAnalysis()
+
+
+def analyze_content(content: str) -> MessageAnalysis:
+    """Scan message content once and extract URLs and music link IDs.
+
+    Content without ``http`` short-circuits to a shared empty result without
+    running any regex or touching the cache, so ordinary chat costs a single
+    substring check. Anything else is analysed once and cached by content,
+    so every listener handling the same message shares one result.
+
+    Args:
+        content: Raw message content.
+
+    Returns:
+        The (possibly cached) analysis for this content.
+    """
+    if 'http' not in content:
+        return _EMPTY
+    return _analyze_urls(content)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _analyze_urls(content: str) -> MessageAnalysis:
+    """Extract every URL and music link ID from content that may contain URLs.
+
+    Args:
+        content: Raw message content.
+
+    Returns:
+        The analysis for this content.
+    """
+    urls: list[FoundURL] = []
+    youtube_music_ids: list[str] = []
+    youtube_ids: list[str] = []
+    spotify_track_ids: list[str] = []
+    for match in _URL_RE.finditer(content):
+        text = match.group()
+        start = match.start()
+        try:
+            parsed = urlparse(text)
+            host = parsed.hostname or ''
+        except ValueError:
+            # Malformed netloc, e.g. an unterminated IPv6 literal.
+            continue
+        urls.append(
+            FoundURL(
+                parsed=parsed,
+                host=host,
+                standalone=start == 0 or content[start - 1].isspace(),
+            )
+        )
+        if host == 'music.youtube.com':
+            if music := _YT_MUSIC_PATTERN.match(text):
+                youtube_music_ids.append(music.group(1))
+        elif host in _YOUTUBE_HOSTS:
+            if youtube := _YT_PATTERN.match(text):
+                youtube_ids.append(youtube.group(1))
+        elif host == 'open.spotify.com':
+            if spotify := _SPOTIFY_PATTERN.match(text):
+                spotify_track_ids.append(spotify.group(1))
+
+    if not urls:
+        return _EMPTY
+    return MessageAnalysis(
+        urls=tuple(urls),
+        youtube_music_ids=tuple(youtube_music_ids),
+        youtube_ids=tuple(youtube_ids),
+        spotify_track_ids=tuple(spotify_track_ids),
+    )
+
+
+def analyze_message(message: discord.Message) -> MessageAnalysis:
+    """Return the shared content analysis for a Discord message.
+
+    Args:
+        message: The Discord message to analyse.
+
+    Returns:
+        The (possibly cached) analysis of ``message.content``.
+    """
+    return analyze_content(message.content)
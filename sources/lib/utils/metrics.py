@@ -17,6 +17,16 @@ relay_posts = Counter(
     'Number of posts forwarded by relay',
     ['service', 'type'],
 )
+relay_feed_bytes_saved = Counter(
+    'relay_feed_bytes_saved_total',
+    'Feed body bytes not downloaded because the server answered 304 Not Modified',
+    ['service'],
+)
+relay_feed_parses_skipped = Counter(
+    'relay_feed_parses_skipped_total',
+    'Feed parses skipped by reason (not_modified or unchanged content hash)',
+    ['service', 'reason'],
+)
 command_errors = Counter(
     'command_errors_total',
     'Number of unhandled slash-command errors',
@@ -40,3 +50,95 @@ twitch_eventsub_connected = Gauge(
     'twitch_eventsub_connected',
     'Whether the Twitch EventSub WebSocket connection is currently open (1) or not (0)',
 )
+stats_flush_size = Histogram(
+    'stats_flush_size_rows',
+    'Number of (guild, user) rows written per message counter flush',
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+stats_flush_latency = Histogram(
+    'stats_flush_latency_seconds',
+    'Time spent writing one message counter flush to the database',
+)
+stats_pending_rows = Gauge(
+    'stats_pending_rows',
+    'Number of (guild, user) rows buffered in memory awaiting a flush',
+)
+stats_dropped_rows = Counter(
+    'stats_dropped_rows_total',
+    'Buffered message count rows discarded because failed flushes filled the buffer',
+)
+auto_responder_cooldowns = Gauge(
+    'auto_responder_cooldowns',
+    'Number of (guild, user) auto-responder cooldowns currently held in memory',
+)
+track_cache_lookups = Counter(
+    'track_cache_lookups_total',
+    'Music track resolution cache lookups by outcome (memory, db or miss)',
+    ['result'],
+)
+single_flight_coalesced = Counter(
+    'single_flight_coalesced_total',
+    'Number of calls that joined an identical request already in flight',
+    ['name'],
+)
+stats_import_messages = Counter(
+    'stats_import_messages_total',
+    'Number of historical messages processed by /stats import',
+)
+stats_import_api_wait = Counter(
+    'stats_import_api_wait_seconds_total',
+    'Time /stats import spent waiting on Discord for history pages, '
+    'rate-limit sleeps included, summed over channels',
+)
+stats_import_rate = Gauge(
+    'stats_import_messages_per_second',
+    'Average message throughput of the running /stats import',
+    ['guild'],
+)
+stats_import_eta = Gauge(
+    'stats_import_eta_seconds',
+    'Estimated seconds until the running /stats import finishes',
+    ['guild'],
+)
+stats_import_channels = Gauge(
+    'stats_import_channels',
+    'Channels of the running /stats import by state (done, active or total)',
+    ['guild', 'state'],
+)
+db_operation_latency = Histogram(
+    'db_operation_latency_seconds',
+    'Latency of DB operation functions, e.g. stats.get_leaderboard',
+    ['operation'],
+)
+db_operation_calls = Counter(
+    'db_operation_calls_total',
+    'Number of DB operation function calls by outcome (ok or error)',
+    ['operation', 'outcome'],
+)
+db_query_latency = Histogram(
+    'db_query_latency_seconds',
+    'Latency of individual SQL statements by the operation that issued them',
+    ['operation'],
+)
+db_pool_checked_out = Gauge(
+    'db_pool_checked_out',
+    'Number of DB connections currently checked out of the pool',
+)
+db_pool_idle = Gauge(
+    'db_pool_idle',
+    'Number of open DB connections idle in the pool',
+)
+db_pool_overflow = Gauge(
+    'db_pool_overflow',
+    'Number of DB connections open beyond the pool size',
+)
+db_pool_wait = Histogram(
+    'db_pool_wait_seconds',
+    'Time spent acquiring a connection from the DB pool, including connecting',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+db_row_cache_lookups = Counter(
+    'db_row_cache_lookups_total',
+    'Read-through DB row cache lookups by cache and outcome (hit or miss)',
+    ['cache', 'result'],
+)
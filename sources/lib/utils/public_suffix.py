@@ -0,0 +1,151 @@
+"""Offline public suffix matcher backed by a reversed-label trie."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from tldextract import TLDExtract
+
+# Trie node keys that cannot collide with DNS labels.
+_TERMINAL = '.'
+_WILDCARD = '*'
+
+
+class DomainParts(NamedTuple):
+    """A hostname split around its public suffix.
+
+    Attributes:
+        subdomain: Labels left of the registrable domain, e.g. 'www'.
+        domain: The label directly under the public suffix, e.g. 'reddit'.
+        suffix: The public suffix, e.g. 'com' or 'co.uk'; empty if unknown.
+    """
+
+    subdomain: str
+    domain: str
+    suffix: str
+
+    @property
+    def top_domain_under_public_suffix(self) -> str:
+        """Return the registrable domain, e.g. 'reddit.com', or '' if there is none."""
+        if self.domain and self.suffix:
+            return f'{self.domain}.{self.suffix}'
+        return ''
+
+    @property
+    def fqdn(self) -> str:
+        """Return the full hostname, or '' if there is no registrable domain."""
+        if self.domain and self.suffix:
+            return '.'.join(part for part in self if part)
+        return ''
+
+
+def _decode_label(label: str) -> str:
+    """Lower-case a label and decode it from punycode if needed.
+
+    Args:
+        label: A single DNS label.
+
+    Returns:
+        The label in the Unicode form used by the Public Suffix List.
+    """
+    if not label.islower():
+        label = label.lower()
+    if label.startswith('xn--'):
+        try:
+            return label.encode('ascii').decode('idna')
+        except UnicodeError:
+            return label
+    return label
+
+
+class PublicSuffixMatcher:
+    """Split hostnames into subdomain, domain and public suffix.
+
+    Rules are stored in a trie keyed by labels in reverse order, so a lookup
+    costs one dictionary access per label of the hostname's suffix.
+
+    Args:
+        rules: Public Suffix List rules, e.g. 'co.uk', '*.ck', '!www.ck'.
+    """
+
+    def __init__(self, rules: list[str]) -> None:
+        """Compile the rules into a trie.
+
+        Args:
+            rules: Public Suffix List rules, e.g. 'co.uk', '*.ck', '!www.ck'.
+        """
+        self._root: dict = {}
+        for rule in rules:
+            node = self._root
+            for label in reversed(rule.split('.')):
+                node = node.setdefault(label, {})
+            node[_TERMINAL] = True
+
+    @classmethod
+    def from_snapshot(cls) -> PublicSuffixMatcher:
+        """Build a matcher from the Public Suffix List snapshot tldextract bundles.
+
+        No list URLs and no cache directory are given, so tldextract neither
+        fetches the list nor touches the disk cache, keeping domain splitting
+        deterministic and free of network access. Private-domain rules are
+        skipped, matching tldextract's default.
+
+        Returns:
+            A compiled matcher.
+        """
+        extractor = TLDExtract(
+            cache_dir=None, suffix_list_urls=(), fallback_to_snapshot=True
+        )
+        return cls(extractor.tlds)
+
+    def _suffix_start(self, labels: list[str]) -> int:
+        """Return the index of the first label of the public suffix.
+
+        Args:
+            labels: Hostname labels, left to right.
+
+        Returns:
+            Index into labels; len(labels) if no rule matches.
+        """
+        node = self._root
+        start = len(labels)
+        for index in range(len(labels) - 1, -1, -1):
+            label = _decode_label(labels[index])
+            child = node.get(label)
+            if child is not None:
+                node = child
+                if _TERMINAL in node:
+                    start = index
+                continue
+            if _WILDCARD in node:
+                # '!label' rules carve an exception out of a wildcard.
+                return index + 1 if f'!{label}' in node else index
+            break
+        return start
+
+    def split(self, host: str) -> DomainParts:
+        """Split a hostname around its public suffix.
+
+        IPv4 addresses are returned whole as the domain with no suffix.
+
+        Args:
+            host: Hostname without scheme, port or credentials.
+
+        Returns:
+            The hostname parts; labels keep their original case.
+        """
+        host = host.rstrip('.')
+        if host.replace('.', '').isdigit():
+            return DomainParts(subdomain='', domain=host, suffix='')
+        labels = host.split('.')
+        start = self._suffix_start(labels)
+        if start == 0 or not labels[0]:
+            return DomainParts(subdomain='', domain='', suffix=host)
+        return DomainParts(
+            subdomain='.'.join(labels[: start - 1]),
+            domain=labels[start - 1],
+            suffix='.'.join(labels[start:]),
+        )
+
+
+public_suffixes = PublicSuffixMatcher.from_snapshot()
@@ -0,0 +1,67 @@
+"""Coalesce concurrent calls for the same key into one in-flight coroutine."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from sources.lib.utils.metrics import single_flight_coalesced
+
+
+class SingleFlight:
+    """Run at most one coroutine per key at a time and share its result.
+
+    The first caller for a key starts the work as a task; callers that arrive
+    while it is running await the same task instead of starting their own.
+    The result, or the exception, is delivered to every waiter. Cancelling
+    one waiter does not cancel the shared work for the others.
+
+    Args:
+        name: Label used for the coalesced-calls metric.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialise with no calls in flight.
+
+        Args:
+            name: Label used for the coalesced-calls metric.
+        """
+        self._name = name
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        """Return the number of keys with a call in flight."""
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Await func() for key, joining a call already in flight if there is one.
+
+        Args:
+            key: Identifies calls that can share a result.
+            func: Zero-argument coroutine function doing the actual work.
+
+        Returns:
+            The result of the shared call.
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            single_flight_coalesced.labels(name=self._name).inc()
+        else:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a finished call so the next caller starts a fresh one.
+
+        Args:
+            key: Key the task was registered under.
+            task: The finished task.
+        """
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter was cancelled.
+            task.exception()
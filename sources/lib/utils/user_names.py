@@ -0,0 +1,153 @@
+"""Batched, cached display-name resolution for embeds that list users."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+
+import discord
+
+_TTL_SECONDS = 3600
+_MAX_ENTRIES = 5000
+_MAX_CONCURRENT_FETCHES = 5
+
+
+def unknown_user_name(user_id: int) -> str:
+    """Return the placeholder shown for a user that cannot be resolved.
+
+    Args:
+        user_id: Discord user ID.
+    """
+    return f'Unknown user ({user_id})'
+
+
+class UserNameResolver:
+    """Resolve many user IDs to display names in about one round trip.
+
+    Guild members and users in the client's cache are resolved locally. The
+    rest are fetched over REST concurrently, at most max_concurrent at a time,
+    and the results are cached for ttl seconds. A 404 caches the
+    unknown-user placeholder. Other HTTP errors are not cached, so the next
+    call retries them.
+
+    Args:
+        ttl: Seconds a fetched name stays cached.
+        max_entries: Maximum number of cached names.
+        max_concurrent: Maximum number of REST fetches in flight per call.
+    """
+
+    def __init__(
+        self,
+        ttl: float = _TTL_SECONDS,
+        max_entries: int = _MAX_ENTRIES,
+        max_concurrent: int = _MAX_CONCURRENT_FETCHES,
+    ) -> None:
+        """Initialise an empty cache.
+
+        Args:
+            ttl: Seconds a fetched name stays cached.
+            max_entries: Maximum number of cached names.
+            max_concurrent: Maximum number of REST fetches in flight per call.
+        """
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_concurrent = max_concurrent
+        # user_id -> (display name, monotonic expiry time), oldest first
+        self._names: OrderedDict[int, tuple[str, float]] = OrderedDict()
+
+    def _cached(self, user_id: int) -> str | None:
+        """Return a cached name that has not expired yet.
+
+        Args:
+            user_id: Discord user ID.
+        """
+        entry = self._names.get(user_id)
+        if entry is None:
+            return None
+        name, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._names[user_id]
+            return None
+        return name
+
+    def _remember(self, user_id: int, name: str) -> None:
+        """Cache a fetched name, evicting the oldest entry when full.
+
+        Args:
+            user_id: Discord user ID.
+            name: Display name to cache.
+        """
+        self._names[user_id] = (name, time.monotonic() + self._ttl)
+        self._names.move_to_end(user_id)
+        if len(self._names) > self._max_entries:
+            self._names.popitem(last=False)
+
+    async def _fetch(
+        self, client: discord.Client, user_id: int, limit: asyncio.Semaphore
+    ) -> str:
+        """Fetch one user over REST and cache the outcome.
+
+        Args:
+            client: The Discord client used for the request.
+            user_id: Discord user ID.
+            limit: Semaphore bounding concurrent fetches.
+
+        Returns:
+            The user's display name, or the unknown-user placeholder.
+        """
+        async with limit:
+            try:
+                user = await client.fetch_user(user_id)
+            except discord.NotFound:
+                name = unknown_user_name(user_id)
+            except discord.HTTPException:
+                return unknown_user_name(user_id)
+            else:
+                name = user.display_name
+        self._remember(user_id, name)
+        return name
+
+    async def resolve(
+        self,
+        client: discord.Client,
+        guild: discord.Guild | None,
+        user_ids: Iterable[int],
+    ) -> dict[int, str]:
+        """Resolve user IDs to display names.
+
+        Args:
+            client: The Discord client, used for its user cache and REST calls.
+            guild: Guild whose member nicknames take priority, if any.
+            user_ids: IDs to resolve; duplicates are resolved once.
+
+        Returns:
+            Mapping of every requested user ID to a display name.
+        """
+        names: dict[int, str] = {}
+        missing: list[int] = []
+        for user_id in dict.fromkeys(user_ids):
+            member = guild.get_member(user_id) if guild is not None else None
+            if member is not None:
+                names[user_id] = member.display_name
+                continue
+            name = self._cached(user_id)
+            if name is None:
+                user = client.get_user(user_id)
+                name = user.display_name if user is not None else None
+            if name is not None:
+                names[user_id] = name
+            else:
+                missing.append(user_id)
+
+        if missing:
+            limit = asyncio.Semaphore(self._max_concurrent)
+            fetched = await asyncio.gather(
+                *(self._fetch(client, user_id, limit) for user_id in missing)
+            )
+            names.update(zip(missing, fetched, strict=True))
+        return names
+
+
+user_names = UserNameResolver()
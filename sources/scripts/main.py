@@ -28,6 +28,8 @@ from sources.lib.cogs.twitch_relay import TwitchRelayCog
 from sources.lib.cogs.user import UserCog
 from sources.lib.cogs.voice import VoiceCog
 from sources.lib.cogs.youtube_relay import YouTubeRelayCog
+from sources.lib.db import async_engine
+from sources.lib.db.utils import prewarm_pool
 from sources.lib.utils.logger import Logger
 from sources.lib.utils.metrics import command_errors
 
@@ -236,6 +238,7 @@ async def main():
     """Main run function."""
     utils.setup_logging()
     await _start_health_server(bot)
+    await prewarm_pool(async_engine, config.db_pool_size)
     async with bot:
         await bot.start(token=config.discord_token, reconnect=True)
 
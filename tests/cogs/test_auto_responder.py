@@ -23,151 +23,240 @@ def _make_message(guild_id: int, author_id: int, mentions: list) -> MagicMock:
     return msg
 
 
+def _make_cog(responders: dict[tuple[int, int], str] | None = None):
+    from sources.lib.cogs.auto_responder import AutoResponderCog
+
+    bot = _make_bot()
+    cog = AutoResponderCog(bot)
+    for (guild_id, user_id), text in (responders or {}).items():
+        cog._index.set(guild_id, user_id, text, None)
+    return bot, cog
+
+
 class TestOnMessage:
     async def test_ignores_bot_messages(self):
-        from sources.lib.cogs.auto_responder import AutoResponderCog
-
-        bot = _make_bot()
-        cog = AutoResponderCog(bot)
+        bot, cog = _make_cog({(1, 1): 'away'})
         msg = _make_message(1, 999, [SimpleNamespace(id=1)])
         msg.author = bot.user
 
-        with patch(
-            'sources.lib.cogs.auto_responder.get_auto_responder', new_callable=AsyncMock
-        ) as mock_get:
-            await cog.on_message(msg)
+        await cog.on_message(msg)
 
-        mock_get.assert_not_called()
+        msg.reply.assert_not_awaited()
 
     async def test_ignores_messages_without_mentions(self):
-        from sources.lib.cogs.auto_responder import AutoResponderCog
-
-        bot = _make_bot()
-        cog = AutoResponderCog(bot)
+        _, cog = _make_cog({(1, 2): 'away'})
         msg = _make_message(1, 1, [])
 
-        with patch(
-            'sources.lib.cogs.auto_responder.get_auto_responder', new_callable=AsyncMock
-        ) as mock_get:
-            await cog.on_message(msg)
+        await cog.on_message(msg)
 
-        mock_get.assert_not_called()
+        msg.reply.assert_not_awaited()
 
     async def test_ignores_dm_messages(self):
-        from sources.lib.cogs.auto_responder import AutoResponderCog
-
-        bot = _make_bot()
-        cog = AutoResponderCog(bot)
+        _, cog = _make_cog({(1, 2): 'away'})
         msg = _make_message(1, 1, [SimpleNamespace(id=2)])
         msg.guild = None
 
-        with patch(
-            'sources.lib.cogs.auto_responder.get_auto_responder', new_callable=AsyncMock
-        ) as mock_get:
-            await cog.on_message(msg)
+        await cog.on_message(msg)
 
-        mock_get.assert_not_called()
+        msg.reply.assert_not_awaited()
 
     async def test_sends_response_when_responder_exists(self):
-        from sources.lib.cogs.auto_responder import AutoResponderCog
-
-        bot = _make_bot()
-        cog = AutoResponderCog(bot)
+        _, cog = _make_cog({(1, 2): 'I am away'})
         mentioned = SimpleNamespace(id=2, display_name='Alice')
         msg = _make_message(1, 1, [mentioned])
-        responder = SimpleNamespace(response_text='I am away')
 
-        with patch(
-            'sources.lib.cogs.auto_responder.get_auto_responder',
-            new_callable=AsyncMock,
-            return_value=responder,
-        ):
-            await cog.on_message(msg)
+        await cog.on_message(msg)
 
         msg.reply.assert_awaited_once_with('**Alice**: I am away')
 
     async def test_does_not_send_when_no_responder(self):
-        from sources.lib.cogs.auto_responder import AutoResponderCog
+        _, cog = _make_cog({(1, 3): 'away'})
+        mentioned = SimpleNamespace(id=2, display_name='Alice')
+        msg = _make_message(1, 1, [mentioned])
 
-        bot = _make_bot()
-        cog = AutoResponderCog(bot)
+        await cog.on_message(msg)
+
+        msg.reply.assert_not_awaited()
+        # A miss must not start a cooldown for the mentioned user.
+        assert (1, 2) not in cog._cooldowns
+
+    async def test_guild_without_responders_skips_mention_loop(self):
+        _, cog = _make_cog({(5, 2): 'away'})
         mentioned = SimpleNamespace(id=2, display_name='Alice')
         msg = _make_message(1, 1, [mentioned])
 
-        with patch(
-            'sources.lib.cogs.auto_responder.get_auto_responder',
-            new_callable=AsyncMock,
-            return_value=None,
-        ):
+        with patch.object(cog._index, 'get') as mock_get:
             await cog.on_message(msg)
 
+        mock_get.assert_not_called()
         msg.reply.assert_not_awaited()
 
-    async def test_cooldown_suppresses_second_fire(self):
-        from sources.lib.cogs.auto_responder import AutoResponderCog
-
-        bot = _make_bot()
-        cog = AutoResponderCog(bot)
+    async def test_does_not_touch_database(self):
+        _, cog = _make_cog({(1, 2): 'away'})
         mentioned = SimpleNamespace(id=2, display_name='Alice')
         msg = _make_message(1, 1, [mentioned])
-        responder = SimpleNamespace(response_text='away')
 
         with patch(
-            'sources.lib.cogs.auto_responder.get_auto_responder',
-            new_callable=AsyncMock,
-            return_value=responder,
-        ):
-            await cog.on_message(msg)
+            'sources.lib.db.operations.auto_responder.AsyncSession'
+        ) as mock_session:
             await cog.on_message(msg)
 
+        mock_session.assert_not_called()
+        msg.reply.assert_awaited_once()
+
+    async def test_expired_responder_is_not_sent(self):
+        _, cog = _make_cog()
+        cog._index.set(1, 2, 'away', datetime.now(tz=UTC) - timedelta(seconds=1))
+        mentioned = SimpleNamespace(id=2, display_name='Alice')
+        msg = _make_message(1, 1, [mentioned])
+
+        await cog.on_message(msg)
+
+        msg.reply.assert_not_awaited()
+        assert not cog._index.has_guild(1)
+
+    async def test_cooldown_suppresses_second_fire(self):
+        _, cog = _make_cog({(1, 2): 'away'})
+        mentioned = SimpleNamespace(id=2, display_name='Alice')
+        msg = _make_message(1, 1, [mentioned])
+
+        await cog.on_message(msg)
+        await cog.on_message(msg)
+
         # Only the first message should trigger a reply
         assert msg.reply.await_count == 1
 
     async def test_cooldown_expires_after_300_seconds(self):
-        from sources.lib.cogs.auto_responder import AutoResponderCog
-
-        bot = _make_bot()
-        cog = AutoResponderCog(bot)
+        _, cog = _make_cog({(1, 2): 'away'})
         mentioned = SimpleNamespace(id=2, display_name='Alice')
         msg = _make_message(1, 1, [mentioned])
-        responder = SimpleNamespace(response_text='away')
 
-        # Manually set the cooldown to 301 seconds ago
-        past = datetime.now(tz=UTC) - timedelta(seconds=301)
-        cog._cooldowns[(1, 2)] = past
+        clock = [1000.0]
+        cog._cooldowns._clock = lambda: clock[0]
 
-        with patch(
-            'sources.lib.cogs.auto_responder.get_auto_responder',
-            new_callable=AsyncMock,
-            return_value=responder,
-        ):
-            await cog.on_message(msg)
+        await cog.on_message(msg)
+        clock[0] += 299
+        await cog.on_message(msg)
+        clock[0] += 2
+        await cog.on_message(msg)
 
-        msg.reply.assert_awaited_once_with('**Alice**: away')
+        assert msg.reply.await_count == 2
+        msg.reply.assert_awaited_with('**Alice**: away')
 
     async def test_multiple_mentions_each_checked_independently(self):
-        from sources.lib.cogs.auto_responder import AutoResponderCog
-
-        bot = _make_bot()
-        cog = AutoResponderCog(bot)
+        _, cog = _make_cog({(1, 2): 'A away', (1, 3): 'B away'})
         user_a = SimpleNamespace(id=2, display_name='Alice')
         user_b = SimpleNamespace(id=3, display_name='Bob')
         msg = _make_message(1, 1, [user_a, user_b])
 
-        responders = {
-            2: SimpleNamespace(response_text='A away'),
-            3: SimpleNamespace(response_text='B away'),
-        }
+        await cog.on_message(msg)
 
-        async def _get(guild_id, user_id):
-            return responders.get(user_id)
+        assert msg.reply.await_count == 2
 
-        with patch(
-            'sources.lib.cogs.auto_responder.get_auto_responder', side_effect=_get
+
+class TestAutoResponderIndex:
+    def _now(self) -> datetime:
+        return datetime(2026, 1, 1, 12, 0, tzinfo=UTC)
+
+    def test_load_replaces_contents(self):
+        from sources.lib.cogs.auto_responder import AutoResponderIndex
+
+        index = AutoResponderIndex()
+        index.set(9, 9, 'stale', None)
+        index.load(
+            [
+                SimpleNamespace(
+                    guild_id=1, user_id=2, response_text='away', expires_at=None
+                )
+            ]
+        )
+
+        assert index.get(1, 2, self._now()) == 'away'
+        assert not index.has_guild(9)
+
+    def test_expired_entries_are_dropped_on_get(self):
+        from sources.lib.cogs.auto_responder import AutoResponderIndex
+
+        now = self._now()
+        index = AutoResponderIndex()
+        index.set(1, 2, 'soon', now + timedelta(minutes=1))
+        index.set(1, 3, 'forever', None)
+
+        assert index.get(1, 2, now) == 'soon'
+        assert index.get(1, 2, now + timedelta(minutes=1)) is None
+        assert index.get(1, 3, now + timedelta(days=365)) == 'forever'
+
+    def test_update_supersedes_old_expiry(self):
+        from sources.lib.cogs.auto_responder import AutoResponderIndex
+
+        now = self._now()
+        index = AutoResponderIndex()
+        index.set(1, 2, 'old', now + timedelta(minutes=1))
+        index.set(1, 2, 'new', now + timedelta(hours=1))
+
+        # The first heap item is stale and must not evict the updated entry.
+        assert index.get(1, 2, now + timedelta(minutes=5)) == 'new'
+
+    def test_remove_drops_empty_guild(self):
+        from sources.lib.cogs.auto_responder import AutoResponderIndex
+
+        index = AutoResponderIndex()
+        index.set(1, 2, 'away', None)
+        index.remove(1, 2)
+        index.remove(1, 2)
+
+        assert not index.has_guild(1)
+        assert index.get(1, 2, self._now()) is None
+
+
+class TestIndexLifecycle:
+    async def test_cog_load_populates_index(self):
+        _, cog = _make_cog()
+        responder = SimpleNamespace(
+            guild_id=1, user_id=2, response_text='away', expires_at=None
+        )
+        with (
+            patch(
+                'sources.lib.cogs.auto_responder.list_all_auto_responders',
+                new_callable=AsyncMock,
+                return_value=[responder],
+            ),
+            patch.object(cog._cleanup_expired, 'start') as mock_start,
         ):
-            await cog.on_message(msg)
+            await cog.cog_load()
+
+        mock_start.assert_called_once()
+        assert cog._index.get(1, 2, datetime.now(tz=UTC)) == 'away'
+
+    async def test_cleanup_expires_without_reloading(self):
+        _, cog = _make_cog({(1, 2): 'kept'})
+        past = datetime.now(tz=UTC) - timedelta(minutes=1)
+        cog._index.set(3, 4, 'gone', past)
+        reload = AsyncMock(return_value=[])
+        with (
+            patch(
+                'sources.lib.cogs.auto_responder.delete_expired_auto_responders',
+                new_callable=AsyncMock,
+                return_value=1,
+            ),
+            patch(
+                'sources.lib.cogs.auto_responder.list_all_auto_responders',
+                new=reload,
+            ),
+        ):
+            await cog._cleanup_expired()
 
-        assert msg.reply.await_count == 2
+        reload.assert_not_awaited()
+        assert cog._index.has_guild(1)
+        assert not cog._index.has_guild(3)
+
+    async def test_guild_remove_drops_its_responders(self):
+        _, cog = _make_cog({(1, 2): 'a', (1, 3): 'b', (5, 2): 'c'})
+
+        await cog.on_guild_remove(SimpleNamespace(id=1))
+
+        assert not cog._index.has_guild(1)
+        assert cog._index.has_guild(5)
 
 
 class TestNormalizeExpiry:
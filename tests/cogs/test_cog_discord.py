@@ -167,6 +167,29 @@ class TestSetTimezone:
         assert 'Alice' in msg
 
 
+class TestGuildOnReady:
+    """on_ready reconciles all guilds and voice channels in a single call."""
+
+    async def test_reconciles_available_guilds_and_keeps_unavailable(self) -> None:
+        voice = MagicMock(spec=discord.VoiceChannel, id=10)
+        voice.name = 'General'
+        text = MagicMock(spec=discord.TextChannel, id=11)
+        available = SimpleNamespace(
+            id=1, name='One', unavailable=False, channels=[voice, text]
+        )
+        offline = SimpleNamespace(id=2, unavailable=True)
+        bot = _bot()
+        bot.guilds = [available, offline]
+        cog = GuildCog(bot)
+
+        with patch(
+            'sources.lib.cogs.guild.reconcile_guilds', new=AsyncMock(return_value=[])
+        ) as reconcile:
+            await cog.on_ready()
+
+        reconcile.assert_awaited_once_with({1: 'One'}, {10: (1, 'General')}, [2])
+
+
 class TestGetTimestamp:
     """/get-timestamp dispatches based on timezone and date validity."""
 
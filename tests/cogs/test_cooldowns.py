@@ -0,0 +1,70 @@
+"""Tests for the bounded, self-expiring cooldown store."""
+
+from unittest.mock import MagicMock
+
+from sources.lib.utils.cooldowns import CooldownStore
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCooldownStore:
+    def test_second_acquire_within_ttl_is_refused(self):
+        clock = _Clock()
+        store = CooldownStore(ttl=300, max_entries=10, clock=clock)
+
+        assert store.try_acquire('a')
+        clock.now = 299
+        assert not store.try_acquire('a')
+        clock.now = 300
+        assert store.try_acquire('a')
+
+    def test_expired_entries_are_purged(self):
+        clock = _Clock()
+        store = CooldownStore(ttl=10, max_entries=100, clock=clock)
+        for key in range(50):
+            store.try_acquire(key)
+        clock.now = 10
+        store.try_acquire('fresh')
+
+        assert len(store) == 1
+        assert 'fresh' in store
+
+    def test_size_is_capped_by_evicting_oldest(self):
+        clock = _Clock()
+        store = CooldownStore(ttl=300, max_entries=3, clock=clock)
+        for key in 'abcd':
+            clock.now += 1
+            store.try_acquire(key)
+
+        assert len(store) == 3
+        assert 'a' not in store
+        assert store.try_acquire('a')
+
+    def test_discard_cancels_cooldown(self):
+        store = CooldownStore(ttl=300, max_entries=10, clock=_Clock())
+        store.try_acquire('a')
+        store.discard('a')
+        store.discard('missing')
+
+        assert store.try_acquire('a')
+
+    def test_size_gauge_tracks_entries(self):
+        clock = _Clock()
+        gauge = MagicMock()
+        store = CooldownStore(ttl=10, max_entries=10, size_gauge=gauge, clock=clock)
+        store.try_acquire('a')
+        store.try_acquire('b')
+        gauge.set.assert_called_with(2)
+
+        store.discard('a')
+        gauge.set.assert_called_with(1)
+
+        clock.now = 10
+        store.try_acquire('c')
+        gauge.set.assert_called_with(1)
@@ -3,7 +3,16 @@
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
-from sources.lib.utils.domains_fixer import fix_urls
+import pytest
+
+from sources.lib.utils import domains_fixer
+from sources.lib.utils.domains_fixer import fix_urls, invalidate_guild_rules
+
+
+@pytest.fixture(autouse=True)
+def _clear_rules_cache():
+    domains_fixer._rules_cache.clear()
+    domains_fixer._rules_generation.clear()
 
 
 def _message(content: str, guild_id: int = 1) -> SimpleNamespace:
@@ -109,3 +118,45 @@ class TestFixUrls:
         ):
             result = await fix_urls(msg)
         assert '/user/status/123456' in result
+
+
+class TestRulesCache:
+    async def test_rules_loaded_once_per_guild(self):
+        mock_get = AsyncMock(return_value=[_fixer('reddit.com', 'rxddit')])
+        with patch(
+            'sources.lib.utils.domains_fixer.get_all_domain_fixers', new=mock_get
+        ):
+            await fix_urls(_message('https://reddit.com/a'))
+            await fix_urls(_message('https://reddit.com/b'))
+        mock_get.assert_awaited_once_with(guild_id=1)
+
+    async def test_guilds_cached_independently(self):
+        mock_get = AsyncMock(return_value=[])
+        with patch(
+            'sources.lib.utils.domains_fixer.get_all_domain_fixers', new=mock_get
+        ):
+            await fix_urls(_message('https://reddit.com/a', guild_id=1))
+            await fix_urls(_message('https://reddit.com/a', guild_id=2))
+        assert mock_get.await_count == 2
+
+    async def test_invalidation_reloads_rules(self):
+        mock_get = AsyncMock(return_value=[])
+        with patch(
+            'sources.lib.utils.domains_fixer.get_all_domain_fixers', new=mock_get
+        ):
+            assert await fix_urls(_message('https://reddit.com/a')) == (
+                'https://reddit.com/a'
+            )
+            mock_get.return_value = [_fixer('reddit.com', 'rxddit')]
+            invalidate_guild_rules(1)
+            result = await fix_urls(_message('https://reddit.com/a'))
+        assert result.startswith('https://rxddit.com/a')
+        assert mock_get.await_count == 2
+
+    async def test_message_without_urls_skips_db(self):
+        mock_get = AsyncMock(return_value=[])
+        with patch(
+            'sources.lib.utils.domains_fixer.get_all_domain_fixers', new=mock_get
+        ):
+            await fix_urls(_message('no links here'))
+        mock_get.assert_not_awaited()
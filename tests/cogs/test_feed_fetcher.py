@@ -0,0 +1,164 @@
+"""Tests for conditional-GET feed fetching."""
+
+from unittest.mock import patch
+
+import aiohttp
+import feedparser
+import pytest
+from prometheus_client import REGISTRY
+
+from sources.lib.utils.feed_fetcher import FeedFetcher
+
+_TIMEOUT = aiohttp.ClientTimeout(total=1)
+_URL = 'https://example.com/feed.xml'
+
+
+def _atom(*ids: str) -> bytes:
+    entries = ''.join(f'<entry><id>{i}</id><title>{i}</title></entry>' for i in ids)
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        f'<feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'
+    ).encode()
+
+
+class _Response:
+    def __init__(self, status: int, body: bytes, headers: dict[str, str]) -> None:
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+class _Session:
+    """Session stub that replays queued responses and records request headers."""
+
+    def __init__(self, *responses: _Response) -> None:
+        self._responses = list(responses)
+        self.sent_headers: list[dict[str, str]] = []
+
+    def get(self, url, headers, timeout):
+        self.sent_headers.append(headers)
+        return self._responses.pop(0)
+
+
+def _metric(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def parse():
+    with patch(
+        'sources.lib.utils.feed_fetcher.feedparser.parse', wraps=feedparser.parse
+    ) as parse:
+        yield parse
+
+
+class TestFeedFetcher:
+    async def test_first_fetch_parses_and_remembers_validators(self, parse):
+        fetcher = FeedFetcher('test_first')
+        session = _Session(
+            _Response(200, _atom('a'), {'ETag': '"v1"', 'Last-Modified': 'Mon'})
+        )
+
+        feed = await fetcher.fetch(session, _URL, _TIMEOUT)
+
+        assert [e.id for e in feed.entries] == ['a']
+        assert session.sent_headers == [{}]
+        assert parse.call_count == 1
+        assert len(fetcher) == 1
+
+    async def test_not_modified_reuses_parse_and_counts_saved_bytes(self, parse):
+        fetcher = FeedFetcher('test_304')
+        body = _atom('a', 'b')
+        session = _Session(
+            _Response(200, body, {'ETag': '"v1"', 'Last-Modified': 'Mon'}),
+            _Response(304, b'', {}),
+        )
+
+        first = await fetcher.fetch(session, _URL, _TIMEOUT)
+        second = await fetcher.fetch(session, _URL, _TIMEOUT)
+
+        assert second is first
+        assert session.sent_headers[1] == {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Mon',
+        }
+        assert parse.call_count == 1
+        assert _metric('relay_feed_bytes_saved_total', service='test_304') == len(body)
+        assert (
+            _metric(
+                'relay_feed_parses_skipped_total',
+                service='test_304',
+                reason='not_modified',
+            )
+            == 1
+        )
+
+    async def test_unchanged_body_skips_parse(self, parse):
+        fetcher = FeedFetcher('test_hash')
+        session = _Session(
+            _Response(200, _atom('a'), {}),
+            _Response(200, _atom('a'), {'ETag': '"late"'}),
+            _Response(304, b'', {}),
+        )
+
+        first = await fetcher.fetch(session, _URL, _TIMEOUT)
+        assert await fetcher.fetch(session, _URL, _TIMEOUT) is first
+        await fetcher.fetch(session, _URL, _TIMEOUT)
+
+        assert parse.call_count == 1
+        assert session.sent_headers[2] == {'If-None-Match': '"late"'}
+        assert (
+            _metric(
+                'relay_feed_parses_skipped_total',
+                service='test_hash',
+                reason='unchanged',
+            )
+            == 1
+        )
+
+    async def test_changed_body_is_parsed(self, parse):
+        fetcher = FeedFetcher('test_changed')
+        session = _Session(
+            _Response(200, _atom('a'), {}), _Response(200, _atom('b', 'a'), {})
+        )
+
+        await fetcher.fetch(session, _URL, _TIMEOUT)
+        feed = await fetcher.fetch(session, _URL, _TIMEOUT)
+
+        assert [e.id for e in feed.entries] == ['b', 'a']
+        assert parse.call_count == 2
+
+    async def test_error_responses_are_not_remembered(self, parse):
+        fetcher = FeedFetcher('test_error')
+        session = _Session(
+            _Response(200, _atom('a'), {'ETag': '"v1"'}),
+            _Response(503, b'unavailable', {}),
+            _Response(200, _atom('a'), {}),
+        )
+
+        await fetcher.fetch(session, _URL, _TIMEOUT)
+        feed = await fetcher.fetch(session, _URL, _TIMEOUT)
+        await fetcher.fetch(session, _URL, _TIMEOUT)
+
+        assert feed.entries == []
+        assert session.sent_headers[2] == {}
+        assert parse.call_count == 3
+
+    async def test_least_recently_used_feed_is_forgotten(self):
+        fetcher = FeedFetcher('test_lru', max_entries=2)
+        session = _Session(*(_Response(200, _atom(str(i)), {}) for i in range(3)))
+
+        for i in range(3):
+            await fetcher.fetch(session, f'{_URL}?{i}', _TIMEOUT)
+
+        assert len(fetcher) == 2
+        assert f'{_URL}?0' not in fetcher._feeds
@@ -0,0 +1,130 @@
+"""Tests for live /stats import telemetry."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from prometheus_client import REGISTRY
+
+from sources.lib.cogs.stats import StatsCog
+from sources.lib.import_progress import ChannelProgress, ImportProgress
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _channel(channel_id: int, last_message_id: int | None) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=channel_id, name=f'channel-{channel_id}', last_message_id=last_message_id
+    )
+
+
+async def _history(clock: _Clock, ids: list[int], page_wait: float):
+    """Yield messages two per page, advancing the clock for each page fetch."""
+    for index, message_id in enumerate(ids):
+        if index % 2 == 0:
+            clock.now += page_wait
+        yield SimpleNamespace(id=message_id)
+
+
+def _gauge(name: str, **labels: str) -> float | None:
+    return REGISTRY.get_sample_value(name, labels)
+
+
+class TestChannelProgress:
+    def test_fraction_follows_snowflake_range(self):
+        channel = ChannelProgress('c', start_id=100, end_id=300, current_id=150)
+        assert channel.fraction == 0.25
+        channel.current_id = 400
+        assert channel.fraction == 1.0
+
+    def test_empty_channel_has_no_fraction(self):
+        assert ChannelProgress('c', 100, None, 100).fraction == 0.0
+
+
+class TestImportProgress:
+    async def test_track_counts_messages_and_wait_time(self):
+        clock = _Clock()
+        progress = ImportProgress(1, total_channels=2, clock=clock)
+
+        seen = [
+            message.id
+            async for message in progress.track(
+                _channel(10, 14), 10, _history(clock, [11, 12, 13, 14], 2.0)
+            )
+        ]
+
+        assert seen == [11, 12, 13, 14]
+        assert progress.messages == 4
+        assert progress.api_wait == 4.0
+        assert progress.rate == 1.0
+        assert progress.active[10].fraction == 1.0
+
+    async def test_eta_extrapolates_from_progress_so_far(self):
+        clock = _Clock()
+        progress = ImportProgress(1, total_channels=4, clock=clock)
+        progress.channel_finished(1, skipped=True)
+        clock.now = 10.0
+        async for _ in progress.track(_channel(2, 20), 10, _history(clock, [15], 0.0)):
+            pass
+
+        # One skipped channel is excluded; half a channel took 10 seconds,
+        # so the remaining two and a half take 50.
+        assert progress.eta == 50.0
+
+    def test_eta_unknown_before_any_progress(self):
+        progress = ImportProgress(1, total_channels=3, clock=_Clock())
+        progress.channel_finished(1, skipped=True)
+        assert progress.eta is None
+
+    async def test_publish_and_close_update_metrics(self):
+        clock = _Clock()
+        progress = ImportProgress(424_242, total_channels=1, clock=clock)
+        before = REGISTRY.get_sample_value('stats_import_messages_total') or 0.0
+
+        async for _ in progress.track(_channel(1, 3), 1, _history(clock, [2, 3], 1.0)):
+            pass
+        progress.channel_finished(1)
+
+        assert REGISTRY.get_sample_value('stats_import_messages_total') == before + 2
+        assert _gauge('stats_import_messages_per_second', guild='424242') == 2.0
+        assert _gauge('stats_import_eta_seconds', guild='424242') == 0.0
+        assert _gauge('stats_import_channels', guild='424242', state='done') == 1.0
+
+        progress.close()
+        assert _gauge('stats_import_messages_per_second', guild='424242') is None
+        assert _gauge('stats_import_channels', guild='424242', state='total') is None
+        assert REGISTRY.get_sample_value('stats_import_messages_total') == before + 2
+
+
+class TestImportStatusEmbed:
+    async def test_running_import_shows_throughput(self):
+        cog = StatsCog(MagicMock())
+        clock = _Clock()
+        progress = ImportProgress(1, total_channels=2, clock=clock)
+        async for _ in progress.track(_channel(5, 30), 10, _history(clock, [20], 4.0)):
+            pass
+        cog._import_progress[1] = progress
+        cog._import_tasks[1] = MagicMock(done=MagicMock(return_value=False))
+
+        interaction = MagicMock()
+        interaction.guild_id = 1
+        interaction.guild.text_channels = []
+        interaction.response.send_message = AsyncMock()
+        with patch(
+            'sources.lib.cogs.stats.get_all_channel_progress',
+            new=AsyncMock(return_value=[]),
+        ):
+            await cog.import_status.callback(cog, interaction)
+
+        embed = interaction.response.send_message.await_args.kwargs['embed']
+        fields = {field.name: field.value for field in embed.fields}
+        assert fields['Messages'] == '1'
+        assert fields['Rate'] == '0.2 msg/s'
+        assert fields['Waiting on Discord'] == '4s'
+        assert fields['ETA'].startswith('<t:')
+        assert fields['Current channels'] == '<#5> — 1 msgs, 50%'
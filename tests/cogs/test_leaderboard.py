@@ -0,0 +1,92 @@
+"""Tests for the incrementally maintained top-K leaderboard cache."""
+
+import asyncio
+import random
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from sources.lib.leaderboard import LeaderboardCache, LeaderboardEntry
+
+_SEED = 'sources.lib.leaderboard.get_leaderboard'
+
+
+def _rows(*pairs):
+    return [SimpleNamespace(user_id=u, message_count=c) for u, c in pairs]
+
+
+class TestLeaderboardCache:
+    async def test_seeds_once_then_serves_from_memory(self):
+        cache = LeaderboardCache(size=3)
+        with patch(_SEED, new=AsyncMock(return_value=_rows((1, 9), (2, 5)))) as seed:
+            first = await cache.top(7)
+            second = await cache.top(7)
+
+        assert first == [LeaderboardEntry(1, 9), LeaderboardEntry(2, 5)]
+        assert second == first
+        seed.assert_awaited_once_with(7, limit=3)
+
+    async def test_updates_existing_and_admits_new_users(self):
+        cache = LeaderboardCache(size=2)
+        with patch(_SEED, new=AsyncMock(return_value=_rows((1, 9), (2, 5)))):
+            await cache.top(7)
+            cache.apply([(7, 2, 12), (7, 3, 6), (7, 4, 4)])
+            top = await cache.top(7)
+
+        assert top == [LeaderboardEntry(2, 12), LeaderboardEntry(1, 9)]
+
+    async def test_stale_total_does_not_lower_count(self):
+        cache = LeaderboardCache(size=2)
+        with patch(_SEED, new=AsyncMock(return_value=_rows((1, 9)))):
+            await cache.top(7)
+            cache.apply([(7, 1, 12), (7, 1, 10)])
+            top = await cache.top(7)
+
+        assert top == [LeaderboardEntry(1, 12)]
+
+    async def test_unseeded_guilds_are_ignored(self):
+        cache = LeaderboardCache()
+        cache.apply([(7, 1, 5)])
+        assert cache._guilds == {}
+
+    async def test_totals_written_during_seed_are_replayed(self):
+        cache = LeaderboardCache(size=2)
+        release = asyncio.Event()
+
+        async def _slow_seed(guild_id, limit):
+            await release.wait()
+            return _rows((1, 9), (2, 5))
+
+        with patch(_SEED, side_effect=_slow_seed):
+            pending = asyncio.ensure_future(cache.top(7))
+            await asyncio.sleep(0)
+            cache.apply([(7, 3, 20)])
+            release.set()
+            top = await pending
+
+        assert top == [LeaderboardEntry(3, 20), LeaderboardEntry(1, 9)]
+
+    async def test_invalidate_forces_reseed(self):
+        cache = LeaderboardCache()
+        with patch(_SEED, new=AsyncMock(return_value=_rows((1, 9)))) as seed:
+            await cache.top(7)
+            cache.invalidate(7)
+            await cache.top(7)
+
+        assert seed.await_count == 2
+
+    async def test_matches_full_sort_under_random_increments(self):
+        rng = random.Random(1234)
+        totals = {user_id: rng.randint(0, 50) for user_id in range(200)}
+        seed_rows = sorted(totals.items(), key=lambda item: -item[1])[:10]
+        cache = LeaderboardCache(size=10)
+        with patch(_SEED, new=AsyncMock(return_value=_rows(*seed_rows))):
+            await cache.top(7)
+            for _ in range(2000):
+                user_id = rng.randrange(200)
+                totals[user_id] += rng.randint(1, 5)
+                cache.apply([(7, user_id, totals[user_id])])
+            top = await cache.top(7)
+
+        expected = sorted(totals.values(), reverse=True)[:10]
+        assert [entry.message_count for entry in top] == expected
+        assert all(totals[entry.user_id] == entry.message_count for entry in top)
@@ -0,0 +1,209 @@
+"""Tests for the shared single-pass message analysis and its consumers."""
+
+import logging
+import os
+import re
+import time
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from urllib.parse import urlparse
+
+import pytest
+
+from sources.lib.cogs import music_links
+from sources.lib.utils.message_analysis import _analyze_urls, analyze_content
+
+logger = logging.getLogger(__name__)
+
+
+class TestAnalyzeContent:
+    def test_plain_text_returns_shared_empty_result(self):
+        first = analyze_content('hello there')
+        second = analyze_content('general kenobi')
+        assert first is second
+        assert first.urls == ()
+        assert not first.has_music_links
+
+    def test_same_content_is_cached(self):
+        content = 'see https://example.com/cached'
+        assert analyze_content(content) is analyze_content(content)
+
+    def test_extracts_urls_and_hosts(self):
+        result = analyze_content('a https://Reddit.com/r/x and http://x.com:8080/p')
+        assert [u.parsed.geturl() for u in result.urls] == [
+            'https://Reddit.com/r/x',
+            'http://x.com:8080/p',
+        ]
+        assert result.hosts == frozenset({'reddit.com', 'x.com'})
+
+    def test_wrapped_urls_are_not_standalone(self):
+        result = analyze_content('<https://x.com/a> https://x.com/b')
+        assert [u.standalone for u in result.urls] == [False, True]
+
+    def test_youtube_music_link(self):
+        result = analyze_content('https://music.youtube.com/watch?v=abcdefghijk')
+        assert result.youtube_music_ids == ('abcdefghijk',)
+        assert result.youtube_ids == ()
+
+    def test_youtube_links(self):
+        result = analyze_content(
+            'https://www.youtube.com/watch?list=1&v=abcdefghijk https://youtu.be/ABCDEFGHIJK'
+        )
+        assert result.youtube_ids == ('abcdefghijk', 'ABCDEFGHIJK')
+
+    def test_spotify_track_link(self):
+        result = analyze_content(
+            'https://open.spotify.com/track/4uLU6hMCjMI75M1A2tKUQC'
+        )
+        assert result.spotify_track_ids == ('4uLU6hMCjMI75M1A2tKUQC',)
+        assert result.has_music_links
+
+    def test_malformed_url_is_skipped(self):
+        result = analyze_content('http://[::1 broken')
+        assert result.urls == ()
+
+
+class TestMusicLinksFastPath:
+    @pytest.fixture(autouse=True)
+    def _clear_allowlist_cache(self):
+        music_links._allowlist_cache.clear()
+        music_links._allowlist_generation.clear()
+
+    def _message(self, content: str) -> MagicMock:
+        msg = MagicMock()
+        msg.author = SimpleNamespace(bot=False)
+        msg.guild = SimpleNamespace(id=1)
+        msg.channel = SimpleNamespace(id=100)
+        msg.content = content
+        msg.reply = AsyncMock()
+        return msg
+
+    async def test_no_music_link_skips_allowlist_lookup(self):
+        from sources.lib.cogs.music_links import MusicLinksCog
+
+        cog = MusicLinksCog(MagicMock())
+        with (
+            patch('sources.lib.cogs.music_links.config') as mock_config,
+            patch(
+                'sources.lib.cogs.music_links.get_allowed_channels', new=AsyncMock()
+            ) as mock_allowed,
+        ):
+            mock_config.youtube_api_key = 'key'
+            mock_config.spotify_api_client_id = 'id'
+            await cog.on_message(self._message('https://example.com only'))
+        mock_allowed.assert_not_awaited()
+
+    async def test_youtube_music_takes_priority(self):
+        from sources.lib.cogs.music_links import MusicLinksCog
+
+        cog = MusicLinksCog(MagicMock())
+        cog._youtube_to_spotify = AsyncMock(return_value='https://open.spotify.com/x')
+        content = (
+            'https://youtu.be/AAAAAAAAAAA https://music.youtube.com/watch?v=BBBBBBBBBBB'
+        )
+        with (
+            patch('sources.lib.cogs.music_links.config') as mock_config,
+            patch(
+                'sources.lib.cogs.music_links.get_allowed_channels',
+                new=AsyncMock(return_value=[100]),
+            ),
+        ):
+            mock_config.youtube_api_key = 'key'
+            mock_config.spotify_api_client_id = 'id'
+            await cog.on_message(self._message(content))
+        cog._youtube_to_spotify.assert_awaited_once_with('BBBBBBBBBBB')
+
+
+# ---------------------------------------------------------------------------
+# Benchmark: legacy per-cog scanning vs shared analysis
+# ---------------------------------------------------------------------------
+
+_LEGACY_YT = re.compile(
+    r'https?://(?:www\.)?(?:youtube\.com/watch\?(?:[^&\s]*&)*v=|youtu\.be/)'
+    r'([a-zA-Z0-9_-]{11})'
+)
+_LEGACY_YT_MUSIC = re.compile(
+    r'https?://music\.youtube\.com/watch\?(?:[^&\s]*&)*v=([a-zA-Z0-9_-]{11})'
+)
+_LEGACY_SPOTIFY = re.compile(r'https?://open\.spotify\.com/track/([a-zA-Z0-9]+)')
+
+
+def _legacy_scan(content: str) -> None:
+    """Reproduce the per-message work MessagesCog and MusicLinksCog did before."""
+    for token in content.split():
+        if token.startswith('http://') or token.startswith('https://'):
+            urlparse(token)
+    _LEGACY_YT_MUSIC.search(content)
+    _LEGACY_YT.search(content)
+    _LEGACY_SPOTIFY.search(content)
+
+
+def _shared_scan(content: str) -> None:
+    """Both URL-consuming listeners ask for the analysis of the same message."""
+    analyze_content(content)
+    analyze_content(content)
+
+
+def _measure(scan, corpus: list[str]) -> tuple[float, int]:
+    """Return (seconds, peak bytes allocated) for scanning the corpus once.
+
+    Timing and allocation tracing run as separate passes so tracemalloc
+    overhead does not skew the timing.
+    """
+    _analyze_urls.cache_clear()
+    start = time.perf_counter()
+    for content in corpus:
+        scan(content)
+    elapsed = time.perf_counter() - start
+
+    _analyze_urls.cache_clear()
+    tracemalloc.start()
+    for content in corpus:
+        scan(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+@pytest.mark.skipif(
+    not os.environ.get('RUN_BENCHMARKS'),
+    reason='timing and allocation benchmark; set RUN_BENCHMARKS=1 to run',
+)
+class TestMessageAnalysisBenchmark:
+    """Per-message CPU time and allocations, before and after.
+
+    Results are logged at INFO; run with ``--log-cli-level=INFO`` to see them.
+    """
+
+    def test_url_free_messages_are_cheaper(self):
+        corpus = [
+            f'message number {i} with some ordinary chat text in it, nothing more'
+            for i in range(5000)
+        ]
+        legacy_time, legacy_peak = _measure(_legacy_scan, corpus)
+        shared_time, shared_peak = _measure(_shared_scan, corpus)
+        logger.info(
+            'URL-free: legacy %.2fus / %d B peak, shared %.2fus / %d B peak',
+            legacy_time / len(corpus) * 1e6,
+            legacy_peak,
+            shared_time / len(corpus) * 1e6,
+            shared_peak,
+        )
+        assert shared_peak < legacy_peak
+
+    def test_link_messages(self):
+        corpus = [
+            f'look https://youtu.be/abcdefgh{i % 1000:03d} and https://reddit.com/r/{i}'
+            for i in range(2000)
+        ]
+        legacy_time, legacy_peak = _measure(_legacy_scan, corpus)
+        shared_time, shared_peak = _measure(_shared_scan, corpus)
+        logger.info(
+            'With links: legacy %.2fus / %d B peak, shared %.2fus / %d B peak',
+            legacy_time / len(corpus) * 1e6,
+            legacy_peak,
+            shared_time / len(corpus) * 1e6,
+            shared_peak,
+        )
+        assert all(analyze_content(c).youtube_ids for c in corpus[:10])
@@ -0,0 +1,143 @@
+"""Tests for the write-behind MessageCounter and StatsCog.on_message batching."""
+
+import asyncio
+from datetime import UTC, date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from sources.lib.message_counter import MessageCounter
+
+_DAY = date(2026, 3, 14)
+
+
+class TestMessageCounter:
+    async def test_add_aggregates_same_key(self):
+        counter = MessageCounter()
+        counter.add(1, 10, _DAY)
+        counter.add(1, 10, _DAY)
+        counter.add(1, 11, _DAY)
+        with patch(
+            'sources.lib.message_counter.add_daily_message_counts', new=AsyncMock()
+        ) as mock_add:
+            written = await counter.flush()
+        mock_add.assert_awaited_once_with({(1, 10, _DAY): 2, (1, 11, _DAY): 1})
+        assert written == 2
+        assert len(counter) == 0
+
+    async def test_flush_empty_buffer_is_noop(self):
+        counter = MessageCounter()
+        with patch(
+            'sources.lib.message_counter.add_daily_message_counts', new=AsyncMock()
+        ) as mock_add:
+            assert await counter.flush() == 0
+        mock_add.assert_not_awaited()
+
+    async def test_size_trigger_schedules_flush(self):
+        counter = MessageCounter(max_pending=2)
+        with patch(
+            'sources.lib.message_counter.add_daily_message_counts', new=AsyncMock()
+        ) as mock_add:
+            counter.add(1, 10, _DAY)
+            mock_add.assert_not_awaited()
+            counter.add(1, 11, _DAY)
+            await asyncio.sleep(0)
+        mock_add.assert_awaited_once_with({(1, 10, _DAY): 1, (1, 11, _DAY): 1})
+
+    async def test_transient_error_requeues_batch(self):
+        counter = MessageCounter()
+        counter.add(1, 10, _DAY, delta=3)
+        error = OperationalError('stmt', {}, Exception('connection lost'))
+        with patch(
+            'sources.lib.message_counter.add_daily_message_counts',
+            new=AsyncMock(side_effect=error),
+        ):
+            assert await counter.flush() == 0
+        counter.add(1, 10, _DAY)
+        with patch(
+            'sources.lib.message_counter.add_daily_message_counts', new=AsyncMock()
+        ) as mock_add:
+            await counter.flush()
+        mock_add.assert_awaited_once_with({(1, 10, _DAY): 4})
+
+    async def test_requeue_drops_oldest_days_beyond_cap(self):
+        counter = MessageCounter(max_buffered=2)
+        counter.add(1, 10, date(2026, 3, 12))
+        counter.add(1, 11, _DAY)
+        counter.add(1, 12, date(2026, 3, 13))
+        error = OperationalError('stmt', {}, Exception('connection lost'))
+        with patch(
+            'sources.lib.message_counter.add_daily_message_counts',
+            new=AsyncMock(side_effect=error),
+        ):
+            await counter.flush()
+        assert len(counter) == 2
+
+        with patch(
+            'sources.lib.message_counter.add_daily_message_counts', new=AsyncMock()
+        ) as mock_add:
+            await counter.flush()
+        mock_add.assert_awaited_once_with(
+            {(1, 11, _DAY): 1, (1, 12, date(2026, 3, 13)): 1}
+        )
+
+    async def test_flush_feeds_new_totals_to_leaderboard(self):
+        counter = MessageCounter()
+        counter.add(1, 10, _DAY)
+        with (
+            patch(
+                'sources.lib.message_counter.add_daily_message_counts',
+                new=AsyncMock(return_value=[(1, 10, 42)]),
+            ),
+            patch('sources.lib.message_counter.leaderboards') as mock_boards,
+        ):
+            await counter.flush()
+        mock_boards.apply.assert_called_once_with([(1, 10, 42)])
+
+    async def test_days_are_counted_separately(self):
+        counter = MessageCounter()
+        counter.add(1, 10, _DAY)
+        counter.add(1, 10, date(2026, 3, 15))
+        assert len(counter) == 2
+
+    async def test_integrity_error_drops_batch(self):
+        counter = MessageCounter()
+        counter.add(1, 10, _DAY)
+        error = IntegrityError('stmt', {}, Exception('fk violation'))
+        with patch(
+            'sources.lib.message_counter.add_daily_message_counts',
+            new=AsyncMock(side_effect=error),
+        ):
+            await counter.flush()
+        assert len(counter) == 0
+
+
+class TestStatsCogOnMessage:
+    def _message(self, *, bot: bool = False, guild_id: int | None = 1):
+        return SimpleNamespace(
+            author=SimpleNamespace(id=10, bot=bot),
+            guild=SimpleNamespace(id=guild_id) if guild_id is not None else None,
+            created_at=datetime(2026, 3, 14, 23, 59, tzinfo=UTC),
+        )
+
+    async def test_buffers_instead_of_writing(self):
+        from sources.lib.cogs.stats import StatsCog
+
+        cog = StatsCog(MagicMock())
+        with patch(
+            'sources.lib.message_counter.add_daily_message_counts', new=AsyncMock()
+        ) as mock_add:
+            await cog.on_message(self._message())
+            await cog.on_message(self._message())
+            mock_add.assert_not_awaited()
+            await cog.cog_unload()
+        mock_add.assert_awaited_once_with({(1, 10, _DAY): 2})
+
+    async def test_ignores_bots_and_dms(self):
+        from sources.lib.cogs.stats import StatsCog
+
+        cog = StatsCog(MagicMock())
+        await cog.on_message(self._message(bot=True))
+        await cog.on_message(self._message(guild_id=None))
+        assert len(cog._counter) == 0
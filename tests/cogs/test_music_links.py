@@ -0,0 +1,184 @@
+"""Tests for the music links allowlist cache and track resolution."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from sources.lib.cogs import music_links
+from sources.lib.cogs.music_links import (
+    MusicLinksCog,
+    get_allowed_channel_set,
+    invalidate_allowed_channels,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_allowlist_cache():
+    music_links._allowlist_cache.clear()
+    music_links._allowlist_generation.clear()
+
+
+def _interaction(guild_id: int = 1) -> MagicMock:
+    interaction = MagicMock()
+    interaction.guild_id = guild_id
+    interaction.response.send_message = AsyncMock()
+    return interaction
+
+
+class TestAllowlistCache:
+    async def test_loads_once_per_guild(self):
+        with patch(
+            'sources.lib.cogs.music_links.get_allowed_channels',
+            new=AsyncMock(return_value=[100, 200]),
+        ) as mock_get:
+            first = await get_allowed_channel_set(1)
+            second = await get_allowed_channel_set(1)
+
+        assert first == frozenset({100, 200})
+        assert first is second
+        mock_get.assert_awaited_once_with(1)
+
+    async def test_empty_allowlist_is_cached(self):
+        with patch(
+            'sources.lib.cogs.music_links.get_allowed_channels',
+            new=AsyncMock(return_value=[]),
+        ) as mock_get:
+            await get_allowed_channel_set(1)
+            await get_allowed_channel_set(1)
+
+        mock_get.assert_awaited_once()
+
+    async def test_invalidate_forces_reload(self):
+        with patch(
+            'sources.lib.cogs.music_links.get_allowed_channels',
+            new=AsyncMock(side_effect=[[100], [100, 200]]),
+        ):
+            await get_allowed_channel_set(1)
+            invalidate_allowed_channels(1)
+            allowed = await get_allowed_channel_set(1)
+
+        assert allowed == frozenset({100, 200})
+
+    async def test_load_racing_invalidation_is_not_cached(self):
+        async def _load(guild_id):
+            invalidate_allowed_channels(guild_id)
+            return [100]
+
+        with patch(
+            'sources.lib.cogs.music_links.get_allowed_channels', side_effect=_load
+        ):
+            await get_allowed_channel_set(1)
+
+        assert 1 not in music_links._allowlist_cache
+
+    @pytest.mark.parametrize(
+        ('command', 'operation'),
+        [
+            ('channel_add', 'add_allowed_channel'),
+            ('channel_remove', 'remove_allowed_channel'),
+        ],
+    )
+    async def test_commands_invalidate_cache(self, command, operation):
+        music_links._allowlist_cache[1] = frozenset({100})
+        cog = MusicLinksCog(MagicMock())
+        channel = SimpleNamespace(id=200, mention='#music')
+
+        with patch(
+            f'sources.lib.cogs.music_links.{operation}',
+            new=AsyncMock(return_value=True),
+        ):
+            await getattr(cog, command).callback(cog, _interaction(), channel)
+
+        assert 1 not in music_links._allowlist_cache
+
+
+def _json_response(status: int, payload: dict) -> MagicMock:
+    resp = MagicMock()
+    resp.status = status
+    resp.json = AsyncMock(return_value=payload)
+    ctx = MagicMock()
+    ctx.__aenter__ = AsyncMock(return_value=resp)
+    ctx.__aexit__ = AsyncMock(return_value=False)
+    return ctx
+
+
+class TestTrackResolutionCaching:
+    def _cog(self, *responses) -> MusicLinksCog:
+        cog = MusicLinksCog(MagicMock())
+        cog._session = MagicMock()
+        cog._session.get = MagicMock(side_effect=list(responses))
+        cog._spotify = SimpleNamespace(get_token=AsyncMock(return_value='token'))
+        cog._tracks = SimpleNamespace(get=AsyncMock(return_value=None), put=AsyncMock())
+        return cog
+
+    async def test_cached_match_skips_api(self):
+        from sources.lib.track_cache import TrackMatch
+
+        cog = self._cog()
+        cog._tracks.get.return_value = TrackMatch('abc')
+
+        assert await cog._youtube_to_spotify('vid') == (
+            'https://open.spotify.com/track/abc'
+        )
+        cog._session.get.assert_not_called()
+
+    async def test_cached_negative_skips_api(self):
+        from sources.lib.track_cache import TrackMatch
+
+        cog = self._cog()
+        cog._tracks.get.return_value = TrackMatch(None)
+
+        assert await cog._spotify_to_youtube('track') is None
+        cog._session.get.assert_not_called()
+
+    async def test_resolved_match_is_stored(self):
+        cog = self._cog(
+            _json_response(
+                200,
+                {'items': [{'snippet': {'title': 'Song', 'categoryId': '10'}}]},
+            ),
+            _json_response(200, {'tracks': {'items': [{'id': 'abc'}]}}),
+        )
+
+        assert await cog._youtube_to_spotify('vid') == (
+            'https://open.spotify.com/track/abc'
+        )
+        cog._tracks.put.assert_awaited_once_with('youtube', 'vid', 'abc')
+
+    async def test_no_match_is_stored_as_negative(self):
+        cog = self._cog(
+            _json_response(200, {'artists': [{'name': 'A'}], 'name': 'B'}),
+            _json_response(200, {'items': []}),
+        )
+
+        assert await cog._spotify_to_youtube('track') is None
+        cog._tracks.put.assert_awaited_once_with('spotify', 'track', None)
+
+    async def test_api_failure_is_not_cached(self):
+        cog = self._cog(_json_response(500, {}))
+
+        assert await cog._youtube_to_spotify('vid') is None
+        cog._tracks.put.assert_not_awaited()
+
+    async def test_concurrent_lookups_for_same_track_are_coalesced(self):
+        cog = self._cog()
+        release = asyncio.Event()
+
+        async def _find(video_id):
+            await release.wait()
+            return 'abc'
+
+        cog._find_spotify_track = AsyncMock(side_effect=_find)
+        waiters = [
+            asyncio.ensure_future(cog._youtube_to_spotify('vid')) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert (
+            await asyncio.gather(*waiters) == ['https://open.spotify.com/track/abc'] * 3
+        )
+        cog._find_spotify_track.assert_awaited_once_with('vid')
+        cog._tracks.put.assert_awaited_once_with('youtube', 'vid', 'abc')
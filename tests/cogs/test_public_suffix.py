@@ -0,0 +1,72 @@
+"""Tests for the offline public suffix matcher."""
+
+import socket
+from unittest.mock import patch
+
+import pytest
+
+from sources.lib.cogs.domain_fixer import _normalize_source_domain
+from sources.lib.utils.public_suffix import (
+    DomainParts,
+    PublicSuffixMatcher,
+    public_suffixes,
+)
+
+
+class TestPublicSuffixMatcher:
+    @pytest.mark.parametrize(
+        ('host', 'expected'),
+        [
+            ('reddit.com', ('', 'reddit', 'com')),
+            ('www.reddit.com', ('www', 'reddit', 'com')),
+            ('old.reddit.co.uk', ('old', 'reddit', 'co.uk')),
+            ('vm.tiktok.com', ('vm', 'tiktok', 'com')),
+            ('example.com.', ('', 'example', 'com')),
+            ('WWW.Reddit.COM', ('WWW', 'Reddit', 'COM')),
+            ('co.uk', ('', '', 'co.uk')),
+            ('localhost', ('', 'localhost', '')),
+            ('127.0.0.1', ('', '127.0.0.1', '')),
+            ('xn--80ak6aa92e.xn--p1ai', ('', 'xn--80ak6aa92e', 'xn--p1ai')),
+        ],
+    )
+    def test_split_bundled_snapshot(self, host, expected):
+        assert tuple(public_suffixes.split(host)) == expected
+
+    def test_private_section_is_ignored(self):
+        # github.io is a private-section rule; the ICANN-only default treats io as the suffix.
+        assert public_suffixes.split('user.github.io') == DomainParts(
+            'user', 'github', 'io'
+        )
+
+    def test_snapshot_build_makes_no_network_calls(self):
+        with patch.object(socket.socket, 'connect', side_effect=OSError) as connect:
+            matcher = PublicSuffixMatcher.from_snapshot()
+        connect.assert_not_called()
+        assert matcher.split('old.reddit.co.uk').suffix == 'co.uk'
+
+    def test_wildcard_and_exception_rules(self):
+        matcher = PublicSuffixMatcher(['ck', '*.ck', '!www.ck'])
+        assert matcher.split('foo.bar.ck') == DomainParts('', 'foo', 'bar.ck')
+        assert matcher.split('www.ck') == DomainParts('', 'www', 'ck')
+        assert matcher.split('a.www.ck') == DomainParts('a', 'www', 'ck')
+
+    def test_top_domain_and_fqdn(self):
+        parts = DomainParts('www', 'reddit', 'com')
+        assert parts.top_domain_under_public_suffix == 'reddit.com'
+        assert parts.fqdn == 'www.reddit.com'
+        assert DomainParts('', '', 'co.uk').top_domain_under_public_suffix == ''
+
+
+class TestNormalizeSourceDomain:
+    @pytest.mark.parametrize(
+        ('raw', 'expected'),
+        [
+            ('reddit.com', 'reddit.com'),
+            ('www.reddit.com', 'reddit.com'),
+            ('https://www.reddit.com/r/python/', 'reddit.com'),
+            ('bbc.co.uk', 'bbc.co.uk'),
+            ('localhost', 'localhost'),
+        ],
+    )
+    def test_normalizes_to_registrable_domain(self, raw, expected):
+        assert _normalize_source_domain(raw) == expected
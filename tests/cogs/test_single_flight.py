@@ -0,0 +1,93 @@
+"""Tests for the single-flight request coalescing utility."""
+
+import asyncio
+
+import pytest
+
+from sources.lib.utils.metrics import single_flight_coalesced
+from sources.lib.utils.single_flight import SingleFlight
+
+
+def _coalesced(name: str) -> float:
+    return single_flight_coalesced.labels(name=name)._value.get()
+
+
+class TestSingleFlight:
+    async def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight('test_share')
+        release = asyncio.Event()
+        calls = 0
+
+        async def _work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 'result'
+
+        before = _coalesced('test_share')
+        waiters = [asyncio.ensure_future(flight.do('k', _work)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ['result'] * 3
+        assert calls == 1
+        assert _coalesced('test_share') - before == 2
+        assert len(flight) == 0
+
+    async def test_different_keys_run_independently(self):
+        flight = SingleFlight('test_keys')
+
+        async def _work(value):
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(
+            flight.do('a', lambda: _work(1)), flight.do('b', lambda: _work(2))
+        )
+        assert results == [1, 2]
+
+    async def test_sequential_calls_are_not_coalesced(self):
+        flight = SingleFlight('test_sequential')
+        calls = 0
+
+        async def _work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do('k', _work) == 1
+        assert await flight.do('k', _work) == 2
+
+    async def test_exception_reaches_every_waiter(self):
+        flight = SingleFlight('test_error')
+        release = asyncio.Event()
+
+        async def _work():
+            await release.wait()
+            raise ValueError('boom')
+
+        waiters = [asyncio.ensure_future(flight.do('k', _work)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+        assert len(flight) == 0
+
+    async def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        flight = SingleFlight('test_cancel')
+        release = asyncio.Event()
+
+        async def _work():
+            await release.wait()
+            return 'done'
+
+        first = asyncio.ensure_future(flight.do('k', _work))
+        second = asyncio.ensure_future(flight.do('k', _work))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == 'done'
@@ -1,5 +1,6 @@
 """Tests for clean_yt_title, _SpotifyToken, and SpotifyClient."""
 
+import asyncio
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock
 
@@ -142,6 +143,26 @@ class TestSpotifyClientGetToken:
         result = await client.get_token()
         assert result is None
 
+    async def test_concurrent_refreshes_share_one_request(self):
+        release = asyncio.Event()
+
+        async def _json():
+            await release.wait()
+            return {'access_token': 'tok', 'expires_in': 3600}
+
+        ctx = _http_ctx(200, {})
+        ctx.__aenter__.return_value.json = _json
+        session = MagicMock()
+        session.post.return_value = ctx
+        client = SpotifyClient(session)
+
+        waiters = [asyncio.ensure_future(client.get_token()) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ['tok'] * 5
+        session.post.assert_called_once()
+
 
 class TestSpotifyClientResolveTrack:
     def _client(self, search_status: int, search_data: dict) -> SpotifyClient:
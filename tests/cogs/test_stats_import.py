@@ -0,0 +1,157 @@
+"""Tests for the concurrent /stats import engine."""
+
+import asyncio
+from datetime import UTC, date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+import pytest
+
+from sources.lib.cogs.stats import StatsCog
+
+_OPS = 'sources.lib.cogs.stats'
+
+
+def _d(day: int) -> date:
+    return date(2026, 3, day)
+
+
+class _Channel:
+    """Text channel stub whose history yields a fixed list of messages."""
+
+    active = 0
+    peak = 0
+
+    def __init__(self, channel_id: int, authors: list[int], error=None) -> None:
+        self.id = channel_id
+        self.name = f'channel-{channel_id}'
+        self._authors = authors
+        self._error = error
+        self.history_after = 'unset'
+        self.last_message_id = channel_id * 1000 + len(authors) if authors else None
+
+    def permissions_for(self, member):
+        return SimpleNamespace(read_message_history=True)
+
+    async def history(self, limit, oldest_first, after):
+        self.history_after = after
+        _Channel.active += 1
+        _Channel.peak = max(_Channel.peak, _Channel.active)
+        try:
+            await asyncio.sleep(0.01)
+            if self._error is not None:
+                raise self._error
+            for offset, author_id in enumerate(self._authors, start=1):
+                yield SimpleNamespace(
+                    id=self.id * 1000 + offset,
+                    author=SimpleNamespace(id=author_id, bot=False),
+                    created_at=datetime(2026, 3, offset, tzinfo=UTC),
+                )
+        finally:
+            _Channel.active -= 1
+
+
+@pytest.fixture(autouse=True)
+def _reset_channel_stats():
+    _Channel.active = 0
+    _Channel.peak = 0
+
+
+@pytest.fixture
+def ops():
+    with (
+        patch(f'{_OPS}.get_channel_progress', new=AsyncMock(return_value=None)) as get,
+        patch(f'{_OPS}.save_channel_progress', new=AsyncMock()) as save,
+        patch(f'{_OPS}.save_import_checkpoint', new=AsyncMock()) as checkpoint,
+    ):
+        yield SimpleNamespace(get=get, save=save, checkpoint=checkpoint)
+
+
+def _guild(channels: list[_Channel]) -> SimpleNamespace:
+    return SimpleNamespace(id=1, name='Guild', me=object(), text_channels=channels)
+
+
+class TestRunImport:
+    async def test_channels_are_paged_concurrently_up_to_limit(self, ops):
+        channels = [_Channel(i, [7]) for i in range(1, 7)]
+        cog = StatsCog(MagicMock())
+
+        with patch(f'{_OPS}.config', SimpleNamespace(stats_import_concurrency=3)):
+            await cog._run_import(_guild(channels), since_dt=None)
+
+        assert _Channel.peak == 3
+        completed = {c.args[1] for c in ops.checkpoint.await_args_list if c.args[4]}
+        assert completed == {c.id for c in channels}
+
+    async def test_resumes_from_checkpoint_and_skips_completed(self, ops):
+        done, partial, fresh = _Channel(1, [7]), _Channel(2, [7]), _Channel(3, [7])
+        ops.get.side_effect = lambda guild_id, channel_id: {
+            1: SimpleNamespace(is_completed=True, last_message_id=10),
+            2: SimpleNamespace(is_completed=False, last_message_id=2500),
+        }.get(channel_id)
+        since = object()
+        cog = StatsCog(MagicMock())
+
+        with patch(f'{_OPS}.config', SimpleNamespace(stats_import_concurrency=4)):
+            await cog._run_import(_guild([done, partial, fresh]), since_dt=since)
+
+        assert done.history_after == 'unset'
+        assert partial.history_after.id == 2500
+        assert fresh.history_after is since
+
+    async def test_counts_and_progress_share_one_checkpoint(self, ops):
+        channel = _Channel(1, [7, 8, 7])
+        cog = StatsCog(MagicMock())
+
+        with patch(f'{_OPS}.config', SimpleNamespace(stats_import_concurrency=2)):
+            await cog._run_import(_guild([channel]), since_dt=None)
+
+        ops.checkpoint.assert_awaited_once_with(
+            1, 1, {(7, _d(1)): 1, (8, _d(2)): 1, (7, _d(3)): 1}, 1003, True
+        )
+        ops.save.assert_not_awaited()
+
+    async def test_checkpoint_interval_adapts_to_message_count(self, ops):
+        channel = _Channel(1, [7, 8, 7, 8, 7])
+        cog = StatsCog(MagicMock())
+
+        with (
+            patch(f'{_OPS}.config', SimpleNamespace(stats_import_concurrency=1)),
+            patch(f'{_OPS}._CHECKPOINT_MAX_MESSAGES', 2),
+        ):
+            await cog._run_import(_guild([channel]), since_dt=None)
+
+        assert [c.args[2:] for c in ops.checkpoint.await_args_list] == [
+            ({(7, _d(1)): 1, (8, _d(2)): 1}, 1002, False),
+            ({(7, _d(3)): 1, (8, _d(4)): 1}, 1004, False),
+            ({(7, _d(5)): 1}, 1005, True),
+        ]
+
+    async def test_checkpoint_interval_adapts_to_elapsed_time(self, ops):
+        channel = _Channel(1, [7, 8, 9])
+        cog = StatsCog(MagicMock())
+        ticks = iter([0.0, 1.0, 20.0, 21.0, 22.0])
+        clock = SimpleNamespace(monotonic=lambda: next(ticks))
+
+        with (
+            patch(f'{_OPS}.config', SimpleNamespace(stats_import_concurrency=1)),
+            patch(f'{_OPS}.time', clock),
+        ):
+            await cog._run_import(_guild([channel]), since_dt=None)
+
+        assert [c.args[2:] for c in ops.checkpoint.await_args_list] == [
+            ({(7, _d(1)): 1, (8, _d(2)): 1}, 1002, False),
+            ({(9, _d(3)): 1}, 1003, True),
+        ]
+
+    async def test_forbidden_channel_is_marked_done(self, ops):
+        forbidden = discord.Forbidden(MagicMock(status=403), 'no access')
+        channels = [_Channel(1, [], error=forbidden), _Channel(2, [7])]
+        cog = StatsCog(MagicMock())
+
+        with patch(f'{_OPS}.config', SimpleNamespace(stats_import_concurrency=2)):
+            await cog._run_import(_guild(channels), since_dt=None)
+
+        ops.save.assert_awaited_once_with(1, 1, None, True)
+        ops.checkpoint.assert_awaited_once_with(1, 2, {(7, _d(1)): 1}, 2001, True)
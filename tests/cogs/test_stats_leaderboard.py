@@ -0,0 +1,75 @@
+"""Tests for /stats leaderboard windows and the bucket roll-up loop."""
+
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from discord import app_commands
+
+from sources.lib.cogs.stats import StatsCog
+
+_OPS = 'sources.lib.cogs.stats'
+
+
+def _interaction() -> MagicMock:
+    interaction = MagicMock()
+    interaction.guild_id = 1
+    interaction.guild.get_member.return_value = SimpleNamespace(display_name='Alice')
+    interaction.response.send_message = AsyncMock()
+    return interaction
+
+
+class TestLeaderboardWindow:
+    async def test_default_is_all_time(self):
+        cog = StatsCog(MagicMock())
+        interaction = _interaction()
+        rows = [SimpleNamespace(user_id=5, message_count=1234)]
+        with (
+            patch(f'{_OPS}.leaderboards.top', new=AsyncMock(return_value=rows)),
+            patch(f'{_OPS}.get_windowed_leaderboard', new=AsyncMock()) as windowed,
+        ):
+            await cog.leaderboard.callback(cog, interaction)
+
+        windowed.assert_not_awaited()
+        embed = interaction.response.send_message.await_args.kwargs['embed']
+        assert embed.title == 'Message Leaderboard'
+        assert embed.description == '1. **Alice** — 1,234'
+
+    async def test_week_window_queries_last_seven_days(self):
+        cog = StatsCog(MagicMock())
+        interaction = _interaction()
+        rows = [SimpleNamespace(user_id=5, message_count=3)]
+        window = app_commands.Choice(name='Last 7 days', value='week')
+        with patch(
+            f'{_OPS}.get_windowed_leaderboard', new=AsyncMock(return_value=rows)
+        ) as windowed:
+            await cog.leaderboard.callback(cog, interaction, window)
+
+        today = datetime.now(tz=UTC).date()
+        windowed.assert_awaited_once_with(1, today - timedelta(days=6), limit=10)
+        embed = interaction.response.send_message.await_args.kwargs['embed']
+        assert embed.title == 'Message Leaderboard — Last 7 days'
+
+    async def test_empty_window_has_its_own_message(self):
+        cog = StatsCog(MagicMock())
+        interaction = _interaction()
+        window = app_commands.Choice(name='Today', value='day')
+        with patch(f'{_OPS}.get_windowed_leaderboard', new=AsyncMock(return_value=[])):
+            await cog.leaderboard.callback(cog, interaction, window)
+
+        interaction.response.send_message.assert_awaited_once_with(
+            'No messages counted for today yet.', ephemeral=True
+        )
+
+
+class TestRollUpLoop:
+    async def test_rolls_up_days_past_retention(self):
+        cog = StatsCog(MagicMock())
+        with patch(
+            f'{_OPS}.roll_up_daily_buckets', new=AsyncMock(return_value=0)
+        ) as roll_up:
+            await cog._roll_up_buckets()
+
+        (cutoff,) = roll_up.await_args.args
+        assert isinstance(cutoff, date)
+        assert cutoff == datetime.now(tz=UTC).date() - timedelta(days=62)
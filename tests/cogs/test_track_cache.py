@@ -0,0 +1,91 @@
+"""Tests for the two-tier music track resolution cache."""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from sources.lib.track_cache import TrackMatch, TrackResolutionCache
+
+_GET = 'sources.lib.track_cache.get_track_resolution'
+_SAVE = 'sources.lib.track_cache.save_track_resolution'
+
+
+@pytest.fixture
+def db():
+    with (
+        patch(_GET, new=AsyncMock(return_value=None)) as get,
+        patch(_SAVE, new=AsyncMock()) as save,
+    ):
+        yield SimpleNamespace(get=get, save=save)
+
+
+class TestTrackResolutionCache:
+    async def test_put_then_get_is_served_from_memory(self, db):
+        cache = TrackResolutionCache()
+        await cache.put('youtube', 'vid', 'track')
+
+        assert await cache.get('youtube', 'vid') == TrackMatch('track')
+        db.save.assert_awaited_once_with('youtube', 'vid', 'track')
+        db.get.assert_not_awaited()
+
+    async def test_negative_result_is_cached(self, db):
+        cache = TrackResolutionCache()
+        await cache.put('spotify', 'track', None)
+
+        assert await cache.get('spotify', 'track') == TrackMatch(None)
+
+    async def test_miss_falls_through_to_database(self, db):
+        cache = TrackResolutionCache()
+
+        assert await cache.get('youtube', 'vid') is None
+        db.get.assert_awaited_once_with('youtube', 'vid')
+
+    async def test_fresh_database_row_is_promoted(self, db):
+        db.get.return_value = SimpleNamespace(
+            target_id='track', resolved_at=datetime.now(tz=UTC) - timedelta(days=1)
+        )
+        cache = TrackResolutionCache()
+
+        assert await cache.get('youtube', 'vid') == TrackMatch('track')
+        assert await cache.get('youtube', 'vid') == TrackMatch('track')
+        db.get.assert_awaited_once()
+
+    async def test_stale_negative_database_row_is_ignored(self, db):
+        db.get.return_value = SimpleNamespace(
+            target_id=None, resolved_at=datetime.now(tz=UTC) - timedelta(days=2)
+        )
+        cache = TrackResolutionCache(miss_ttl=timedelta(days=1))
+
+        assert await cache.get('youtube', 'vid') is None
+
+    async def test_expired_memory_entry_is_dropped(self, db):
+        cache = TrackResolutionCache(miss_ttl=timedelta(seconds=10))
+        with patch('sources.lib.track_cache.time.monotonic', return_value=100.0):
+            await cache.put('youtube', 'vid', None)
+        with patch('sources.lib.track_cache.time.monotonic', return_value=110.0):
+            assert await cache.get('youtube', 'vid') is None
+        assert len(cache) == 0
+
+    async def test_least_recently_used_entry_is_evicted(self, db):
+        cache = TrackResolutionCache(max_entries=2)
+        await cache.put('youtube', 'a', '1')
+        await cache.put('youtube', 'b', '2')
+        await cache.get('youtube', 'a')
+        await cache.put('youtube', 'c', '3')
+
+        assert len(cache) == 2
+        assert await cache.get('youtube', 'b') is None
+        assert await cache.get('youtube', 'a') == TrackMatch('1')
+
+    async def test_database_errors_are_tolerated(self, db):
+        error = OperationalError('SELECT 1', {}, Exception('down'))
+        db.get.side_effect = error
+        db.save.side_effect = error
+        cache = TrackResolutionCache()
+
+        assert await cache.get('youtube', 'vid') is None
+        await cache.put('youtube', 'vid', 'track')
+        assert await cache.get('youtube', 'vid') == TrackMatch('track')
@@ -0,0 +1,117 @@
+"""Tests for the batched, cached user-name resolver."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+
+from sources.lib.utils.user_names import UserNameResolver
+
+
+def _client(users: dict[int, str] | None = None) -> MagicMock:
+    """Return a client whose cache is empty and whose REST fetch knows users."""
+    users = users or {}
+    client = MagicMock()
+    client.get_user.return_value = None
+
+    async def fetch_user(user_id):
+        if user_id not in users:
+            raise discord.NotFound(MagicMock(status=404), 'Unknown User')
+        return SimpleNamespace(display_name=users[user_id])
+
+    client.fetch_user = AsyncMock(side_effect=fetch_user)
+    return client
+
+
+def _guild(members: dict[int, str]) -> MagicMock:
+    guild = MagicMock()
+    guild.get_member.side_effect = lambda user_id: (
+        SimpleNamespace(display_name=members[user_id]) if user_id in members else None
+    )
+    return guild
+
+
+class TestUserNameResolver:
+    async def test_prefers_member_then_client_cache(self):
+        client = _client()
+        client.get_user.side_effect = lambda user_id: (
+            SimpleNamespace(display_name='cached') if user_id == 2 else None
+        )
+        names = await UserNameResolver().resolve(client, _guild({1: 'Nick'}), [1, 2])
+
+        assert names == {1: 'Nick', 2: 'cached'}
+        client.fetch_user.assert_not_awaited()
+
+    async def test_fetches_missing_users_once_and_caches(self):
+        client = _client({3: 'Carol', 4: 'Dave'})
+        resolver = UserNameResolver()
+
+        first = await resolver.resolve(client, None, [3, 4, 3])
+        second = await resolver.resolve(client, None, [4, 3])
+
+        assert first == {3: 'Carol', 4: 'Dave'}
+        assert second == first
+        assert client.fetch_user.await_count == 2
+
+    async def test_fetches_run_concurrently_within_limit(self):
+        in_flight = peak = 0
+
+        async def fetch_user(user_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return SimpleNamespace(display_name=str(user_id))
+
+        client = _client()
+        client.fetch_user = AsyncMock(side_effect=fetch_user)
+        names = await UserNameResolver(max_concurrent=3).resolve(
+            client, None, range(10)
+        )
+
+        assert names == {i: str(i) for i in range(10)}
+        assert peak == 3
+
+    async def test_not_found_is_cached_as_unknown(self):
+        client = _client()
+        resolver = UserNameResolver()
+
+        assert await resolver.resolve(client, None, [7]) == {7: 'Unknown user (7)'}
+        await resolver.resolve(client, None, [7])
+        client.fetch_user.assert_awaited_once()
+
+    async def test_transient_errors_are_not_cached(self):
+        client = _client()
+        client.fetch_user = AsyncMock(
+            side_effect=discord.HTTPException(MagicMock(status=500), 'boom')
+        )
+        resolver = UserNameResolver()
+
+        assert await resolver.resolve(client, None, [8]) == {8: 'Unknown user (8)'}
+        await resolver.resolve(client, None, [8])
+        assert client.fetch_user.await_count == 2
+
+    async def test_entries_expire_after_ttl(self):
+        clock = SimpleNamespace(monotonic=lambda: 0.0)
+        client = _client({9: 'Ivy'})
+        resolver = UserNameResolver(ttl=60)
+
+        with patch('sources.lib.utils.user_names.time', clock):
+            await resolver.resolve(client, None, [9])
+            clock.monotonic = lambda: 59.0
+            await resolver.resolve(client, None, [9])
+            clock.monotonic = lambda: 60.0
+            await resolver.resolve(client, None, [9])
+
+        assert client.fetch_user.await_count == 2
+
+    async def test_cache_is_bounded(self):
+        client = _client({1: 'a', 2: 'b', 3: 'c'})
+        resolver = UserNameResolver(max_entries=2)
+
+        await resolver.resolve(client, None, [1, 2, 3])
+        await resolver.resolve(client, None, [1])
+
+        assert client.fetch_user.await_count == 4
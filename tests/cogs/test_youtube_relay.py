@@ -1,6 +1,11 @@
-"""Tests for YouTube relay pure business logic."""
+"""Tests for YouTube relay business logic and polling."""
 
+import asyncio
 from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+import pytest
 
 from sources.lib.cogs.youtube_relay import (
     YouTubeRelayCog,
@@ -185,3 +190,224 @@ class TestRoutingSummary:
         relays = [_relay(discord_channel_id=100, post_videos=True)]
         result = YouTubeRelayCog._routing_summary(relays, guild)
         assert len(result.splitlines()) == 3
+
+
+_COG = 'sources.lib.cogs.youtube_relay'
+
+
+class TestPollAll:
+    def _cog(self, relays: list[SimpleNamespace]):
+        cog = YouTubeRelayCog(MagicMock())
+        cog._check_live_sessions = AsyncMock()
+        self.active = 0
+        self.peak = 0
+        self.calls: list[tuple[str, list[int]]] = []
+
+        async def poll(yt_channel_id, channel_relays, active_live_ids):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                await asyncio.sleep(0.01)
+                if yt_channel_id == 'broken':
+                    raise RuntimeError('feed exploded')
+                self.calls.append((yt_channel_id, [r.id for r in channel_relays]))
+            finally:
+                self.active -= 1
+
+        cog._poll_youtube_channel = poll
+        return cog
+
+    def _patches(self, relays, concurrency: int, jitter: float = 0.0):
+        return (
+            patch(f'{_COG}.get_all_relays', new=AsyncMock(return_value=relays)),
+            patch(f'{_COG}.get_all_live_sessions', new=AsyncMock(return_value=[])),
+            patch(
+                f'{_COG}.config',
+                SimpleNamespace(
+                    youtube_relay_poll_concurrency=concurrency,
+                    youtube_relay_poll_jitter_seconds=jitter,
+                ),
+            ),
+        )
+
+    async def test_channels_are_polled_concurrently_up_to_limit(self):
+        relays = [SimpleNamespace(id=i, yt_channel_id=f'UC{i}') for i in range(6)]
+        cog = self._cog(relays)
+        relays_patch, sessions_patch, config_patch = self._patches(relays, 3)
+
+        with relays_patch, sessions_patch, config_patch:
+            await cog._poll_all()
+
+        assert self.peak == 3
+        assert {channel for channel, _ in self.calls} == {f'UC{i}' for i in range(6)}
+        cog._check_live_sessions.assert_awaited_once()
+
+    async def test_relays_of_one_channel_stay_in_one_task(self):
+        relays = [
+            SimpleNamespace(id=1, yt_channel_id='UCa'),
+            SimpleNamespace(id=2, yt_channel_id='UCb'),
+            SimpleNamespace(id=3, yt_channel_id='UCa'),
+        ]
+        cog = self._cog(relays)
+        relays_patch, sessions_patch, config_patch = self._patches(relays, 4)
+
+        with relays_patch, sessions_patch, config_patch:
+            await cog._poll_all()
+
+        assert sorted(self.calls) == [('UCa', [1, 3]), ('UCb', [2])]
+
+    async def test_failing_channel_does_not_stop_others(self):
+        relays = [
+            SimpleNamespace(id=1, yt_channel_id='broken'),
+            SimpleNamespace(id=2, yt_channel_id='UCok'),
+        ]
+        cog = self._cog(relays)
+        relays_patch, sessions_patch, config_patch = self._patches(relays, 2)
+
+        with relays_patch, sessions_patch, config_patch:
+            await cog._poll_all()
+
+        assert self.calls == [('UCok', [2])]
+        cog._check_live_sessions.assert_awaited_once()
+
+    async def test_each_channel_waits_a_random_jitter(self):
+        relays = [SimpleNamespace(id=i, yt_channel_id=f'UC{i}') for i in range(2)]
+        cog = self._cog(relays)
+        uniform = MagicMock(return_value=0.0)
+        relays_patch, sessions_patch, config_patch = self._patches(relays, 2, 3.5)
+
+        with (
+            relays_patch,
+            sessions_patch,
+            config_patch,
+            patch(f'{_COG}.random', SimpleNamespace(uniform=uniform)),
+        ):
+            await cog._poll_all()
+
+        assert uniform.call_args_list == [((0, 3.5),), ((0, 3.5),)]
+
+
+class TestPollRelay:
+    """Ordering of the dedupe writes, commits and Discord sends of one poll."""
+
+    def _setup(self, classifications: dict[str, tuple[bool, bool]]):
+        cog = YouTubeRelayCog(MagicMock())
+        cog._fetch_live_embed_data = AsyncMock(return_value=(5, None, None))
+        self.events = MagicMock()
+        self.channel = self.events.channel
+        self.channel.send = AsyncMock(return_value=SimpleNamespace(id=999))
+        self.uow = self.events.uow
+        self.uow.commit = AsyncMock()
+        self.uow.rollback = AsyncMock()
+        self.update = self.events.update_last_video_id = AsyncMock()
+        self.add_live = self.events.add_live_session = AsyncMock()
+        relay = SimpleNamespace(
+            id=1,
+            discord_channel_id=100,
+            yt_channel_id='UCx',
+            yt_channel_title='Chan',
+            last_video_id='old',
+            seen_video_ids=['old'],
+            post_videos=True,
+            post_shorts=True,
+            post_lives=True,
+            message_video=None,
+            message_short=None,
+            message_live=None,
+        )
+        patches = (
+            patch(f'{_COG}.resolve_channel', new=AsyncMock(return_value=self.channel)),
+            patch(f'{_COG}.update_last_video_id', new=self.update),
+            patch(f'{_COG}.add_live_session', new=self.add_live),
+        )
+        return cog, relay, dict(classifications), patches
+
+    @staticmethod
+    def _entries(*ids: str) -> list[dict[str, str]]:
+        return [
+            {'yt_videoid': v, 'link': f'https://youtu.be/{v}', 'title': v} for v in ids
+        ]
+
+    def _calls(self) -> list[str]:
+        return [name for name, _, _ in self.events.mock_calls if name]
+
+    async def test_videos_share_one_commit_before_any_send(self):
+        cog, relay, cache, patches = self._setup(
+            {'a': (False, False), 'b': (True, False)}
+        )
+        with patches[0], patches[1], patches[2]:
+            await cog._poll_relay(
+                relay, self._entries('b', 'a', 'old'), cache, {}, self.uow
+            )
+
+        assert self._calls() == [
+            'update_last_video_id',
+            'uow.commit',
+            'channel.send',
+            'channel.send',
+        ]
+        self.update.assert_awaited_once_with(1, 'b', ['b', 'a', 'old'])
+
+    async def test_live_session_is_committed_before_the_next_post(self):
+        cog, relay, cache, patches = self._setup(
+            {'live': (False, True), 'b': (False, False)}
+        )
+        with patches[0], patches[1], patches[2]:
+            await cog._poll_relay(
+                relay, self._entries('b', 'live', 'old'), cache, {}, self.uow
+            )
+
+        assert self._calls() == [
+            'update_last_video_id',
+            'uow.commit',
+            'channel.send',
+            'add_live_session',
+            'uow.commit',
+            'channel.send',
+        ]
+
+    async def test_forbidden_forgets_posts_not_attempted(self):
+        cog, relay, cache, patches = self._setup(
+            {'a': (False, False), 'b': (False, False), 'c': (False, False)}
+        )
+        forbidden = discord.Forbidden(MagicMock(status=403), 'missing access')
+        self.channel.send.side_effect = [None, forbidden]
+        with patches[0], patches[1], patches[2]:
+            await cog._poll_relay(
+                relay, self._entries('c', 'b', 'a', 'old'), cache, {}, self.uow
+            )
+
+        assert self.update.await_args_list[-1].args == (1, 'b', ['b', 'a', 'old'])
+
+    async def test_send_error_forgets_posts_not_attempted(self):
+        cog, relay, cache, patches = self._setup(
+            {'a': (False, False), 'b': (False, False), 'c': (False, False)}
+        )
+        error = discord.HTTPException(MagicMock(status=500), 'server error')
+        self.channel.send.side_effect = [None, error]
+        with patches[0], patches[1], patches[2], pytest.raises(discord.HTTPException):
+            await cog._poll_relay(
+                relay, self._entries('c', 'b', 'a', 'old'), cache, {}, self.uow
+            )
+
+        last = self.update.await_args_list[-1].args
+        assert last == (1, 'b', ['b', 'a', 'old'])
+        assert 'c' not in last[2]
+        assert self._calls()[-3:] == [
+            'uow.rollback',
+            'update_last_video_id',
+            'uow.commit',
+        ]
+
+    async def test_live_session_error_forgets_posts_not_attempted(self):
+        cog, relay, cache, patches = self._setup(
+            {'live': (False, True), 'b': (False, False)}
+        )
+        self.add_live.side_effect = RuntimeError('db down')
+        with patches[0], patches[1], patches[2], pytest.raises(RuntimeError):
+            await cog._poll_relay(
+                relay, self._entries('b', 'live', 'old'), cache, {}, self.uow
+            )
+
+        assert self.update.await_args_list[-1].args == (1, 'live', ['live', 'old'])
+        assert self.channel.send.await_count == 1
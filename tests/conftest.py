@@ -91,3 +91,12 @@ async def db_session(pg_async_url: str) -> AsyncGenerator[AsyncSession, None]:
     async with factory() as session:
         yield session
     await engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def _clear_row_caches() -> None:
+    """Empty the read-through DB row caches so tests cannot see each other's rows."""
+    from sources.lib.db.cache import guild_settings_cache, user_cache
+
+    guild_settings_cache.clear()
+    user_cache.clear()
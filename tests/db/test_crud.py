@@ -4,10 +4,12 @@ The session is injected via CRUDBase.__init__, so tests pass a plain
 AsyncMock — no DB needed.
 """
 
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
 
 from sources.lib.db.crud.base import CRUDBase
-from sources.lib.db.models import User
+from sources.lib.db.models import AutoResponder, User
 
 
 def _session(*, scalars_one=None, get=None):
@@ -82,26 +84,162 @@ class TestDeleteIfExists:
         session.commit.assert_not_awaited()
 
 
+def _sql(session) -> str:
+    """Compile the statement of the first session.execute() call for PostgreSQL."""
+    stmt = session.execute.await_args_list[0].args[0]
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
 class TestUpsert:
-    async def test_creates_entity_when_not_found(self):
-        session = _session(scalars_one=None)
+    async def test_runs_single_insert_on_conflict_and_commits(self):
+        session = _session()
         await CRUDBase(session).upsert(User, {'id': 1}, {'name': 'Alice'})
-        session.add.assert_called_once()
-        created = session.add.call_args[0][0]
-        assert isinstance(created, User)
-        assert created.id == 1
-        assert created.name == 'Alice'
+        session.execute.assert_awaited_once()
+        sql = _sql(session)
+        assert sql.startswith('INSERT INTO users (id, name)')
+        assert 'ON CONFLICT (id) DO UPDATE SET name = excluded.name' in sql
+        session.scalars.assert_not_awaited()
+        session.add.assert_not_called()
         session.commit.assert_awaited_once()
 
-    async def test_updates_entity_when_found(self):
-        existing = MagicMock()
-        session = _session(scalars_one=existing)
-        await CRUDBase(session).upsert(User, {'id': 1}, {'name': 'Bob'})
-        assert existing.name == 'Bob'
-        session.add.assert_called_once_with(existing)
+    async def test_empty_updates_do_nothing_on_conflict(self):
+        session = _session()
+        await CRUDBase(session).upsert(User, {'id': 1}, {})
+        assert 'ON CONFLICT (id) DO NOTHING' in _sql(session)
+
+    async def test_composite_key_and_returning(self):
+        session = _session()
+        row = MagicMock()
+        session.execute.return_value = MagicMock(
+            one_or_none=MagicMock(return_value=row)
+        )
+        result = await CRUDBase(session).upsert(
+            AutoResponder,
+            {'guild_id': 1, 'user_id': 2},
+            {'response_text': 'hi'},
+            returning=['id'],
+        )
+        assert result is row
+        sql = _sql(session)
+        assert 'ON CONFLICT (guild_id, user_id) DO UPDATE' in sql
+        assert sql.endswith('RETURNING auto_responders.id')
+
+    async def test_returns_none_without_returning(self):
+        session = _session()
+        assert await CRUDBase(session).upsert(User, {'id': 1}, {'name': 'A'}) is None
+
+
+class TestBulkUpsert:
+    async def test_executes_once_for_all_rows(self):
+        session = _session()
+        rows = [{'id': 1, 'name': 'A'}, {'id': 2, 'name': 'B'}]
+        result = await CRUDBase(session).bulk_upsert(User, rows, ['id'])
+        assert result == []
+        session.execute.assert_awaited_once()
+        assert session.execute.await_args.args[1] == rows
+        assert 'ON CONFLICT (id) DO UPDATE SET name = excluded.name' in _sql(session)
         session.commit.assert_awaited_once()
 
-    async def test_create_path_does_not_call_delete(self):
-        session = _session(scalars_one=None)
-        await CRUDBase(session).upsert(User, {'id': 2}, {'name': 'Carol'})
-        session.delete.assert_not_awaited()
+    async def test_duplicate_keys_keep_last_row(self):
+        session = _session()
+        rows = [{'id': 1, 'name': 'A'}, {'id': 1, 'name': 'B'}]
+        await CRUDBase(session).bulk_upsert(User, rows, ['id'])
+        assert session.execute.await_args.args[1] == [{'id': 1, 'name': 'B'}]
+
+    async def test_explicit_update_columns_and_returning(self):
+        session = _session()
+        written = [MagicMock(), MagicMock()]
+        session.execute.return_value = MagicMock(all=MagicMock(return_value=written))
+        rows = [
+            {'id': 1, 'name': 'A', 'timezone': 'UTC'},
+            {'id': 2, 'name': 'B', 'timezone': 'UTC'},
+        ]
+        result = await CRUDBase(session).bulk_upsert(
+            User, rows, ['id'], update_columns=['name'], returning=['id']
+        )
+        assert result == written
+        sql = _sql(session)
+        assert 'DO UPDATE SET name = excluded.name RETURNING' in sql
+
+    async def test_no_update_columns_do_nothing(self):
+        session = _session()
+        await CRUDBase(session).bulk_upsert(User, [{'id': 1}], ['id'])
+        assert 'ON CONFLICT (id) DO NOTHING' in _sql(session)
+
+    async def test_do_nothing_returning_is_not_sorted(self):
+        # Conflicting rows return nothing, so rows cannot be matched to params.
+        session = _session()
+        session.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+        await CRUDBase(session).bulk_upsert(
+            User, [{'id': 1}, {'id': 2}], ['id'], returning=['id']
+        )
+        stmt = session.execute.await_args.args[0]
+        assert 'DO NOTHING RETURNING' in _sql(session)
+        assert not stmt._sort_by_parameter_order
+
+    async def test_empty_rows_skip_the_database(self):
+        session = _session()
+        assert await CRUDBase(session).bulk_upsert(User, [], ['id']) == []
+        session.execute.assert_not_awaited()
+        session.commit.assert_not_awaited()
+
+
+class TestBulkCreate:
+    async def test_inserts_all_rows_in_one_call(self):
+        session = _session()
+        rows = [{'id': 1, 'name': 'A'}, {'id': 2, 'name': 'B'}]
+        await CRUDBase(session).bulk_create(User, rows)
+        session.execute.assert_awaited_once()
+        assert session.execute.await_args.args[1] == rows
+        sql = _sql(session)
+        assert sql.startswith('INSERT INTO users')
+        assert 'ON CONFLICT' not in sql
+        session.commit.assert_awaited_once()
+
+    async def test_returning_generated_ids(self):
+        session = _session()
+        written = [MagicMock()]
+        session.execute.return_value = MagicMock(all=MagicMock(return_value=written))
+        result = await CRUDBase(session).bulk_create(
+            AutoResponder,
+            [{'guild_id': 1, 'user_id': 2, 'response_text': 'hi'}],
+            returning=['id'],
+        )
+        assert result == written
+        assert 'RETURNING auto_responders.id' in _sql(session)
+
+
+class TestBulkDelete:
+    async def test_single_column_keys_use_in(self):
+        session = _session()
+        await CRUDBase(session).bulk_delete(User, [{'id': 1}, {'id': 2}])
+        session.execute.assert_awaited_once()
+        sql = _sql(session)
+        assert sql.startswith('DELETE FROM users WHERE users.id IN')
+        session.commit.assert_awaited_once()
+
+    async def test_composite_keys_use_row_values(self):
+        session = _session()
+        deleted = [MagicMock()]
+        session.execute.return_value = MagicMock(all=MagicMock(return_value=deleted))
+        result = await CRUDBase(session).bulk_delete(
+            AutoResponder,
+            [{'guild_id': 1, 'user_id': 2}, {'guild_id': 1, 'user_id': 3}],
+            returning=['user_id'],
+        )
+        assert result == deleted
+        sql = _sql(session)
+        assert '(auto_responders.guild_id, auto_responders.user_id) IN' in sql
+        assert sql.endswith('RETURNING auto_responders.user_id')
+
+    async def test_large_key_lists_are_chunked(self):
+        session = _session()
+        with patch('sources.lib.db.crud.base._DELETE_CHUNK_SIZE', 2):
+            await CRUDBase(session).bulk_delete(User, [{'id': i} for i in range(5)])
+        assert session.execute.await_count == 3
+        session.commit.assert_awaited_once()
+
+    async def test_empty_keys_skip_the_database(self):
+        session = _session()
+        assert await CRUDBase(session).bulk_delete(User, []) == []
+        session.execute.assert_not_awaited()
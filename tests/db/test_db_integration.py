@@ -745,3 +745,679 @@ class TestAutoResponderExpiry:
         assert 'will be deleted' not in texts
         assert 'survives' in texts
         assert 'survives forever' in texts
+
+
+class TestMessageStatsBuckets:
+    """Daily bucket upserts, windowed leaderboards and monthly roll-up."""
+
+    # Guild IDs 940_001–940_005 reserved for this class; 940_004 never exists.
+    _GUILD_WINDOW = 940_001
+    _GUILD_ROLLUP = 940_002
+    _GUILD_KEPT = 940_003
+    _GUILD_GONE = 940_004
+    _GUILD_RACE = 940_005
+
+    async def test_windowed_leaderboard_sums_days_in_window(
+        self, db_session: AsyncSession
+    ) -> None:
+        """Only daily buckets on or after `since` count towards the ranking.
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        from datetime import date
+        from unittest.mock import patch
+
+        from sources.lib.db.operations.stats import (
+            add_daily_message_counts,
+            get_windowed_leaderboard,
+        )
+
+        db_session.add(Guild(id=self._GUILD_WINDOW, name='Buckets Window'))
+        await db_session.commit()
+
+        guild = self._GUILD_WINDOW
+        with patch(
+            'sources.lib.db.operations.stats.AsyncSession', return_value=db_session
+        ):
+            await add_daily_message_counts(
+                {
+                    (guild, 1, date(2026, 3, 1)): 50,
+                    (guild, 1, date(2026, 3, 10)): 2,
+                    (guild, 2, date(2026, 3, 9)): 3,
+                    (guild, 2, date(2026, 3, 10)): 1,
+                }
+            )
+            await add_daily_message_counts({(guild, 2, date(2026, 3, 10)): 1})
+            rows = await get_windowed_leaderboard(guild, date(2026, 3, 9))
+
+        assert [(r.user_id, r.message_count) for r in rows] == [(2, 5), (1, 2)]
+        totals = dict(
+            (
+                await db_session.execute(
+                    select(MessageStats.user_id, MessageStats.message_count).where(
+                        MessageStats.guild_id == guild
+                    )
+                )
+            ).all()
+        )
+        assert totals == {1: 52, 2: 5}
+
+    async def test_roll_up_merges_old_days_into_months(
+        self, db_session: AsyncSession
+    ) -> None:
+        """Days before the cutoff become one monthly bucket per (guild, user, month).
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        from datetime import date
+        from unittest.mock import patch
+
+        from sources.lib.db.models import MessageStatsBucket
+        from sources.lib.db.operations.stats import (
+            add_daily_message_counts,
+            roll_up_daily_buckets,
+        )
+
+        db_session.add(Guild(id=self._GUILD_ROLLUP, name='Buckets Rollup'))
+        await db_session.commit()
+
+        guild = self._GUILD_ROLLUP
+        with patch(
+            'sources.lib.db.operations.stats.AsyncSession', return_value=db_session
+        ):
+            await add_daily_message_counts(
+                {
+                    (guild, 1, date(2026, 1, 5)): 1,
+                    (guild, 1, date(2026, 1, 20)): 2,
+                    (guild, 1, date(2026, 2, 3)): 4,
+                    (guild, 1, date(2026, 2, 20)): 8,
+                }
+            )
+            removed = await roll_up_daily_buckets(date(2026, 2, 10))
+            # A second run later in the month adds to the existing monthly bucket.
+            removed += await roll_up_daily_buckets(date(2026, 3, 1))
+
+        assert removed == 4
+        buckets = (
+            await db_session.execute(
+                select(
+                    MessageStatsBucket.period,
+                    MessageStatsBucket.bucket_start,
+                    MessageStatsBucket.message_count,
+                )
+                .where(MessageStatsBucket.guild_id == guild)
+                .order_by(MessageStatsBucket.bucket_start)
+            )
+        ).all()
+        assert [tuple(b) for b in buckets] == [
+            ('month', date(2026, 1, 1), 3),
+            ('month', date(2026, 2, 1), 12),
+        ]
+
+    async def test_roll_up_keeps_a_concurrent_write_to_an_old_day(
+        self, db_session: AsyncSession
+    ) -> None:
+        """An increment committed while the roll-up waits on its row is rolled up.
+
+        A writer holds an uncommitted increment to an old daily bucket while the
+        roll-up starts. Once the writer commits, the roll-up must carry the new
+        count into the monthly bucket rather than delete it uncounted.
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        import asyncio
+        from datetime import date
+        from unittest.mock import patch
+
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        from sources.lib.db.models import MessageStatsBucket
+        from sources.lib.db.operations.stats import (
+            roll_up_daily_buckets,
+            write_daily_message_counts,
+        )
+
+        guild, day = self._GUILD_RACE, date(2025, 12, 3)
+        db_session.add(Guild(id=guild, name='Buckets Race'))
+        await db_session.commit()
+        db_session.add(
+            MessageStatsBucket(
+                guild_id=guild,
+                period='day',
+                bucket_start=day,
+                user_id=1,
+                message_count=1,
+            )
+        )
+        await db_session.commit()
+
+        factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+        async with factory() as writer, factory() as observer:
+            await write_daily_message_counts(writer, {(guild, 1, day): 5})
+            with patch(
+                'sources.lib.db.operations.stats.AsyncSession',
+                return_value=db_session,
+            ):
+                roll_up = asyncio.create_task(roll_up_daily_buckets(date(2026, 1, 1)))
+                for _ in range(100):
+                    waiting = await observer.scalar(
+                        text('SELECT count(*) FROM pg_locks WHERE NOT granted')
+                    )
+                    await observer.rollback()
+                    if waiting:
+                        break
+                    await asyncio.sleep(0.05)
+                assert waiting, 'roll-up never blocked on the uncommitted write'
+                await writer.commit()
+                await roll_up
+
+        db_session.expire_all()
+        buckets = (
+            await db_session.execute(
+                select(
+                    MessageStatsBucket.period,
+                    MessageStatsBucket.bucket_start,
+                    MessageStatsBucket.message_count,
+                ).where(MessageStatsBucket.guild_id == guild)
+            )
+        ).all()
+        assert [tuple(b) for b in buckets] == [('month', date(2025, 12, 1), 6)]
+
+    async def test_counts_for_a_deleted_guild_do_not_fail_the_batch(
+        self, db_session: AsyncSession
+    ) -> None:
+        """Rows for a guild that no longer exists are skipped, the rest are written.
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        from datetime import date
+        from unittest.mock import patch
+
+        from sources.lib.db.models import MessageStatsBucket
+        from sources.lib.db.operations.stats import add_daily_message_counts
+
+        db_session.add(Guild(id=self._GUILD_KEPT, name='Buckets Kept'))
+        await db_session.commit()
+
+        day = date(2026, 3, 1)
+        with patch(
+            'sources.lib.db.operations.stats.AsyncSession', return_value=db_session
+        ):
+            totals = await add_daily_message_counts(
+                {(self._GUILD_KEPT, 1, day): 2, (self._GUILD_GONE, 1, day): 5}
+            )
+
+        assert [tuple(t) for t in totals] == [(self._GUILD_KEPT, 1, 2)]
+        buckets = (
+            await db_session.execute(
+                select(
+                    MessageStatsBucket.guild_id, MessageStatsBucket.message_count
+                ).where(
+                    MessageStatsBucket.guild_id.in_(
+                        [self._GUILD_KEPT, self._GUILD_GONE]
+                    )
+                )
+            )
+        ).all()
+        assert [tuple(b) for b in buckets] == [(self._GUILD_KEPT, 2)]
+
+
+class TestCrudNativeUpsert:
+    """CRUDBase upserts and bulk operations against real constraints."""
+
+    # Guild IDs 950_001–950_006 reserved for this class.
+    _GUILD_IDS = (950_001, 950_002, 950_003)
+    _MIXED_IDS = (950_004, 950_005, 950_006)
+
+    async def test_upsert_and_bulk_round_trip(self, db_session: AsyncSession) -> None:
+        """Upsert updates in place; bulk ops create, update and delete many rows.
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        from sources.lib.db.crud.base import CRUDBase
+
+        crud = CRUDBase(db_session)
+        first, second, third = self._GUILD_IDS
+        await crud.upsert(Guild, {'id': first}, {'name': 'Old'})
+        row = await crud.upsert(Guild, {'id': first}, {'name': 'New'}, ['name'])
+        assert row.name == 'New'
+
+        await crud.bulk_create(Guild, [{'id': second, 'name': 'Two'}])
+        await crud.bulk_upsert(
+            Guild,
+            [{'id': second, 'name': 'Two v2'}, {'id': third, 'name': 'Three'}],
+            ['id'],
+        )
+        created = await crud.bulk_create(
+            AutoResponder,
+            [
+                {'guild_id': second, 'user_id': 1, 'response_text': 'a'},
+                {'guild_id': second, 'user_id': 2, 'response_text': 'b'},
+            ],
+            returning=['user_id'],
+        )
+        assert [r.user_id for r in created] == [1, 2]
+
+        deleted = await crud.bulk_delete(
+            AutoResponder,
+            [{'guild_id': second, 'user_id': 2}, {'guild_id': second, 'user_id': 9}],
+            returning=['user_id'],
+        )
+        assert [r.user_id for r in deleted] == [2]
+
+        names = dict(
+            (
+                await db_session.execute(
+                    select(Guild.id, Guild.name).where(Guild.id.in_(self._GUILD_IDS))
+                )
+            ).all()
+        )
+        assert names == {first: 'New', second: 'Two v2', third: 'Three'}
+        await crud.bulk_delete(
+            Guild, [{'id': guild_id} for guild_id in self._GUILD_IDS]
+        )
+
+    async def test_bulk_upsert_returning_with_conflicting_rows(
+        self, db_session: AsyncSession
+    ) -> None:
+        """RETURNING works when new and already-existing rows share a batch.
+
+        DO UPDATE returns every row in parameter order; DO NOTHING returns
+        only the rows it inserted.
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        from sources.lib.db.crud.base import CRUDBase
+
+        crud = CRUDBase(db_session)
+        existing, updated, inserted = self._MIXED_IDS
+        await crud.bulk_create(Guild, [{'id': existing, 'name': 'Existing'}])
+
+        skipped = await crud.bulk_upsert(
+            Guild,
+            [{'id': existing, 'name': 'Ignored'}, {'id': updated, 'name': 'New'}],
+            ['id'],
+            update_columns=[],
+            returning=['id'],
+        )
+        assert [r.id for r in skipped] == [updated]
+
+        written = await crud.bulk_upsert(
+            Guild,
+            [
+                {'id': inserted, 'name': 'Inserted'},
+                {'id': existing, 'name': 'Renamed'},
+                {'id': updated, 'name': 'Updated'},
+            ],
+            ['id'],
+            returning=['id', 'name'],
+        )
+        assert [tuple(r) for r in written] == [
+            (inserted, 'Inserted'),
+            (existing, 'Renamed'),
+            (updated, 'Updated'),
+        ]
+        await crud.bulk_delete(
+            Guild, [{'id': guild_id} for guild_id in self._MIXED_IDS]
+        )
+
+
+class TestReconcileGuilds:
+    """Startup reconciliation of guilds and voice channels."""
+
+    # Guild IDs 960_001–960_004 reserved for this class.
+    _KEPT = 960_001
+    _LEFT = 960_002
+    _NEW = 960_003
+    _UNAVAILABLE = 960_004
+
+    async def test_upserts_current_and_deletes_orphans(
+        self, db_session: AsyncSession
+    ) -> None:
+        """Guilds left while offline and deleted voice channels are removed.
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        from unittest.mock import patch
+
+        from sources.lib.db.models import VoiceChannel
+        from sources.lib.db.operations.guilds import reconcile_guilds
+
+        db_session.add_all(
+            [
+                Guild(id=self._KEPT, name='Old name'),
+                Guild(id=self._LEFT, name='Left'),
+                Guild(id=self._UNAVAILABLE, name='Outage'),
+            ]
+        )
+        await db_session.commit()
+        db_session.add_all(
+            [
+                VoiceChannel(
+                    channel_id=1, guild_id=self._KEPT, name='a', status='[auto] x'
+                ),
+                VoiceChannel(channel_id=2, guild_id=self._KEPT, name='gone'),
+                VoiceChannel(channel_id=3, guild_id=self._UNAVAILABLE, name='c'),
+            ]
+        )
+        await db_session.commit()
+
+        other_guilds = [
+            guild_id
+            for guild_id in (
+                await db_session.execute(
+                    select(Guild.id).where(Guild.id.not_in(self._ids()))
+                )
+            ).scalars()
+        ]
+        with patch(
+            'sources.lib.db.operations.guilds.AsyncSession', return_value=db_session
+        ):
+            deleted = await reconcile_guilds(
+                {self._KEPT: 'New name', self._NEW: 'New'},
+                {1: (self._KEPT, 'renamed'), 4: (self._NEW, 'd')},
+                [self._UNAVAILABLE, *other_guilds],
+            )
+
+        assert deleted == [self._LEFT]
+        db_session.expire_all()
+        names = dict(
+            (
+                await db_session.execute(
+                    select(Guild.id, Guild.name).where(Guild.id.in_(self._ids()))
+                )
+            ).all()
+        )
+        assert names == {
+            self._KEPT: 'New name',
+            self._NEW: 'New',
+            self._UNAVAILABLE: 'Outage',
+        }
+        channels = {
+            row.channel_id: (row.name, row.status)
+            for row in (
+                await db_session.scalars(
+                    select(VoiceChannel).where(VoiceChannel.guild_id.in_(self._ids()))
+                )
+            )
+        }
+        assert channels == {
+            1: ('renamed', '[auto] x'),
+            3: ('c', None),
+            4: ('d', None),
+        }
+
+    def _ids(self) -> list[int]:
+        return [self._KEPT, self._LEFT, self._NEW, self._UNAVAILABLE]
+
+
+class TestHotPathQueryPlans:
+    """Hot-path operations are served by the indexes added for them.
+
+    Each test seeds a skewed table, records the SQL the real operation issues
+    and runs EXPLAIN on it. Sequential scans are disabled for the EXPLAIN so
+    the assertion does not depend on cost estimates for small tables; the plan
+    still has to pick the named index over the primary key.
+    """
+
+    # Guild IDs 970_001–970_003 and user IDs 970_001–970_002 reserved for this class.
+    _GUILD_BIRTHDAYS = 970_001
+    _GUILD_IMPORT = 970_002
+    _GUILD_RESPONDERS = 970_003
+    _USER = 970_001
+    _ROWS = 2000
+
+    async def _plan(
+        self,
+        db_session: AsyncSession,
+        module: str,
+        operation,
+        *args,
+    ) -> str:
+        """Run an operation against db_session and EXPLAIN its last statement.
+
+        Args:
+            db_session: Async session bound to the test container.
+            module: Dotted path of the operations module, for patching.
+            operation: The operation coroutine function.
+            *args: Arguments passed to the operation.
+
+        Returns:
+            The text query plan.
+        """
+        from unittest.mock import patch
+
+        from sqlalchemy import event
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        sync_engine = db_session.bind.sync_engine
+        event.listen(sync_engine, 'before_cursor_execute', record)
+        try:
+            with patch(f'{module}.AsyncSession', return_value=db_session):
+                await operation(*args)
+        finally:
+            event.remove(sync_engine, 'before_cursor_execute', record)
+
+        statement, parameters = statements[-1]
+        conn = await db_session.connection()
+        await conn.exec_driver_sql('SET LOCAL enable_seqscan = off')
+        result = await conn.exec_driver_sql(f'EXPLAIN {statement}', parameters)
+        plan = '\n'.join(row[0] for row in result)
+        await db_session.rollback()
+        return plan
+
+    async def _analyze(self, db_session: AsyncSession, table: str) -> None:
+        await db_session.execute(text(f'ANALYZE {table}'))
+        await db_session.commit()
+
+    async def test_pending_reminders_use_partial_indexes(
+        self, db_session: AsyncSession
+    ) -> None:
+        """Both pending reminder queries scan only unsent rows.
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        from datetime import UTC, datetime, timedelta
+
+        from sources.lib.db.models import Reminder
+        from sources.lib.db.operations.reminders import (
+            get_pending_reminders,
+            get_user_reminders,
+        )
+
+        now = datetime.now(UTC)
+        db_session.add_all(
+            Reminder(
+                user_id=self._USER + index % 2,
+                channel_id=1,
+                remind_at=now - timedelta(minutes=index),
+                created_at=now,
+                is_sent=index > 1,
+            )
+            for index in range(self._ROWS)
+        )
+        await db_session.commit()
+        await self._analyze(db_session, 'reminders')
+
+        module = 'sources.lib.db.operations.reminders'
+        assert 'ix_reminders_pending' in await self._plan(
+            db_session, module, get_pending_reminders
+        )
+        assert 'ix_reminders_pending_user' in await self._plan(
+            db_session, module, get_user_reminders, self._USER
+        )
+
+    async def test_expired_auto_responder_scan_uses_expiry_index(
+        self, db_session: AsyncSession
+    ) -> None:
+        """The hourly expiry sweep reads only rows that have an expiry.
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        from datetime import UTC, datetime, timedelta
+
+        from sources.lib.db.operations.auto_responder import (
+            delete_expired_auto_responders,
+        )
+
+        now = datetime.now(UTC)
+        db_session.add(Guild(id=self._GUILD_RESPONDERS, name='Plans responders'))
+        await db_session.flush()
+        db_session.add_all(
+            AutoResponder(
+                guild_id=self._GUILD_RESPONDERS,
+                user_id=user_id,
+                response_text='hi',
+                expires_at=now + timedelta(days=1) if user_id < 5 else None,
+            )
+            for user_id in range(self._ROWS)
+        )
+        await db_session.commit()
+        await self._analyze(db_session, 'auto_responders')
+
+        plan = await self._plan(
+            db_session,
+            'sources.lib.db.operations.auto_responder',
+            delete_expired_auto_responders,
+        )
+        assert 'ix_auto_responders_expires_at' in plan
+
+    async def test_unannounced_birthdays_use_composite_index(
+        self, db_session: AsyncSession
+    ) -> None:
+        """Unannounced birthdays are found without reading the whole guild.
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        from sources.lib.db.operations.birthdays import (
+            get_all_unannounced_birthdays_for_guild,
+        )
+
+        db_session.add(Guild(id=self._GUILD_BIRTHDAYS, name='Plans birthdays'))
+        await db_session.flush()
+        db_session.add_all(
+            GuildMemberBirthday(
+                guild_id=self._GUILD_BIRTHDAYS,
+                user_id=user_id,
+                birthday_day=1,
+                birthday_month=1,
+                last_announced_year=2026 if user_id > 1 else None,
+            )
+            for user_id in range(self._ROWS)
+        )
+        await db_session.commit()
+        await self._analyze(db_session, 'guild_member_birthdays')
+
+        plan = await self._plan(
+            db_session,
+            'sources.lib.db.operations.birthdays',
+            get_all_unannounced_birthdays_for_guild,
+            self._GUILD_BIRTHDAYS,
+            2026,
+        )
+        assert 'ix_guild_member_birthdays_announced' in plan
+
+    async def test_incomplete_import_lookup_uses_partial_index(
+        self, db_session: AsyncSession
+    ) -> None:
+        """The startup scan for unfinished imports skips completed channels.
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        from sources.lib.db.models import StatsImportProgress
+        from sources.lib.db.operations.stats import get_guilds_with_incomplete_import
+
+        db_session.add(Guild(id=self._GUILD_IMPORT, name='Plans import'))
+        await db_session.flush()
+        db_session.add_all(
+            StatsImportProgress(
+                guild_id=self._GUILD_IMPORT,
+                channel_id=channel_id,
+                is_completed=channel_id > 0,
+            )
+            for channel_id in range(self._ROWS)
+        )
+        await db_session.commit()
+        await self._analyze(db_session, 'stats_import_progress')
+
+        plan = await self._plan(
+            db_session,
+            'sources.lib.db.operations.stats',
+            get_guilds_with_incomplete_import,
+        )
+        assert 'ix_stats_import_progress_incomplete' in plan
+
+
+class TestUnitOfWork:
+    """Operations inside a unit of work commit or roll back together."""
+
+    # Guild IDs 980_001–980_002 reserved for this class.
+    _GUILD_COMMIT = 980_001
+    _GUILD_ROLLBACK = 980_002
+
+    def _source(self, db_session: AsyncSession):
+        from sqlalchemy.ext.asyncio import async_scoped_session, async_sessionmaker
+
+        from sources.lib.db.unit_of_work import SessionSource
+
+        factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+        return SessionSource(
+            async_scoped_session(factory, scopefunc=lambda: None), factory
+        )
+
+    async def test_operations_commit_together(self, db_session: AsyncSession) -> None:
+        """Writes from several operations become visible on a single commit.
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        from unittest.mock import patch
+
+        from sources.lib.db.operations.guilds import upsert_guild
+
+        source = self._source(db_session)
+        with patch('sources.lib.db.operations.guilds.AsyncSession', source):
+            async with source.unit_of_work():
+                await upsert_guild(self._GUILD_COMMIT, 'First')
+                await upsert_guild(self._GUILD_COMMIT, 'Second')
+                assert await db_session.get(Guild, self._GUILD_COMMIT) is None
+
+        db_session.expire_all()
+        guild = await db_session.get(Guild, self._GUILD_COMMIT)
+        assert guild is not None and guild.name == 'Second'
+
+    async def test_error_rolls_back_every_operation(
+        self, db_session: AsyncSession
+    ) -> None:
+        """An exception inside the block discards all writes made in it.
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        from unittest.mock import patch
+
+        from sources.lib.db.operations.guilds import upsert_guild
+
+        source = self._source(db_session)
+        with patch('sources.lib.db.operations.guilds.AsyncSession', source):
+            with pytest.raises(RuntimeError):
+                async with source.unit_of_work():
+                    await upsert_guild(self._GUILD_ROLLBACK, 'Never')
+                    raise RuntimeError
+
+        assert await db_session.get(Guild, self._GUILD_ROLLBACK) is None
@@ -4,10 +4,12 @@ Each operation module creates its own AsyncSession internally, so tests patch
 `AsyncSession` in the relevant module and inject a pre-configured mock session.
 """
 
+from datetime import date
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
 # ---------------------------------------------------------------------------
 # Session factory helper
@@ -37,6 +39,13 @@ def _make_session(*, get=None, scalars_rows=None, scalars_one=None, scalar=None)
     return session, ctx
 
 
+def _compiled(session) -> tuple[str, dict]:
+    """Return the SQL and bind values of the single statement a session executed."""
+    session.execute.assert_awaited_once()
+    compiled = session.execute.await_args.args[0].compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
 # ---------------------------------------------------------------------------
 # reminders operations
 # ---------------------------------------------------------------------------
@@ -742,25 +751,57 @@ class TestUpdateLastEntryId:
 
 
 class TestUpsertGuild:
-    async def test_creates_guild_when_not_exists(self):
-        session, ctx = _make_session(scalars_one=None)
+    async def test_upserts_guild_in_one_statement(self):
+        session, ctx = _make_session()
         with patch('sources.lib.db.operations.guilds.AsyncSession', return_value=ctx):
             from sources.lib.db.operations.guilds import upsert_guild
 
             await upsert_guild(guild_id=1, guild_name='Test Guild')
-        session.add.assert_called_once()
+        sql, params = _compiled(session)
+        assert 'ON CONFLICT (id) DO UPDATE SET name = excluded.name' in sql
+        assert params == {'id': 1, 'name': 'Test Guild'}
+        session.add.assert_not_called()
         session.commit.assert_awaited_once()
 
-    async def test_updates_guild_when_exists(self):
-        existing = SimpleNamespace(id=1, name='Old Name')
-        session, ctx = _make_session(scalars_one=existing)
+
+class TestReconcileGuilds:
+    async def test_syncs_everything_in_four_statements_and_one_commit(self):
+        session, ctx = _make_session()
+        session.execute.return_value = MagicMock()
+        session.execute.return_value.scalars.return_value.all.return_value = [7]
         with patch('sources.lib.db.operations.guilds.AsyncSession', return_value=ctx):
-            from sources.lib.db.operations.guilds import upsert_guild
+            from sources.lib.db.operations.guilds import reconcile_guilds
 
-            await upsert_guild(guild_id=1, guild_name='New Name')
-        assert existing.name == 'New Name'
+            deleted = await reconcile_guilds(
+                {1: 'One', 2: 'Two'}, {10: (1, 'General')}, unavailable_guild_ids=[3]
+            )
+
+        assert deleted == [7]
+        assert session.execute.await_count == 4
+        compiled = [
+            call.args[0].compile(dialect=postgresql.dialect())
+            for call in session.execute.await_args_list
+        ]
+        upsert_guilds, delete_guilds, upsert_voice, delete_voice = compiled
+        assert str(upsert_guilds).startswith('INSERT INTO guilds')
+        assert upsert_guilds.params['ids'] == [1, 2]
+        assert 'guilds.id != ALL' in str(delete_guilds)
+        assert delete_guilds.params['kept'] == [1, 2, 3]
+        assert upsert_voice.params['channel_ids'] == [10]
+        assert upsert_voice.params['guild_ids'] == [1]
+        assert 'status' not in str(upsert_voice).split('DO UPDATE')[1]
+        assert delete_voice.params['synced'] == [1, 2]
+        assert delete_voice.params['current'] == [10]
         session.commit.assert_awaited_once()
 
+    async def test_no_guilds_deletes_nothing(self):
+        session, ctx = _make_session()
+        with patch('sources.lib.db.operations.guilds.AsyncSession', return_value=ctx):
+            from sources.lib.db.operations.guilds import reconcile_guilds
+
+            assert await reconcile_guilds({}, {}) == []
+        session.execute.assert_not_awaited()
+
 
 class TestDeleteGuild:
     async def test_deletes_when_found(self):
@@ -807,6 +848,166 @@ class TestGetLeaderboard:
         assert result == []
 
 
+class TestAddMessageCounts:
+    async def test_skips_db_when_empty(self):
+        session, ctx = _make_session()
+        with patch(
+            'sources.lib.db.operations.stats.AsyncSession', return_value=ctx
+        ) as factory:
+            from sources.lib.db.operations.stats import add_message_counts
+
+            await add_message_counts({})
+        factory.assert_not_called()
+
+    async def test_executes_single_statement(self):
+        session, ctx = _make_session()
+        session.execute.return_value = MagicMock()
+        with patch('sources.lib.db.operations.stats.AsyncSession', return_value=ctx):
+            from sources.lib.db.operations.stats import add_message_counts
+
+            await add_message_counts({(1, 10): 2, (1, 11): 1, (2, 10): 5})
+        session.execute.assert_awaited_once()
+        session.commit.assert_awaited_once()
+
+    async def test_skips_rows_of_deleted_guilds(self):
+        session, ctx = _make_session()
+        session.execute.return_value = MagicMock()
+        with patch('sources.lib.db.operations.stats.AsyncSession', return_value=ctx):
+            from sources.lib.db.operations.stats import add_message_counts
+
+            await add_message_counts({(1, 10): 2})
+        sql, _ = _compiled(session)
+        assert 'JOIN guilds ON guilds.id = incoming.guild_id' in sql
+        assert 'FOR KEY SHARE OF guilds' in sql
+
+    async def test_large_batch_uses_copy(self):
+        session, ctx = _make_session()
+        counts = {(1, user_id): 1 for user_id in range(5000)}
+        with (
+            patch('sources.lib.db.operations.stats.AsyncSession', return_value=ctx),
+            patch(
+                'sources.lib.db.operations.stats._copy_upsert', new=AsyncMock()
+            ) as mock_copy,
+        ):
+            from sources.lib.db.operations.stats import add_message_counts
+
+            await add_message_counts(counts)
+        mock_copy.assert_awaited_once_with(session, counts)
+        session.execute.assert_not_awaited()
+        session.commit.assert_awaited_once()
+
+
+class TestAddDailyMessageCounts:
+    async def test_updates_totals_and_buckets_in_one_commit(self):
+        session, ctx = _make_session()
+        day1, day2 = date(2026, 3, 1), date(2026, 3, 2)
+        with (
+            patch('sources.lib.db.operations.stats.AsyncSession', return_value=ctx),
+            patch(
+                'sources.lib.db.operations.stats.write_message_counts',
+                new=AsyncMock(),
+            ) as mock_totals,
+        ):
+            from sources.lib.db.operations.stats import add_daily_message_counts
+
+            await add_daily_message_counts(
+                {(1, 10, day1): 2, (1, 10, day2): 3, (1, 11, day2): 1}
+            )
+        mock_totals.assert_awaited_once_with(session, {(1, 10): 5, (1, 11): 1})
+        session.execute.assert_awaited_once()
+        assert 'message_stats_buckets' in str(session.execute.await_args.args[0])
+        session.commit.assert_awaited_once()
+
+    async def test_skips_db_when_empty(self):
+        session, ctx = _make_session()
+        with patch(
+            'sources.lib.db.operations.stats.AsyncSession', return_value=ctx
+        ) as factory:
+            from sources.lib.db.operations.stats import add_daily_message_counts
+
+            await add_daily_message_counts({})
+        factory.assert_not_called()
+
+
+class TestGetWindowedLeaderboard:
+    async def test_sums_daily_buckets_since_date(self):
+        session, ctx = _make_session()
+        rows = [SimpleNamespace(user_id=1, message_count=9)]
+        session.execute.return_value = MagicMock(all=MagicMock(return_value=rows))
+        with patch('sources.lib.db.operations.stats.AsyncSession', return_value=ctx):
+            from sources.lib.db.operations.stats import get_windowed_leaderboard
+
+            result = await get_windowed_leaderboard(1, date(2026, 3, 1), limit=5)
+        assert result == rows
+        sql = str(session.execute.await_args.args[0])
+        assert 'sum(message_stats_buckets.message_count)' in sql
+        assert 'message_stats_buckets.bucket_start >=' in sql
+        assert 'GROUP BY message_stats_buckets.user_id' in sql
+
+
+class TestRollUpDailyBuckets:
+    async def test_moves_daily_into_monthly_in_one_statement(self):
+        session, ctx = _make_session(scalar=7)
+        with patch('sources.lib.db.operations.stats.AsyncSession', return_value=ctx):
+            from sources.lib.db.operations.stats import roll_up_daily_buckets
+
+            removed = await roll_up_daily_buckets(date(2026, 1, 1))
+        assert removed == 7
+        session.execute.assert_not_awaited()
+        session.scalar.assert_awaited_once()
+        sql = ' '.join(
+            str(
+                session.scalar.await_args.args[0].compile(dialect=postgresql.dialect())
+            ).split()
+        )
+        assert sql.startswith('WITH moved AS (DELETE FROM message_stats_buckets')
+        assert 'RETURNING' in sql
+        assert 'merged AS (INSERT INTO message_stats_buckets' in sql
+        assert 'FROM moved GROUP BY' in sql
+        assert 'ON CONFLICT' in sql
+        session.commit.assert_awaited_once()
+
+
+class TestIncrementMessageCounts:
+    async def test_keys_counts_by_guild(self):
+        with patch(
+            'sources.lib.db.operations.stats.add_message_counts', new=AsyncMock()
+        ) as mock_add:
+            from sources.lib.db.operations.stats import increment_message_counts
+
+            await increment_message_counts(7, {1: 3, 2: 4})
+        mock_add.assert_awaited_once_with({(7, 1): 3, (7, 2): 4})
+
+
+class TestSaveImportCheckpoint:
+    async def test_writes_counts_and_progress_in_one_commit(self):
+        session, ctx = _make_session()
+        session.execute.return_value = MagicMock()
+        with patch('sources.lib.db.operations.stats.AsyncSession', return_value=ctx):
+            from sources.lib.db.operations.stats import save_import_checkpoint
+
+            await save_import_checkpoint(
+                7, 100, {(1, date(2026, 3, 1)): 3, (2, date(2026, 3, 2)): 4}, 555, False
+            )
+        assert session.execute.await_count == 3
+        totals_sql, buckets_sql, progress_sql = (
+            str(c.args[0]) for c in session.execute.await_args_list
+        )
+        assert 'INSERT INTO message_stats ' in totals_sql
+        assert 'INSERT INTO message_stats_buckets' in buckets_sql
+        assert 'stats_import_progress' in progress_sql
+        session.commit.assert_awaited_once()
+
+    async def test_empty_counts_still_save_progress(self):
+        session, ctx = _make_session()
+        with patch('sources.lib.db.operations.stats.AsyncSession', return_value=ctx):
+            from sources.lib.db.operations.stats import save_import_checkpoint
+
+            await save_import_checkpoint(7, 100, {}, 555, True)
+        session.execute.assert_awaited_once()
+        session.commit.assert_awaited_once()
+
+
 class TestGetChannelProgress:
     async def test_returns_progress_when_found(self):
         progress = SimpleNamespace(guild_id=1, channel_id=100, is_completed=False)
@@ -1230,10 +1431,8 @@ class TestGetGuildMemberBirthday:
 
 
 class TestSetGuildMemberBirthday:
-    async def test_creates_record_when_not_exists(self):
-        from sources.lib.db.models import GuildMemberBirthday
-
-        session, ctx = _make_session(scalars_one=None)
+    async def test_upserts_record_and_resets_announced_year(self):
+        session, ctx = _make_session()
         with patch(
             'sources.lib.db.operations.birthdays.AsyncSession', return_value=ctx
         ):
@@ -1242,32 +1441,18 @@ class TestSetGuildMemberBirthday:
             await set_guild_member_birthday(
                 guild_id=1, user_id=2, day=15, month=3, year=1990
             )
-        session.add.assert_called_once()
-        added = session.add.call_args[0][0]
-        assert isinstance(added, GuildMemberBirthday)
-        assert added.birthday_day == 15
-        assert added.birthday_month == 3
-
-    async def test_updates_existing_and_resets_announced_year(self):
-        existing = SimpleNamespace(
-            guild_id=1,
-            user_id=2,
-            birthday_day=1,
-            birthday_month=1,
-            last_announced_year=2025,
-        )
-        session, ctx = _make_session(scalars_one=existing)
-        with patch(
-            'sources.lib.db.operations.birthdays.AsyncSession', return_value=ctx
-        ):
-            from sources.lib.db.operations.birthdays import set_guild_member_birthday
-
-            await set_guild_member_birthday(
-                guild_id=1, user_id=2, day=15, month=3, year=None
-            )
-        assert existing.birthday_day == 15
-        assert existing.birthday_month == 3
-        assert existing.last_announced_year is None
+        sql, params = _compiled(session)
+        assert 'ON CONFLICT (guild_id, user_id) DO UPDATE' in sql
+        assert 'last_announced_year = excluded.last_announced_year' in sql
+        assert params == {
+            'guild_id': 1,
+            'user_id': 2,
+            'birthday_day': 15,
+            'birthday_month': 3,
+            'birth_year': 1990,
+            'last_announced_year': None,
+        }
+        session.commit.assert_awaited_once()
 
 
 class TestGetAllUnannouncedBirthdays:
@@ -1311,30 +1496,20 @@ class TestGetGuildSettings:
 
 
 class TestUpsertGuildSettings:
-    async def test_creates_settings_when_not_exists(self):
-        from sources.lib.db.models import GuildSettings
-
-        session, ctx = _make_session(scalars_one=None)
+    async def test_upserts_only_given_fields(self):
+        session, ctx = _make_session()
         with patch(
             'sources.lib.db.operations.birthdays.AsyncSession', return_value=ctx
         ):
             from sources.lib.db.operations.birthdays import upsert_guild_settings
 
             await upsert_guild_settings(guild_id=1, birthday_channel_id=100)
-        session.add.assert_called_once()
-        added = session.add.call_args[0][0]
-        assert isinstance(added, GuildSettings)
-
-    async def test_updates_existing_settings(self):
-        existing = SimpleNamespace(guild_id=1, birthday_channel_id=None)
-        session, ctx = _make_session(scalars_one=existing)
-        with patch(
-            'sources.lib.db.operations.birthdays.AsyncSession', return_value=ctx
-        ):
-            from sources.lib.db.operations.birthdays import upsert_guild_settings
-
-            await upsert_guild_settings(guild_id=1, birthday_channel_id=200)
-        assert existing.birthday_channel_id == 200
+        sql, params = _compiled(session)
+        assert (
+            'ON CONFLICT (guild_id) DO UPDATE '
+            'SET birthday_channel_id = excluded.birthday_channel_id'
+        ) in sql
+        assert params == {'guild_id': 1, 'birthday_channel_id': 100}
 
 
 # ---------------------------------------------------------------------------
@@ -1343,29 +1518,17 @@ class TestUpsertGuildSettings:
 
 
 class TestUpsertUser:
-    async def test_creates_user_when_not_exists(self):
-        from sources.lib.db.models import User
-
-        session, ctx = _make_session(scalars_one=None)
+    async def test_upserts_user_in_one_statement(self):
+        session, ctx = _make_session()
         with patch('sources.lib.db.operations.users.AsyncSession', return_value=ctx):
             from sources.lib.db.operations.users import upsert_user
 
             await upsert_user(user_id=1, name='Alice', timezone='UTC')
-        session.add.assert_called_once()
-        added = session.add.call_args[0][0]
-        assert isinstance(added, User)
-        assert added.name == 'Alice'
-        assert added.timezone == 'UTC'
-
-    async def test_updates_existing_user(self):
-        existing = SimpleNamespace(id=1, name='Old', timezone='Europe/London')
-        session, ctx = _make_session(scalars_one=existing)
-        with patch('sources.lib.db.operations.users.AsyncSession', return_value=ctx):
-            from sources.lib.db.operations.users import upsert_user
-
-            await upsert_user(user_id=1, name='New', timezone='America/New_York')
-        assert existing.name == 'New'
-        assert existing.timezone == 'America/New_York'
+        sql, params = _compiled(session)
+        assert 'ON CONFLICT (id) DO UPDATE' in sql
+        assert params == {'id': 1, 'name': 'Alice', 'timezone': 'UTC'}
+        session.scalars.assert_not_awaited()
+        session.commit.assert_awaited_once()
 
 
 class TestGetUsersByIds:
@@ -1725,6 +1888,23 @@ class TestListAutoResponders:
         assert result == []
 
 
+class TestListAllAutoResponders:
+    async def test_returns_responders_across_guilds(self):
+        r1 = SimpleNamespace(guild_id=10, user_id=1)
+        r2 = SimpleNamespace(guild_id=20, user_id=2)
+        session, ctx = _make_session(scalars_rows=[r1, r2])
+        with patch(
+            'sources.lib.db.operations.auto_responder.AsyncSession', return_value=ctx
+        ):
+            from sources.lib.db.operations.auto_responder import (
+                list_all_auto_responders,
+            )
+
+            result = await list_all_auto_responders()
+        assert result == [r1, r2]
+        session.scalars.assert_awaited_once()
+
+
 class TestDeleteExpiredAutoResponders:
     async def test_returns_count_of_deleted_rows(self):
         session, ctx = _make_session()
@@ -1753,3 +1933,41 @@ class TestDeleteExpiredAutoResponders:
             count = await delete_expired_auto_responders()
         assert count == 0
         session.commit.assert_awaited_once()
+
+
+# ---------------------------------------------------------------------------
+# track_resolutions operations
+# ---------------------------------------------------------------------------
+
+
+class TestTrackResolutions:
+    async def test_get_looks_up_by_platform_and_id(self):
+        row = SimpleNamespace(target_id='abc')
+        session, ctx = _make_session(get=row)
+        with patch(
+            'sources.lib.db.operations.track_resolutions.AsyncSession',
+            return_value=ctx,
+        ):
+            from sources.lib.db.operations.track_resolutions import (
+                get_track_resolution,
+            )
+
+            result = await get_track_resolution('youtube', 'vid')
+        assert result is row
+        assert session.get.await_args.args[1] == ('youtube', 'vid')
+
+    async def test_save_upserts_and_commits(self):
+        session, ctx = _make_session()
+        with patch(
+            'sources.lib.db.operations.track_resolutions.AsyncSession',
+            return_value=ctx,
+        ):
+            from sources.lib.db.operations.track_resolutions import (
+                save_track_resolution,
+            )
+
+            await save_track_resolution('spotify', 'track', None)
+        session.execute.assert_awaited_once()
+        session.commit.assert_awaited_once()
+        sql = str(session.execute.await_args.args[0])
+        assert 'ON CONFLICT (source_platform, source_id) DO UPDATE' in sql
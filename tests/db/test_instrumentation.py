@@ -0,0 +1,206 @@
+"""Tests for DB operation, slow query and connection pool instrumentation."""
+
+import logging
+from types import ModuleType, SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from sources.lib.cogs.admin import _collect_samples, _slowest_operations
+from sources.lib.db.instrumentation import (
+    UNATTRIBUTED,
+    SlowQueryMonitor,
+    TimedQueuePool,
+    current_operation,
+    instrument_module,
+    register_pool_metrics,
+    timed_operation,
+)
+from sources.lib.db.utils import prewarm_pool
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestTimedOperation:
+    async def test_records_latency_and_sets_current_operation(self):
+        seen = []
+
+        @timed_operation('test.ok')
+        async def op(value):
+            seen.append(current_operation())
+            return value * 2
+
+        before = _sample('db_operation_calls_total', operation='test.ok', outcome='ok')
+        assert await op(21) == 42
+        assert seen == ['test.ok']
+        assert current_operation() == UNATTRIBUTED
+        assert (
+            _sample('db_operation_calls_total', operation='test.ok', outcome='ok')
+            == before + 1
+        )
+        assert _sample('db_operation_latency_seconds_count', operation='test.ok') >= 1
+
+    async def test_counts_errors(self):
+        @timed_operation('test.error')
+        async def op():
+            raise RuntimeError('boom')
+
+        with pytest.raises(RuntimeError):
+            await op()
+        assert (
+            _sample('db_operation_calls_total', operation='test.error', outcome='error')
+            == 1
+        )
+        assert current_operation() == UNATTRIBUTED
+
+
+class TestInstrumentModule:
+    def test_wraps_only_public_coroutines_defined_in_module(self):
+        module = ModuleType('sources.lib.db.operations.fake')
+
+        async def public():
+            return None
+
+        async def _private():
+            return None
+
+        def sync():
+            return None
+
+        for func in (public, _private, sync):
+            func.__module__ = module.__name__
+            setattr(module, func.__name__, func)
+        module.imported = timed_operation('other.imported')(public)
+
+        instrument_module(module)
+        instrument_module(module)
+
+        assert module.public.__wrapped__ is public
+        assert module._private is _private
+        assert module.sync is sync
+        assert module.imported.__wrapped__ is public
+
+    def test_operations_package_is_instrumented(self):
+        from sources.lib.cogs.stats import get_windowed_leaderboard
+        from sources.lib.db.operations import stats
+
+        assert stats.get_leaderboard.__wrapped__.__name__ == 'get_leaderboard'
+        assert get_windowed_leaderboard is stats.get_windowed_leaderboard
+        assert hasattr(get_windowed_leaderboard, '__wrapped__')
+
+
+class TestSlowQueryMonitor:
+    def _run(self, monitor, conn, clock, seconds, params=None):
+        clock.now = 0.0
+        monitor.before_execute(conn, None, 'SELECT  1\n FROM x', params, None, False)
+        clock.now = seconds
+        monitor.after_execute(conn, None, 'SELECT  1\n FROM x', params, None, False)
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        clock = SimpleNamespace(now=0.0)
+        monkeypatch.setattr(
+            'sources.lib.db.instrumentation.time',
+            SimpleNamespace(perf_counter=lambda: clock.now),
+        )
+        return clock
+
+    def test_logs_slow_queries_with_sql_and_params(self, clock, caplog):
+        monitor = SlowQueryMonitor(slow_query_seconds=0.2)
+        conn = SimpleNamespace(info={})
+        before = _sample('db_query_latency_seconds_count', operation=UNATTRIBUTED)
+
+        with caplog.at_level(logging.WARNING, logger='discord'):
+            self._run(monitor, conn, clock, 0.05)
+            self._run(monitor, conn, clock, 0.5, params={'id': 1})
+
+        assert (
+            _sample('db_query_latency_seconds_count', operation=UNATTRIBUTED)
+            == before + 2
+        )
+        slow = [r.getMessage() for r in caplog.records]
+        assert slow == [
+            "Slow query in other (500 ms): SELECT 1 FROM x | params: {'id': 1}"
+        ]
+
+    def test_failed_statement_does_not_skew_later_timings(self, clock, caplog):
+        monitor = SlowQueryMonitor(slow_query_seconds=0.2)
+        conn = SimpleNamespace(info={})
+        # A statement that raises gets before_execute but never after_execute.
+        clock.now = -10.0
+        monitor.before_execute(conn, None, 'SELECT 1/0', None, None, False)
+
+        with caplog.at_level(logging.WARNING, logger='discord'):
+            self._run(monitor, conn, clock, 0.05)
+
+        assert caplog.records == []
+        assert conn.info == {}
+
+    def test_truncates_long_parameters(self, clock, caplog):
+        monitor = SlowQueryMonitor(slow_query_seconds=0.1)
+        with caplog.at_level(logging.WARNING, logger='discord'):
+            self._run(monitor, SimpleNamespace(info={}), clock, 1.0, list(range(1000)))
+        assert caplog.records[0].getMessage().endswith('...')
+
+
+class TestSlowestOperations:
+    async def test_lists_highest_average_first(self):
+        @timed_operation('test.listed')
+        async def op():
+            return None
+
+        await op()
+        listed = _slowest_operations(_collect_samples(), limit=100)
+        assert '`test.listed`' in listed
+
+
+class TestPoolMetrics:
+    def test_gauges_follow_pool_occupancy(self):
+        pool = TimedQueuePool(creator=MagicMock, pool_size=1, max_overflow=2)
+        register_pool_metrics(SimpleNamespace(sync_engine=SimpleNamespace(pool=pool)))
+        waits = _sample('db_pool_wait_seconds_count')
+
+        first, second = pool.connect(), pool.connect()
+        assert _sample('db_pool_checked_out') == 2
+        assert _sample('db_pool_overflow') == 1
+        assert _sample('db_pool_wait_seconds_count') == waits + 2
+
+        first.close()
+        second.close()
+        assert _sample('db_pool_checked_out') == 0
+        assert _sample('db_pool_idle') == 1
+        assert _sample('db_pool_overflow') == 0
+
+
+class TestPrewarmPool:
+    def _engine(self, failures: int = 0) -> tuple[MagicMock, list]:
+        connections = []
+
+        def connect():
+            connection = MagicMock()
+            fail = len(connections) < failures
+            connection.start = AsyncMock(side_effect=OSError('down') if fail else None)
+            connection.close = AsyncMock()
+            connections.append(connection)
+            return connection
+
+        return MagicMock(connect=connect), connections
+
+    async def test_opens_and_returns_connections(self):
+        engine, connections = self._engine()
+        await prewarm_pool(engine, 3)
+        assert len(connections) == 3
+        for connection in connections:
+            connection.start.assert_awaited_once()
+            connection.close.assert_awaited_once()
+
+    async def test_failures_are_logged_not_raised(self, caplog):
+        engine, connections = self._engine(failures=1)
+        with caplog.at_level(logging.WARNING, logger='discord'):
+            await prewarm_pool(engine, 2)
+        connections[0].close.assert_not_awaited()
+        connections[1].close.assert_awaited_once()
+        assert 'opened 1 of 2 connections' in caplog.records[0].getMessage()
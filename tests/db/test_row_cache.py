@@ -0,0 +1,150 @@
+"""Tests for the read-through DB row caches."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from prometheus_client import REGISTRY
+
+from sources.lib.db.cache import RowCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _lookups(cache: str, result: str) -> float:
+    value = REGISTRY.get_sample_value(
+        'db_row_cache_lookups_total', {'cache': cache, 'result': result}
+    )
+    return value or 0.0
+
+
+def _session(row) -> MagicMock:
+    session = AsyncMock()
+    scalars = MagicMock()
+    scalars.one_or_none.return_value = row
+    session.scalars.return_value = scalars
+    ctx = MagicMock()
+    ctx.__aenter__ = AsyncMock(return_value=session)
+    ctx.__aexit__ = AsyncMock(return_value=False)
+    return ctx
+
+
+class TestRowCache:
+    async def test_second_lookup_is_a_hit(self):
+        cache = RowCache('test_hits')
+        load = AsyncMock(return_value='row')
+
+        assert await cache.get(1, load) == 'row'
+        assert await cache.get(1, load) == 'row'
+
+        load.assert_awaited_once()
+        assert _lookups('test_hits', 'miss') == 1
+        assert _lookups('test_hits', 'hit') == 1
+
+    async def test_missing_rows_are_cached(self):
+        cache = RowCache('test_none')
+        load = AsyncMock(return_value=None)
+
+        assert await cache.get(1, load) is None
+        assert await cache.get(1, load) is None
+        load.assert_awaited_once()
+
+    async def test_entries_expire_after_ttl(self):
+        clock = _Clock()
+        cache = RowCache('test_ttl', ttl=10, clock=clock)
+        load = AsyncMock(side_effect=['old', 'new'])
+
+        await cache.get(1, load)
+        clock.now = 9.9
+        assert await cache.get(1, load) == 'old'
+        clock.now = 10.0
+        assert await cache.get(1, load) == 'new'
+
+    async def test_least_recently_used_entry_is_evicted(self):
+        cache = RowCache('test_lru', max_entries=2)
+        for key in (1, 2):
+            await cache.get(key, AsyncMock(return_value=key))
+        await cache.get(1, AsyncMock())
+        await cache.get(3, AsyncMock(return_value=3))
+
+        assert len(cache) == 2
+        reload = AsyncMock(return_value='reloaded')
+        assert await cache.get(1, AsyncMock()) == 1
+        assert await cache.get(2, reload) == 'reloaded'
+
+    async def test_invalidate_forces_reload(self):
+        cache = RowCache('test_invalidate')
+        load = AsyncMock(side_effect=['old', 'new'])
+
+        await cache.get(1, load)
+        cache.invalidate(1)
+        assert await cache.get(1, load) == 'new'
+
+    async def test_load_racing_an_invalidation_is_not_stored(self):
+        cache = RowCache('test_race')
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_load():
+            started.set()
+            await release.wait()
+            return 'stale'
+
+        lookup = asyncio.create_task(cache.get(1, slow_load))
+        await started.wait()
+        cache.invalidate(1)
+        release.set()
+
+        assert await lookup == 'stale'
+        assert len(cache) == 0
+
+
+class TestCachedOperations:
+    async def test_guild_settings_are_read_once_until_upserted(self):
+        from sources.lib.db.operations.birthdays import (
+            get_guild_settings,
+            upsert_guild_settings,
+        )
+
+        old = SimpleNamespace(guild_id=1, birthday_channel_id=100)
+        new = SimpleNamespace(guild_id=1, birthday_channel_id=200)
+        target = 'sources.lib.db.operations.birthdays.AsyncSession'
+        with patch(target, return_value=_session(old)) as factory:
+            assert await get_guild_settings(guild_id=1) is old
+            assert await get_guild_settings(guild_id=1) is old
+        assert factory.call_count == 1
+
+        with patch(target, return_value=_session(new)):
+            await upsert_guild_settings(guild_id=1, birthday_channel_id=200)
+            assert await get_guild_settings(guild_id=1) is new
+
+    async def test_users_are_read_once_until_upserted(self):
+        from sources.lib.db.operations.users import get_user, upsert_user
+
+        old = SimpleNamespace(id=1, timezone='UTC')
+        new = SimpleNamespace(id=1, timezone='Europe/Kyiv')
+        target = 'sources.lib.db.operations.users.AsyncSession'
+        with patch(target, return_value=_session(old)) as factory:
+            assert await get_user(1) is old
+            assert await get_user(1) is old
+        assert factory.call_count == 1
+
+        with patch(target, return_value=_session(new)):
+            await upsert_user(user_id=1, name='Alice', timezone='Europe/Kyiv')
+            assert await get_user(1) is new
+
+    async def test_deleting_a_guild_drops_its_settings(self):
+        from sources.lib.db.cache import guild_settings_cache
+        from sources.lib.db.operations.guilds import delete_guild
+
+        await guild_settings_cache.get(1, AsyncMock(return_value='settings'))
+        with patch(
+            'sources.lib.db.operations.guilds.AsyncSession', return_value=_session(None)
+        ):
+            await delete_guild(1)
+        assert len(guild_settings_cache) == 0
@@ -0,0 +1,140 @@
+"""Throughput benchmark for message-count upsert strategies.
+
+Compares the legacy one-statement-per-user loop against the single unnest
+statement and the COPY-into-staging path on a real PostgreSQL container.
+Every strategy must produce identical counts; rows/sec for each is logged
+(run with ``--log-cli-level=INFO`` to see it). Timing depends on the host, so
+the check that the bulk paths beat the loop only runs with RUN_BENCHMARKS=1.
+
+Run with Docker available. Skip with: pytest -m "not integration"
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sources.lib.db.models import Guild, MessageStats
+from sources.lib.db.operations.stats import _copy_upsert, _unnest_upsert
+
+pytestmark = pytest.mark.integration
+
+_ROWS = 2000
+
+logger = logging.getLogger(__name__)
+
+
+async def _legacy_loop(
+    session: AsyncSession, counts: dict[tuple[int, int], int]
+) -> None:
+    """Reproduce the original per-user INSERT ... ON CONFLICT loop.
+
+    Args:
+        session: Async session bound to the test container.
+        counts: Mapping of (guild_id, user_id) to the number of messages to add.
+    """
+    for (guild_id, user_id), delta in counts.items():
+        await session.execute(
+            pg_insert(MessageStats)
+            .values(guild_id=guild_id, user_id=user_id, message_count=delta)
+            .on_conflict_do_update(
+                index_elements=['guild_id', 'user_id'],
+                set_={'message_count': MessageStats.message_count + delta},
+            )
+        )
+
+
+async def _unnest(session: AsyncSession, counts: dict[tuple[int, int], int]) -> None:
+    """Run the single unnest-based upsert statement.
+
+    Args:
+        session: Async session bound to the test container.
+        counts: Mapping of (guild_id, user_id) to the number of messages to add.
+    """
+    await session.execute(_unnest_upsert(counts))
+
+
+_STRATEGIES = (_legacy_loop, _unnest, _copy_upsert)
+
+
+async def _measure(
+    session: AsyncSession, guild_ids: tuple[int, int, int]
+) -> dict[str, float]:
+    """Upsert _ROWS rows twice with each strategy (insert, then conflict path).
+
+    Asserts every strategy stores the same counts and logs rows/sec for each.
+
+    Args:
+        session: Async session bound to the test container.
+        guild_ids: One unused guild ID per strategy.
+
+    Returns:
+        Rows/sec keyed by strategy name.
+    """
+    strategies = dict(zip(guild_ids, _STRATEGIES, strict=True))
+    for guild_id in strategies:
+        session.add(Guild(id=guild_id, name='Upsert Benchmark'))
+    await session.commit()
+
+    rates: dict[str, float] = {}
+    for guild_id, strategy in strategies.items():
+        counts = {(guild_id, user_id): user_id % 7 + 1 for user_id in range(_ROWS)}
+        start = time.perf_counter()
+        for _ in range(2):
+            await strategy(session, counts)
+            await session.commit()
+        elapsed = time.perf_counter() - start
+        rates[strategy.__name__] = 2 * _ROWS / elapsed
+
+        stored = dict(
+            (
+                await session.execute(
+                    select(MessageStats.user_id, MessageStats.message_count).where(
+                        MessageStats.guild_id == guild_id
+                    )
+                )
+            ).all()
+        )
+        assert stored == {user_id: 2 * delta for (_, user_id), delta in counts.items()}
+
+    logger.info(
+        'message_stats upsert rows/sec: %s',
+        ', '.join(f'{name}={rate:,.0f}' for name, rate in rates.items()),
+    )
+    return rates
+
+
+class TestMessageCountUpsertThroughput:
+    """Bulk upsert paths agree with the legacy loop and, opt-in, outperform it."""
+
+    # Guild IDs 930_001–930_003 and 930_011–930_013 reserved for this class.
+
+    async def test_strategies_store_identical_counts(
+        self, db_session: AsyncSession
+    ) -> None:
+        """Every strategy leaves the same message counts behind.
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        await _measure(db_session, (930_001, 930_002, 930_003))
+
+    @pytest.mark.skipif(
+        not os.environ.get('RUN_BENCHMARKS'),
+        reason='timing comparison; set RUN_BENCHMARKS=1 to run',
+    )
+    async def test_bulk_paths_beat_the_loop(self, db_session: AsyncSession) -> None:
+        """The unnest and COPY paths upsert more rows/sec than the loop.
+
+        Args:
+            db_session: Async session bound to the test container.
+        """
+        rates = await _measure(db_session, (930_011, 930_012, 930_013))
+        assert rates['_unnest'] > rates['_legacy_loop']
+        assert rates['_copy_upsert'] > rates['_legacy_loop']
@@ -0,0 +1,145 @@
+"""Tests for the cross-operation unit of work."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from sources.lib.db.cache import RowCache
+from sources.lib.db.unit_of_work import SessionSource, after_commit
+
+
+def _session() -> AsyncMock:
+    session = AsyncMock()
+    session.__aenter__.return_value = session
+    session.__aexit__.return_value = False
+    return session
+
+
+async def _session_of(source: SessionSource):
+    return source()
+
+
+@pytest.fixture
+def shared():
+    return _session()
+
+
+@pytest.fixture
+def source(shared):
+    scoped = MagicMock(return_value=_session())
+    return SessionSource(scoped, MagicMock(return_value=shared))
+
+
+class TestSessionSource:
+    def test_standalone_calls_get_the_scoped_session(self, source):
+        assert source() is source._scoped.return_value
+
+    async def test_operations_share_one_commit(self, source, shared):
+        async with source.unit_of_work():
+            for _ in range(2):
+                async with source() as session:
+                    await session.execute('stmt')
+                    await session.commit()
+
+        assert shared.execute.await_count == 2
+        assert shared.flush.await_count == 2
+        shared.commit.assert_awaited_once()
+        shared.__aexit__.assert_awaited_once()
+
+    async def test_exception_rolls_back(self, source, shared):
+        with pytest.raises(RuntimeError):
+            async with source.unit_of_work():
+                async with source() as session:
+                    await session.commit()
+                raise RuntimeError
+
+        shared.rollback.assert_awaited_once()
+        shared.commit.assert_not_awaited()
+
+    async def test_nested_unit_joins_outer(self, source, shared):
+        async with source.unit_of_work() as outer:
+            async with source.unit_of_work() as inner:
+                assert inner is outer
+            shared.commit.assert_not_awaited()
+        shared.commit.assert_awaited_once()
+
+    async def test_child_tasks_do_not_join(self, source, shared):
+        async with source.unit_of_work():
+            child_session = await asyncio.create_task(_session_of(source))
+        assert child_session is source._scoped.return_value
+
+    async def test_explicit_commit_keeps_unit_open(self, source, shared):
+        async with source.unit_of_work() as uow:
+            await uow.commit()
+            assert source() is not source._scoped.return_value
+        assert shared.commit.await_count == 2
+
+    async def test_explicit_rollback_keeps_unit_open(self, source, shared):
+        callback = MagicMock()
+        async with source.unit_of_work() as uow:
+            after_commit(callback)
+            await uow.rollback()
+        shared.rollback.assert_awaited_once()
+        shared.commit.assert_awaited_once()
+        callback.assert_not_called()
+
+
+class TestAfterCommit:
+    def test_runs_immediately_outside_unit(self):
+        callback = MagicMock()
+        after_commit(callback)
+        callback.assert_called_once()
+
+    async def test_deferred_until_commit(self, source):
+        callback = MagicMock()
+        async with source.unit_of_work():
+            after_commit(callback)
+            callback.assert_not_called()
+        callback.assert_called_once()
+
+    async def test_dropped_on_rollback(self, source):
+        callback = MagicMock()
+        with pytest.raises(RuntimeError):
+            async with source.unit_of_work():
+                after_commit(callback)
+                raise RuntimeError
+        callback.assert_not_called()
+
+
+class TestRowCacheInUnitOfWork:
+    async def test_reads_bypass_the_cache(self, source):
+        cache = RowCache('test_uow_reads')
+        await cache.get(1, AsyncMock(return_value='committed'))
+
+        async with source.unit_of_work():
+            assert await cache.get(1, AsyncMock(return_value='pending')) == 'pending'
+            assert await cache.get(2, AsyncMock(return_value='pending')) == 'pending'
+
+        assert len(cache) == 1
+
+    async def test_invalidation_waits_for_commit(self, source):
+        cache = RowCache('test_uow_invalidate')
+        await cache.get(1, AsyncMock(return_value='old'))
+
+        async with source.unit_of_work():
+            cache.invalidate(1)
+            assert len(cache) == 1
+        assert len(cache) == 0
+
+
+class TestYouTubePollWrites:
+    async def test_video_id_updates_share_one_transaction(self, source, shared):
+        from sources.lib.db.operations.youtube_relay import update_last_video_id
+
+        relay = SimpleNamespace(last_video_id=None, seen_video_ids=[])
+        shared.get.return_value = relay
+        with patch('sources.lib.db.operations.youtube_relay.AsyncSession', source):
+            async with source.unit_of_work():
+                await update_last_video_id(7, 'a', ['a'])
+                await update_last_video_id(7, 'b', ['b', 'a'])
+
+        assert relay.last_video_id == 'b'
+        assert relay.seen_video_ids == ['b', 'a']
+        shared.commit.assert_awaited_once()